@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Historical backfill for the Indiana Police Jobs Scraper
+Replays saved copies of the ILEA bulletin (a directory of HTML files, gzipped or
+not, or a .zip of them) into the job store, as if the scraper had run at the
+time each copy was taken. Snapshots are parsed in a process pool in chunks of
+consecutive copies; each chunk comes back as a short list of posting versions
+rather than every posting of every copy, and the chunks are merged in order into
+one timeline with real first seen, last seen, changed and closed dates
+"""
+
+import gzip
+import io
+import os
+import re
+import time
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+
+from job_sources import ILEA_BULLETIN_URL
+from job_store import JOB_COLUMNS
+from posting_state import encode_job, posting_key, section_hash
+
+SNAPSHOT_EXTENSIONS = ('.html', '.htm', '.html.gz', '.htm.gz')
+
+# A date, optionally followed by a time, anywhere in a snapshot's name:
+# bulletin-2023-04-01.html, 2023-04-01T06-00-00.html or a Wayback 20230401060000.html
+TIMESTAMP_PATTERN = re.compile(
+    r'(?<!\d)(\d{4})-?(\d{2})-?(\d{2})(?:[T_ -]?(\d{2})[:-]?(\d{2})(?:[:-]?(\d{2}))?)?(?!\d)'
+)
+
+# Chunks per worker: more balance the load, fewer pass back fewer repeated postings
+CHUNKS_PER_WORKER = 4
+MAX_CHUNK_SIZE = 64
+
+# path is the file, or the archive holding member
+Snapshot = namedtuple('Snapshot', ['taken_at', 'path', 'member'])
+
+
+def snapshot_time(name, fallback):
+    """Return the time in a snapshot's file name, else fallback (a datetime)"""
+    for match in TIMESTAMP_PATTERN.finditer(os.path.basename(name)):
+        try:
+            return datetime(*(int(part) for part in match.groups() if part is not None))
+        except ValueError:
+            continue
+    return fallback
+
+
+def find_snapshots(path):
+    """Return the snapshots in a directory (searched recursively) or .zip archive, oldest first"""
+    snapshots = []
+    if os.path.isdir(path):
+        for root, _, files in os.walk(path):
+            for name in files:
+                if name.lower().endswith(SNAPSHOT_EXTENSIONS):
+                    file_path = os.path.join(root, name)
+                    modified = datetime.fromtimestamp(os.path.getmtime(file_path)).replace(microsecond=0)
+                    snapshots.append(Snapshot(snapshot_time(name, modified), file_path, None))
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith(SNAPSHOT_EXTENSIONS):
+                    snapshots.append(Snapshot(snapshot_time(info.filename, datetime(*info.date_time)), path,
+                                              info.filename))
+    else:
+        raise ValueError(f"{path} is not a directory or .zip archive of bulletin snapshots")
+    snapshots.sort(key=lambda snapshot: (snapshot.taken_at, snapshot.member or snapshot.path))
+    return snapshots
+
+
+def chunk_snapshots(snapshots, chunk_size):
+    """Split snapshots into (first index, consecutive snapshots) chunks"""
+    return [(start, snapshots[start:start + chunk_size]) for start in range(0, len(snapshots), chunk_size)]
+
+
+# Per worker process: the scraper that parses and the archives it has open
+_scraper = None
+_archives = {}
+
+
+def init_worker(parser_backend='html.parser'):
+    """Build the worker's scraper once, instead of once per snapshot"""
+    global _scraper
+    from indiana_police_jobs_scraper import IndianaPoliceJobsScraper
+
+    _scraper = IndianaPoliceJobsScraper(parser_backend=parser_backend, sample_fallback=False, verbose=False)
+
+
+def read_snapshot(snapshot):
+    """Return a snapshot's HTML bytes"""
+    if snapshot.member is not None:
+        if snapshot.path not in _archives:
+            _archives[snapshot.path] = zipfile.ZipFile(snapshot.path)
+        content = _archives[snapshot.path].read(snapshot.member)
+    else:
+        with open(snapshot.path, 'rb') as f:
+            content = f.read()
+    if (snapshot.member or snapshot.path).lower().endswith('.gz'):
+        content = gzip.decompress(content)
+    return content
+
+
+def parse_snapshot(snapshot):
+    """Return the postings in a snapshot by posting key, as a live run would store them"""
+    content = read_snapshot(snapshot)
+    # The scraper's per-page progress lines would interleave across workers
+    with redirect_stdout(io.StringIO()):
+        job_listings = _scraper.extract_jobs_from_html(content, page_url=ILEA_BULLETIN_URL)
+        job_listings = _scraper.add_posting_details(job_listings)
+        job_listings = _scraper.merge_near_duplicates(job_listings)
+        county_jobs = _scraper.process_job_data(job_listings)
+    return {posting_key(job.anchor_id, job.department): job for jobs in county_jobs.values() for job in jobs}
+
+
+def parse_chunk(chunk):
+    """Parse a chunk of consecutive snapshots into posting versions
+
+    Returns (observed, skipped, versions, latest): observed is [(index, open
+    postings)] for the snapshots read, skipped is [(index, reason)] for those
+    that could not be read or held no postings, versions maps each posting key
+    to [content hash, first index, last index] runs of consecutive snapshots,
+    and latest holds each posting as last seen in the chunk.
+    """
+    start, snapshots = chunk
+    observed, skipped, versions, latest = [], [], {}, {}
+    previous = None
+    for index, snapshot in enumerate(snapshots, start):
+        try:
+            postings = parse_snapshot(snapshot)
+        except Exception as e:
+            skipped.append((index, f"{type(e).__name__}: {e}"))
+            continue
+        if not postings:
+            # A saved error page, not a bulletin that closed every posting
+            skipped.append((index, "no postings found"))
+            continue
+        observed.append((index, len(postings)))
+        for key, job in postings.items():
+            content_hash = section_hash(job.department, job.full_description or '')
+            runs = versions.setdefault(key, [])
+            if runs and runs[-1][0] == content_hash and runs[-1][2] == previous:
+                runs[-1][2] = index
+            else:
+                runs.append([content_hash, index, index])
+            latest[key] = job
+        previous = index
+    return observed, skipped, versions, latest
+
+
+class Timeline:
+    """Every posting's versions across all snapshots, merged chunk by chunk in order"""
+
+    def __init__(self, snapshots):
+        self.times = [snapshot.taken_at.isoformat(timespec='seconds') for snapshot in snapshots]
+        self.observed = []
+        self.skipped = []
+        self.versions = {}
+        self.latest = {}
+
+    def merge(self, result):
+        """Add the next chunk's parse_chunk() result"""
+        observed, skipped, versions, latest = result
+        previous = self.observed[-1][0] if self.observed else None
+        for key, runs in versions.items():
+            merged = self.versions.setdefault(key, [])
+            # A version seen up to the end of the last chunk continues into this one
+            if merged and merged[-1][0] == runs[0][0] and merged[-1][2] == previous and runs[0][1] == observed[0][0]:
+                merged[-1][2] = runs[0][2]
+                runs = runs[1:]
+            merged.extend(runs)
+        self.observed.extend(observed)
+        self.skipped.extend(skipped)
+        self.latest.update(latest)
+
+    def following(self):
+        """Map each snapshot read to the next one read"""
+        return {index: later for (index, _), (later, _) in zip(self.observed, self.observed[1:])}
+
+    def postings(self):
+        """Return the job store rows: each posting as last seen, with its history"""
+        following = self.following()
+        rows = []
+        for key, runs in self.versions.items():
+            changed = runs[0][1]
+            for before, run in zip(runs, runs[1:]):
+                if run[0] != before[0]:
+                    changed = run[1]
+            closed = following.get(runs[-1][2])
+            # date_posted is the day it was first seen, as a live run would have stored it
+            job = self.latest[key].replace(date_posted=self.times[runs[0][1]][:10])
+            row = {column: None for column in JOB_COLUMNS}
+            row.update(encode_job(job))
+            row.update(posting_key=key, content_hash=runs[-1][0], first_seen=self.times[runs[0][1]],
+                       last_seen=self.times[runs[-1][2]], changed_at=self.times[changed],
+                       closed_at=self.times[closed] if closed is not None else None)
+            rows.append(row)
+        return rows
+
+    def runs(self):
+        """Return a runs table row per snapshot read, counted as JobStore.record_run() would"""
+        counts = {index: {'ran_at': self.times[index], 'open': open_count, 'added': 0, 'changed': 0, 'closed': 0}
+                  for index, open_count in self.observed}
+        following = self.following()
+        for runs in self.versions.values():
+            for before, run in zip([None] + runs, runs):
+                if before is not None and following[before[2]] == run[1]:
+                    counts[run[1]]['changed'] += 1
+                else:
+                    counts[run[1]]['added'] += 1
+                    if before is not None:
+                        counts[following[before[2]]]['closed'] += 1
+            if runs[-1][2] in following:
+                counts[following[runs[-1][2]]]['closed'] += 1
+        return [counts[index] for index, _ in self.observed]
+
+
+def backfill(path, store, workers=None, chunk_size=None, parser_backend='html.parser'):
+    """Parse every snapshot under path and merge the timeline into a JobStore
+
+    workers defaults to one process per core; 1 parses in this process.
+    Returns a summary dict (snapshots, skipped, postings, runs, seconds).
+    """
+    started = time.perf_counter()
+    snapshots = find_snapshots(path)
+    if not snapshots:
+        raise ValueError(f"No bulletin snapshots ({', '.join(SNAPSHOT_EXTENSIONS)}) found in {path}")
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, min(MAX_CHUNK_SIZE, len(snapshots) // (workers * CHUNKS_PER_WORKER)))
+    chunks = chunk_snapshots(snapshots, chunk_size)
+    print(f"Backfilling {len(snapshots)} snapshot(s) from {snapshots[0].taken_at} to {snapshots[-1].taken_at} "
+          f"with {workers} worker(s), {chunk_size} per chunk...")
+
+    timeline = Timeline(snapshots)
+    if workers == 1:
+        init_worker(parser_backend)
+        for chunk in chunks:
+            timeline.merge(parse_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(parser_backend,)) as executor:
+            # map() yields in chunk order, so the timeline is merged oldest first
+            for result in executor.map(parse_chunk, chunks):
+                timeline.merge(result)
+
+    for index, reason in timeline.skipped:
+        print(f"Skipped {snapshots[index].member or snapshots[index].path}: {reason}")
+    postings = timeline.postings()
+    runs = timeline.runs()
+    store.import_history(postings, runs)
+    return {
+        'snapshots': len(snapshots),
+        'skipped': len(timeline.skipped),
+        'postings': len(postings),
+        'runs': len(runs),
+        'seconds': time.perf_counter() - started,
+    }
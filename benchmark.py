@@ -0,0 +1,1605 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the Indiana Police Jobs Scraper
+Generates a synthetic ILEA bulletin page and times the parsing stages, and runs
+the whole pipeline against it end to end, checked against a saved baseline
+"""
+
+import argparse
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+from bs4 import BeautifulSoup
+
+from backfill import backfill, find_snapshots, init_worker, parse_snapshot
+from async_scraper import AsyncIndianaPoliceJobsScraper
+from bulletin_parser import available_parser_backends, get_parser_backend
+from client_map import build_payload
+from county_resolver import CITY_TO_COUNTY, get_county_resolver
+from department_registry import DepartmentRegistry
+from field_extraction import extract_details, extract_fields
+from gazetteer import get_gazetteer
+from job_posting import JobPosting
+from job_sources import ILEA_BULLETIN_URL, AgencyPageSource, IleaBulletinSource
+from job_store import JOB_COLUMNS, JobStore, decode_row
+from near_duplicates import DEFAULT_THRESHOLD, cluster_near_duplicates, minhash_signature, shingles
+from search_index import SEARCH_FIELDS, build_search_index, search, tokenize
+from indiana_police_jobs_scraper import IndianaPoliceJobsScraper
+
+CITIES = [
+    'Westville', 'Alexandria', 'Anderson', 'Kingsford Heights', 'Brazil',
+    'Frankfort', 'Lebanon', 'Rochester', 'Portland', 'Princeton',
+    'Valparaiso', 'Warsaw', 'Logansport', 'Shelbyville', 'Scottsburg'
+]
+
+AGENCY_TYPES = ['Police Department', 'County Sheriff', 'Town Marshal']
+
+# Agencies whose names hold no Indiana place, so no county is found for them
+STATEWIDE_AGENCIES = [
+    'Indiana Department of Natural Resources Law Enforcement', 'Indiana State Excise Police',
+    'Ivy Tech Community College Police Department', 'Indiana Gaming Commission',
+]
+
+PARAGRAPHS = [
+    "The {agency} is now accepting applications for the position of Police Officer.",
+    "This is a {shift}-hour midnight shift position (6p-6a).",
+    "Probationary Officer (1st Year) Salary is ${salary:,}",
+    "<strong>HIRING RANGE:</strong> ${hourly:.2f}-${hourly_top:.2f}/hr.",
+    "ILEA Tier 1 or Tier 2 certification is preferred, but not required.",
+    "Lateral applicants are encouraged to apply.",
+    "For more information contact recruiting@example.gov or (317) 555-{phone:04d}.",
+    "APPLICATIONS WILL BE ACCEPTED UNTIL OCTOBER {day}, 2025.",
+    "Applications will be accepted until the position is filled.",
+]
+
+# Share of postings that re-post an earlier posting of the same agency with an edit,
+# as the bulletin does when a deadline is extended
+REPOST_RATE = 0.05
+
+# Description excerpts from real bulletin postings and the fields they must yield
+GOLDEN_FIELDS = [
+    (
+        "APPLICATIONS WILL BE ACCEPTED UNTILOCTOBER 1, 2025at5PM CST.Applications can be obtained by "
+        "emailingkhpd.agelardi@gmail.com, or by picking up at the Kingsford Heights Town Hall.Completed "
+        "applications can be emailed tokhpd.agelardi@gmail.com or reach out via email or phone:(219) 393-3028.",
+        date(2025, 10, 1), 'khpd.agelardi@gmail.com; (219) 393-3028'
+    ),
+    (
+        "Email completedapplicationstoSgt. Jerry Bransonatjbranson@cityofalexandria.in.govno later "
+        "than4:00 pmonSeptember 15, 2025.",
+        date(2025, 9, 15), 'jbranson@cityofalexandria.in.gov'
+    ),
+    (
+        "please get in touch withTraining Coordinator Lt. John Baysingeratjbaysinger@cityofanderson.comor "
+        "(765) 648-6764.Salary & Benefits: Applyonline:Postingopen until filled",
+        None, 'jbaysinger@cityofanderson.com; (765) 648-6764'
+    ),
+    (
+        "Questions may be directed atlmcmichael@greenfieldin.org.ExpiresDecember 31, 2025",
+        date(2025, 12, 31), 'lmcmichael@greenfieldin.org'
+    ),
+    (
+        "Applications must be submitted by11:59 pmonSeptember 5, 2025.Contact Chief Turner at "
+        "tomturner@cityofshelbyvillein.com",
+        date(2025, 9, 5), 'tomturner@cityofshelbyvillein.com'
+    ),
+    (
+        "Send resumes to todd.smith@town.in.gov by Friday.Questions may be directed to atkins@police.org",
+        None, 'todd.smith@town.in.gov; atkins@police.org'
+    ),
+    (
+        "Email town@hope.in.gov for an application.Reach us at contactus@x.org or (317) 555-0100.",
+        None, 'town@hope.in.gov; contactus@x.org; (317) 555-0100'
+    ),
+    (
+        "Please contactMCSOrecruitment@co.monroe.in.uswith questions.Open until filled.",
+        None, 'MCSOrecruitment@co.monroe.in.us'
+    ),
+    (
+        "Contact number is 812-385-3437 or emailtoprincetonpolicedept@gmail.comor stop by.",
+        None, 'princetonpolicedept@gmail.com; (812) 385-3437'
+    ),
+    (
+        "200 Independence Drive, Roseland, Indiana 46637574-272-6485hvelez@townofroseland.usdbanicki"
+        "@townofroseland.ustownofroseland.usJoin the Town of Roseland Police Department",
+        None, 'hvelez@townofroseland.us; dbanicki@townofroseland.us'
+    ),
+]
+
+# Description excerpts from real bulletin postings and the structured fields they must yield
+GOLDEN_DETAILS = [
+    (
+        "This is a 12-hour midnight shift position (6p-6a).Probationary Deputy (1st Year) Salary is $41,200 1st "
+        "Class Deputy Salary is $56,000 (Based on experience)ILEA Tier 1 or Tier 2 certification is preferred, "
+        "but not required.",
+        {'salary_min': 41200.0, 'salary_max': 56000.0, 'pay_period': 'year', 'shift_hours': 12, 'ilea_tier': 2,
+         'lateral': False, 'entry_level': True}
+    ),
+    (
+        "Lateral applicants are encouraged and must be ILEA Tier 1 certified.Benefits Include:*Probationary pay "
+        "of $52,952.40*Patrolman salary $54,590.08*8-hour shifts – 40 Hour pay cycle*Uniforms and equipment "
+        "furnished, first year, then $1,500.00 annual equipment allowance after 1st year.*Longevity Pay $ ($7500 "
+        "max per 25 years of service)",
+        {'salary_min': 52952.4, 'salary_max': 54590.08, 'pay_period': 'year', 'shift_hours': 8, 'ilea_tier': 1,
+         'lateral': True, 'entry_level': True}
+    ),
+    (
+        "HIRING RANGE: $25.50-$26.15/hr.\xa0\xa0Additional considered based on years of services",
+        {'salary_min': 25.5, 'salary_max': 26.15, 'pay_period': 'hour', 'shift_hours': None, 'ilea_tier': None,
+         'lateral': False, 'entry_level': False}
+    ),
+    (
+        "*Starting Salary: Approx. $62,500/year + Fully Paid Benefits for Employees*Lateral Entry Eligible: Must "
+        "possess an ILEA Tier 1 certification (or eligible for ILEA waiver).",
+        {'salary_min': 62500.0, 'salary_max': 62500.0, 'pay_period': 'year', 'shift_hours': None, 'ilea_tier': 1,
+         'lateral': True, 'entry_level': False}
+    ),
+    (
+        "Starting pay for all recruits $72,7801 Year - $75,1513 Year - $79,103*3 day weekends*Education pay; "
+        "Associates $500, Bachelor's $2,000*Shift Differential $1,800/ year for 2nd shift",
+        {'salary_min': 72780.0, 'salary_max': 79103.0, 'pay_period': 'year', 'shift_hours': None, 'ilea_tier': None,
+         'lateral': False, 'entry_level': True}
+    ),
+    (
+        "The Mount Vernon Police Department is offering a $10,000 hiring incentive for Lateral Transfers (with a "
+        "Tier 1 Certification).Medical Insurance at a Cost of $1.00 per year",
+        {'salary_min': None, 'salary_max': None, 'pay_period': None, 'shift_hours': None, 'ilea_tier': 1,
+         'lateral': True, 'entry_level': False}
+    ),
+]
+
+# Benefits text without any extractable fields, used to pad descriptions to a realistic length
+FILLER = (
+    "Benefits Include:*Probationary pay*8-hour shifts – 40 Hour pay cycle, Shift premiums for Evening and "
+    "Midnight shift.*College Degree incentive*Uniforms and equipment furnished, first year, then annual "
+    "equipment allowance after 1st year.*Take-home car program with off-duty use*Medical, dental and vision "
+    "insurance plans*Paid overtime opportunities and compensatory time accrual*INPRS 1977 Pension*Specialty "
+    "Pay*Body Worn Camera Technology*Many opportunities for specialties and advancement"
+)
+
+
+def generate_bulletin(num_postings, seed=0):
+    """Generate bulletin HTML with the structure the parser expects
+
+    Like the real page: a list of "Hiring:" links (and the odd link that is not
+    a posting), then a named anchor per posting followed by its h3 and p sections.
+    Descriptions mix pay, shift, certification and contact lines with padding to
+    a realistic length; some agencies have no county and some postings are
+    edited re-posts of earlier ones.
+    """
+    return render_bulletin(generate_postings(num_postings, seed))
+
+
+def generate_postings(num_postings, seed=0):
+    """Generate (anchor_id, agency, paragraphs) for each posting of a synthetic bulletin"""
+    rng = random.Random(seed)
+    postings = []
+    for i in range(num_postings):
+        if postings and rng.random() < REPOST_RATE:
+            _, agency, paragraphs = rng.choice(postings)
+            day = rng.randint(1, 28)
+            paragraphs = paragraphs[:-1] + [f"APPLICATIONS WILL BE ACCEPTED UNTIL NOVEMBER {day}, 2025."]
+            postings.append((f"Posting{i}", agency, paragraphs))
+            continue
+        if rng.random() < 0.02:
+            agency = rng.choice(STATEWIDE_AGENCIES)
+        else:
+            agency = f"{rng.choice(CITIES)} {rng.choice(AGENCY_TYPES)}"
+        paragraphs = []
+        for template in rng.sample(PARAGRAPHS, k=rng.randint(3, len(PARAGRAPHS))):
+            hourly = rng.randrange(2000, 3200) / 100
+            paragraphs.append(template.format(
+                agency=agency,
+                shift=rng.choice([8, 10, 12]),
+                salary=rng.randrange(38000, 62000, 100),
+                hourly=hourly,
+                hourly_top=hourly + rng.randrange(50, 400) / 100,
+                phone=rng.randrange(10000),
+                day=rng.randint(1, 28)
+            ))
+        if rng.random() < 0.5:
+            paragraphs.insert(1, FILLER)
+        postings.append((f"Posting{i}", agency, paragraphs))
+    return postings
+
+
+def render_bulletin(postings):
+    """Render generate_postings() output as bulletin HTML"""
+    parts = ['<html><body><h2>Law Enforcement Job Opportunities</h2><ul>']
+    for anchor_id, agency, _ in postings:
+        parts.append(f'<li><a href="#{anchor_id}">Hiring: {agency}</a></li>')
+    parts.append('<li><a href="#JobFair">Career Fair: ILEA Plainfield</a></li>')
+    parts.append('</ul><p>Job closing dates are listed in each posting.</p>')
+
+    for anchor_id, agency, paragraphs in postings:
+        parts.append(f'<a name="{anchor_id}"></a><h3>{agency}</h3>')
+        for text in paragraphs:
+            parts.append(f'<p>{text}</p>')
+        parts.append('<hr>')
+
+    parts.append('</body></html>')
+    return '\n'.join(parts)
+
+
+def legacy_sections(content):
+    """Per-link soup.find lookup used before the single-pass parser"""
+    soup = BeautifulSoup(content, 'html.parser')
+    sections = {}
+    for link in soup.find_all('a', href=True):
+        if not link['href'].startswith('#'):
+            continue
+        anchor_id = link['href'][1:]
+        job_section = soup.find('a', attrs={'name': anchor_id})
+        if job_section:
+            description_content = []
+            current_element = job_section.find_next_sibling()
+            while current_element and not (current_element.name == 'a' and current_element.get('name')):
+                if current_element.name in ['p', 'h3', 'h4', 'h5', 'h6']:
+                    text = current_element.get_text(strip=True)
+                    if text and not text.startswith('Job closing dates'):
+                        description_content.append(text)
+                current_element = current_element.find_next_sibling()
+            sections[anchor_id] = ' '.join(description_content)
+    return sections
+
+
+def time_call(func, *args):
+    """Return (result, elapsed seconds) for a single call"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_sections(sizes):
+    """Compare the single-pass section index against per-link lookups"""
+    print(f"{'postings':>10} {'legacy (s)':>12} {'single-pass (s)':>16} {'speedup':>9}")
+    backend = get_parser_backend('html.parser')
+    for size in sizes:
+        html = generate_bulletin(size)
+        legacy, legacy_time = time_call(legacy_sections, html)
+        (_, sections), fast_time = time_call(backend.parse, html)
+        if legacy != sections:
+            raise AssertionError(f"Section index differs from legacy lookup at {size} postings")
+        print(f"{size:>10} {legacy_time:>12.3f} {fast_time:>16.3f} {legacy_time / fast_time:>8.1f}x")
+
+
+def extract_quietly(scraper, html):
+    """Run job extraction with the per-job debug output suppressed"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return scraper.extract_jobs_from_html(html)
+
+
+# Bulletin markup the synthetic pages never produce, the sections every backend must
+# find in it, and html.parser's sections where it differs: lxml and selectolax repair
+# malformed markup as a browser would (a <p> ends at a block element or another <p>),
+# while html.parser keeps the nesting as written
+PARSER_EDGE_CASES = [
+    (
+        'p closed by a block element',
+        '<a href="#A">Hiring: Town A</a><a name="A"></a><p>one<div>block</div>two</p><h4>head</h4>',
+        {'A': 'one head'}, {'A': 'oneblocktwo head'}
+    ),
+    (
+        'p inside a p',
+        '<a href="#A">Hiring: Town A</a><a name="A"></a><p>one<p>two</p></p>',
+        {'A': 'one two'}, {'A': 'onetwo'}
+    ),
+    (
+        'empty section read after the next h3',
+        '<a href="#A">Hiring: Town A</a><div><a name="A"></a></div><h3>Title</h3><p>para one</p>'
+        '<div>div two</div><hr><p>after</p>',
+        {'A': 'para one div two'}, None
+    ),
+    (
+        'duplicate anchor name',
+        '<a href="#A">Hiring: Town A</a><a name="A"></a><p>first</p><a name="A"></a><p>second</p>',
+        {'A': 'first'}, None
+    ),
+    (
+        'comments between anchors',
+        '<a href="#A">Hiring: Town A</a><a name="A"></a><p>one</p><!-- note --><p>two</p>'
+        '<a name="B"></a><!-- note --><h4>three</h4>',
+        {'A': 'one two', 'B': 'three'}, None
+    ),
+]
+
+
+def check_parser_edge_cases():
+    """Fail if a backend's sections drift on the PARSER_EDGE_CASES fixtures"""
+    backends = available_parser_backends()
+    for label, html, expected, as_written in PARSER_EDGE_CASES:
+        for name in backends:
+            job_links, sections = get_parser_backend(name).parse(html)
+            wanted = as_written if name == 'html.parser' and as_written is not None else expected
+            if sections != wanted or job_links != [('Hiring: Town A', 'A')]:
+                raise AssertionError(f"Backend '{name}' on {label}: expected {wanted}, got {sections}")
+    print(f"Parser backends ({', '.join(backends)}) match {len(PARSER_EDGE_CASES)} edge-case fixtures")
+
+
+def bench_backends(sizes):
+    """Time each installed parser backend and check they extract identical jobs"""
+    backends = available_parser_backends()
+    print(f"{'postings':>10} " + ' '.join(f"{name + ' (s)':>16}" for name in backends))
+    for size in sizes:
+        html = generate_bulletin(size).encode('utf-8')
+        reference = None
+        timings = []
+        for name in backends:
+            scraper = IndianaPoliceJobsScraper(parser_backend=name)
+            jobs, elapsed = time_call(extract_quietly, scraper, html)
+            if reference is None:
+                reference = jobs
+            elif jobs != reference:
+                raise AssertionError(f"Backend '{name}' extracted different jobs at {size} postings")
+            timings.append(elapsed)
+        print(f"{size:>10} " + ' '.join(f"{elapsed:>16.3f}" for elapsed in timings))
+
+
+def legacy_fields(description):
+    """The three per-posting regex searches used before field_extraction"""
+    closing_date = None
+    date_match = re.search(r'UNTIL\s+([A-Z]+\s+\d{1,2},?\s+\d{4})', description, re.IGNORECASE)
+    if date_match:
+        closing_date = date_match.group(1)
+    contact_info = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', description)
+    contact_info += re.findall(r'\(\d{3}\)\s*\d{3}-\d{4}', description)
+    return closing_date, contact_info
+
+
+def check_golden_fields():
+    """Fail if field extraction drifts from the golden outputs"""
+    for description, closing_date, contact_info in GOLDEN_FIELDS:
+        fields = extract_fields(description)
+        actual = (fields['closing_date'], '; '.join(fields['emails'] + fields['phones']))
+        if actual != (closing_date, contact_info):
+            raise AssertionError(f"Field extraction mismatch: expected {(closing_date, contact_info)}, got {actual}")
+    print(f"Field extraction matches {len(GOLDEN_FIELDS)} golden outputs")
+
+    for description, expected in GOLDEN_DETAILS:
+        actual = extract_details(description)
+        if actual != expected:
+            raise AssertionError(f"Detail extraction mismatch: expected {expected}, got {actual}")
+    print(f"Detail extraction matches {len(GOLDEN_DETAILS)} golden outputs")
+
+
+def bench_fields(repeat=200):
+    """Compare the anchored field extraction against the legacy regexes"""
+    descriptions = [f"{FILLER} {description} {FILLER}" for description, _, _ in GOLDEN_FIELDS] * repeat
+    _, legacy_time = time_call(lambda: [legacy_fields(d) for d in descriptions])
+    _, fast_time = time_call(lambda: [extract_fields(d) for d in descriptions])
+    print(f"{'descriptions':>12} {'legacy (ms)':>12} {'anchored (ms)':>14}")
+    print(f"{len(descriptions):>12} {legacy_time * 1000:>12.1f} {fast_time * 1000:>14.1f}")
+
+    descriptions = [f"{FILLER} {description} {FILLER}" for description, _ in GOLDEN_DETAILS] * repeat
+    _, details_time = time_call(lambda: [extract_details(d) for d in descriptions])
+    print(f"{len(descriptions):>12} descriptions: pay, shift and tier details in {details_time * 1000:.1f} ms")
+
+
+def legacy_county(location, counties):
+    """Substring scan over counties, then over a city dict rebuilt per call"""
+    location_lower = location.lower()
+    for county in counties:
+        if county.lower() in location_lower:
+            return county
+    city_to_county = dict(CITY_TO_COUNTY)
+    for city, county in city_to_county.items():
+        if city in location_lower:
+            return county
+    return None
+
+
+def bench_counties(count=20000, seed=0):
+    """Compare the county resolver against the legacy substring scans"""
+    rng = random.Random(seed)
+    scraper = IndianaPoliceJobsScraper()
+    counties = list(scraper.county_coordinates)
+    resolver = get_county_resolver(tuple(counties))
+    towns = [place.name for place in get_gazetteer()]
+    places = list(CITY_TO_COUNTY) + [f"{county} County" for county in counties] + towns + ['Purdue University']
+    agencies = [f"{rng.choice(places).title()} {rng.choice(AGENCY_TYPES)}" for _ in range(count)]
+
+    legacy, legacy_time = time_call(lambda: [legacy_county(agency, counties) for agency in agencies])
+    resolver.resolve('warm up')
+    resolved, cold_time = time_call(lambda: [resolver.resolve.__wrapped__(agency) for agency in agencies])
+    _, memo_time = time_call(lambda: [resolver.resolve(agency) for agency in agencies])
+    print(f"{'agencies':>10} {'legacy (/s)':>12} {'resolver (/s)':>14} {'memoized (/s)':>14}")
+    print(f"{count:>10} {count / legacy_time:>12,.0f} {count / cold_time:>14,.0f} {count / memo_time:>14,.0f}")
+    print(f"Placed in a county: legacy {sum(1 for county in legacy if county) / count:.1%}, "
+          f"resolver {sum(1 for match in resolved if match) / count:.1%}")
+
+
+def bench_departments(count=100000, seed=0):
+    """Time department metadata lookups, cold and memoized"""
+    rng = random.Random(seed)
+    names = [f"{city.title()} {rng.choice(AGENCY_TYPES)}" for city in CITY_TO_COUNTY]
+    names += ['Indianapolis Metropolitan Police Department', 'Lake County Sheriff’s Office', 'Indiana State Police']
+    departments = [rng.choice(names) for _ in range(count)]
+
+    registry = DepartmentRegistry.load()
+    _, cold_time = time_call(lambda: [registry.lookup.__wrapped__(name) for name in departments])
+    _, memo_time = time_call(lambda: [registry.lookup(name) for name in departments])
+    print(f"{'lookups':>10} {'registry (/s)':>14} {'memoized (/s)':>14}")
+    print(f"{count:>10} {count / cold_time:>14,.0f} {count / memo_time:>14,.0f}")
+
+
+class LegacyRenderer:
+    """The f-string builders that the templates replaced, kept for comparison"""
+
+    def __init__(self, scraper):
+        self.get_department_info = scraper.get_department_info
+
+    def create_side_panel_html(self, all_jobs, current_time):
+        """Build the side panel by appending to one string"""
+        side_panel_html = f"""
+        <style>
+        @media (max-width: 768px) {{
+            .side-panel {{
+                width: 100% !important;
+                height: 100vh !important;
+                top: 0 !important;
+                right: 0 !important;
+                transform: translateX(100%);
+                transition: transform 0.3s ease;
+            }}
+            .side-panel.open {{
+                transform: translateX(0);
+            }}
+            .toggle-btn {{
+                display: block !important;
+            }}
+            .map-container {{
+                margin-right: 0 !important;
+            }}
+        }}
+        @media (min-width: 769px) {{
+            .side-panel {{
+                transform: translateX(0) !important;
+            }}
+            .toggle-btn {{
+                display: none !important;
+            }}
+            .map-container {{
+                margin-right: 350px !important;
+            }}
+        }}
+        </style>
+        
+        <!-- Toggle Button for Mobile -->
+        <button class="toggle-btn" onclick="toggleSidePanel()" 
+                style="position: fixed; top: 10px; right: 10px; z-index: 10000; 
+                       background: #007bff; color: white; border: none; padding: 10px 15px; 
+                       border-radius: 5px; font-size: 14px; font-weight: bold; cursor: pointer;
+                       box-shadow: 0 2px 5px rgba(0,0,0,0.2); display: none;">
+            📋 Jobs ({len(all_jobs)})
+        </button>
+        
+        <div class="side-panel" id="sidePanel" style="position: fixed; 
+                    top: 10px; right: 10px; width: 350px; height: 90vh; 
+                    background-color: white; border:2px solid #007bff; z-index:9999; 
+                    font-size:12px; padding: 10px; overflow-y: auto; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
+            <div style="background-color: #007bff; color: white; padding: 8px; margin: -10px -10px 10px -10px; display: flex; justify-content: space-between; align-items: center;">
+                <h3 style="margin: 0; font-size: 16px;">Indiana Police Jobs ({len(all_jobs)} total)</h3>
+                <button onclick="toggleSidePanel()" style="background: none; border: none; color: white; font-size: 20px; cursor: pointer; display: none;" class="close-btn">×</button>
+            </div>
+            <div style="background-color: #f8f9fa; padding: 5px; margin-bottom: 10px; border-radius: 3px; font-size: 10px; color: #666; text-align: center;">
+                📅 Last updated: {current_time}
+            </div>
+            <div style="margin-bottom: 10px;">
+                <input type="text" id="jobSearch" placeholder="Search jobs..." 
+                       style="width: 100%; padding: 5px; border: 1px solid #ddd; border-radius: 3px;"
+                       onkeyup="filterJobs()">
+            </div>
+            <div id="jobList">
+        """
+        
+        current_county = None
+        for job in all_jobs:
+            if job['county'] != current_county:
+                if current_county is not None:
+                    side_panel_html += "</div>"  # Close previous county section
+                current_county = job['county']
+                side_panel_html += f"""
+                <div class="county-section" data-county="{job['county']}">
+                    <div style="background-color: #f8f9fa; padding: 5px; margin: 5px 0; border-left: 3px solid #007bff; font-weight: bold; font-size: 11px;">
+                        {job['county']} County
+                    </div>
+                """
+            
+            # Get department information
+            dept_info = self.get_department_info(job['department'])
+            closing_date_text = f"<br><span style='color: red; font-size: 10px;'>Closes: {job['closing_date']}</span>" if job['closing_date'] else ""
+            
+            # Create department website link if available
+            dept_website_link = ""
+            if dept_info['website']:
+                dept_website_link = f"""
+                <div style="margin-top: 3px;">
+                    <a href="{dept_info['website']}" target="_blank" 
+                       style="color: #28a745; text-decoration: none; font-size: 9px;">
+                        🌐 Department Website →
+                    </a>
+                </div>
+                """
+            
+            side_panel_html += f"""
+                <div class="job-item" data-department="{job['department'].lower()}" data-county="{job['county'].lower()}">
+                    <div style="border: 1px solid #ddd; margin: 3px 0; padding: 8px; border-radius: 3px; background-color: #fafafa;">
+                        <div style="display: flex; align-items: center; margin-bottom: 3px;">
+                            <span style="font-size: 16px; margin-right: 5px;">{dept_info['badge']}</span>
+                            <div style="font-weight: bold; font-size: 11px; color: #333;">
+                                {job['department']}
+                            </div>
+                        </div>
+                        <div style="font-size: 10px; color: #666; margin-bottom: 3px;">
+                            {job['location']}
+                        </div>
+                        <div style="font-size: 9px; color: #888; margin-bottom: 3px; font-style: italic;">
+                            {dept_info['fast_facts']}
+                        </div>
+                        <div style="font-size: 10px; color: #555; margin-bottom: 3px; line-height: 1.3;">
+                            {job['details'][:80]}...
+                        </div>
+                        {closing_date_text}
+                        <div style="margin-top: 5px;">
+                            <a href="{job['ilea_link']}" target="_blank" 
+                               style="color: #007bff; text-decoration: none; font-size: 10px; font-weight: bold;">
+                                View Full Posting →
+                            </a>
+                            {dept_website_link}
+                        </div>
+                    </div>
+                </div>
+            """
+        
+        side_panel_html += """
+            </div>
+            </div>
+        </div>
+        
+        <script>
+        function filterJobs() {
+            var input = document.getElementById('jobSearch');
+            var filter = input.value.toLowerCase();
+            var jobItems = document.getElementsByClassName('job-item');
+            
+            for (var i = 0; i < jobItems.length; i++) {
+                var jobItem = jobItems[i];
+                var department = jobItem.getAttribute('data-department');
+                var county = jobItem.getAttribute('data-county');
+                
+                if (department.includes(filter) || county.includes(filter)) {
+                    jobItem.style.display = 'block';
+                } else {
+                    jobItem.style.display = 'none';
+                }
+            }
+        }
+        
+        function toggleSidePanel() {
+            var panel = document.getElementById('sidePanel');
+            var toggleBtn = document.querySelector('.toggle-btn');
+            var closeBtn = document.querySelector('.close-btn');
+            
+            if (panel.classList.contains('open')) {
+                panel.classList.remove('open');
+                if (toggleBtn) toggleBtn.style.display = 'block';
+                if (closeBtn) closeBtn.style.display = 'none';
+            } else {
+                panel.classList.add('open');
+                if (toggleBtn) toggleBtn.style.display = 'none';
+                if (closeBtn) closeBtn.style.display = 'block';
+            }
+        }
+        
+        // Show close button on mobile
+        function updateMobileUI() {
+            var closeBtn = document.querySelector('.close-btn');
+            if (window.innerWidth <= 768) {
+                if (closeBtn) closeBtn.style.display = 'block';
+            } else {
+                if (closeBtn) closeBtn.style.display = 'none';
+            }
+        }
+        
+        // Update UI on window resize
+        window.addEventListener('resize', updateMobileUI);
+        
+        // Initialize mobile UI
+        updateMobileUI();
+        </script>
+        """
+        
+        return side_panel_html
+
+    def create_jobs_table_html(self, county_jobs, current_time):
+        """Build the jobs table by appending to one string"""
+        html_content = f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <title>Indiana Police Jobs - Complete Listing</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 20px; }}
+                table {{ border-collapse: collapse; width: 100%; margin-top: 20px; }}
+                th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
+                th {{ background-color: #f2f2f2; font-weight: bold; }}
+                tr:nth-child(even) {{ background-color: #f9f9f9; }}
+                tr:hover {{ background-color: #f5f5f5; }}
+                .closing-date {{ color: red; font-weight: bold; }}
+                .contact-info {{ font-size: 0.9em; color: #666; }}
+                .county-header {{ background-color: #007bff; color: white; padding: 10px; margin-top: 20px; }}
+                .job-details {{ max-width: 400px; }}
+                .last-updated {{ background-color: #f8f9fa; padding: 10px; border-radius: 5px; margin: 10px 0; text-align: center; color: #666; }}
+            </style>
+        </head>
+        <body>
+            <h1>Indiana Law Enforcement Job Opportunities</h1>
+            <p>Complete listing of all available positions across Indiana counties</p>
+            <div class="last-updated">
+                📅 <strong>Last Updated:</strong> {current_time}
+            </div>
+        """
+        
+        total_jobs = sum(len(jobs) for jobs in county_jobs.values())
+        html_content += f"<p><strong>Total Job Opportunities: {total_jobs}</strong></p>"
+        
+        for county, jobs in sorted(county_jobs.items()):
+            html_content += f"""
+            <div class="county-header">
+                <h2>{county} County - {len(jobs)} Job(s)</h2>
+            </div>
+            <table>
+                <thead>
+                                    <tr>
+                    <th>Department</th>
+                    <th>Location</th>
+                    <th>Details</th>
+                    <th>Closing Date</th>
+                    <th>Contact Info</th>
+                    <th>ILEA Link</th>
+                    <th>Posted Date</th>
+                </tr>
+                </thead>
+                <tbody>
+            """
+            
+            for job in jobs:
+                # Get department information
+                dept_info = self.get_department_info(job['department'])
+                closing_date_cell = f'<span class="closing-date">{job["closing_date"]}</span>' if job['closing_date'] else 'No closing date'
+                contact_cell = f'<div class="contact-info">{job["contact_info"]}</div>' if job['contact_info'] else 'No contact info'
+                
+                # Create department website link if available
+                dept_website_cell = ""
+                if dept_info['website']:
+                    dept_website_cell = f'<br><a href="{dept_info["website"]}" target="_blank" style="color: #28a745; text-decoration: underline;">🌐 Department Website</a>'
+                
+                html_content += f"""
+                <tr>
+                    <td>
+                        <div style="display: flex; align-items: center;">
+                            <span style="font-size: 20px; margin-right: 8px;">{dept_info['badge']}</span>
+                            <div>
+                                <strong>{job['department']}</strong>
+                                <br><small style="color: #666; font-style: italic;">{dept_info['fast_facts']}</small>
+                                {dept_website_cell}
+                            </div>
+                        </div>
+                    </td>
+                    <td>{job['location']}</td>
+                    <td class="job-details">{job['details']}</td>
+                    <td>{closing_date_cell}</td>
+                    <td>{contact_cell}</td>
+                    <td><a href="{job['ilea_link']}" target="_blank" style="color: #007bff; text-decoration: underline;">View Full Posting</a></td>
+                    <td>{job['date_posted']}</td>
+                </tr>
+                """
+            
+            html_content += """
+                </tbody>
+            </table>
+            """
+        
+        html_content += """
+        </body>
+        </html>
+        """
+        
+        return html_content
+
+
+def peak_memory(func, *args):
+    """Return the peak bytes allocated while func runs"""
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def job_list_markup(side_panel_html):
+    """The side panel's job list; its search script has since replaced the legacy one"""
+    return side_panel_html[side_panel_html.index('<div id="jobList">'):side_panel_html.index('<script')]
+
+
+def bench_rendering(sizes):
+    """Compare the template renderer with the f-string builders on synthetic jobs"""
+    scraper = IndianaPoliceJobsScraper()
+    legacy = LegacyRenderer(scraper)
+    current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+    print(f"{'postings':>10} {'legacy (s)':>11} {'template (s)':>13} {'legacy peak':>12} {'stream peak':>12}  identical")
+    for size in sizes:
+        jobs = extract_quietly(scraper, generate_bulletin(size).encode('utf-8'))
+        county_jobs = scraper.process_job_data(jobs)
+
+        legacy_table, legacy_time = time_call(legacy.create_jobs_table_html, county_jobs, current_time)
+        with open(os.devnull, 'w', encoding='utf-8') as f:
+            _, stream_time = time_call(scraper.renderer.write_jobs_table, county_jobs, f, current_time)
+
+        # Peak memory is measured in separate runs, since tracing slows everything down
+        legacy_peak = peak_memory(legacy.create_jobs_table_html, county_jobs, current_time)
+        with open(os.devnull, 'w', encoding='utf-8') as f:
+            stream_peak = peak_memory(scraper.renderer.write_jobs_table, county_jobs, f, current_time)
+
+        all_jobs = sorted({id(job): job for jobs in county_jobs.values() for job in jobs}.values(),
+                          key=lambda job: (job['county'], job['department']))
+        identical = (legacy_table == scraper.renderer.jobs_table(county_jobs, current_time)
+                     and job_list_markup(legacy.create_side_panel_html(all_jobs, current_time))
+                     == job_list_markup(scraper.renderer.side_panel(all_jobs, current_time)))
+        print(f"{size:>10} {legacy_time:>11.3f} {stream_time:>13.3f} {legacy_peak / 2**20:>10.1f}MB {stream_peak / 2**20:>10.1f}MB  {identical}")
+        if not identical:
+            raise SystemExit("Template output differs from the f-string builders")
+
+
+def bench_payload(sizes):
+    """Compare page sizes of the inlined map and table with the client-side mode"""
+    inline = IndianaPoliceJobsScraper()
+    client = IndianaPoliceJobsScraper(client_side=True)
+    current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+    print(f"{'postings':>10} {'inline map':>11} {'inline table':>13} {'client pages':>13} {'json':>10} {'json.gz':>10} {'build (s)':>10}")
+    for size in sizes:
+        jobs = extract_quietly(inline, generate_bulletin(size).encode('utf-8'))
+        county_jobs = inline.process_job_data(jobs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            inline_map = inline.create_interactive_map(county_jobs).get_root().render()
+            client_map = client.create_interactive_map(county_jobs).get_root().render()
+        inline_table = inline.renderer.jobs_table(county_jobs, current_time)
+        client_table = client.renderer.jobs_table(county_jobs, current_time, client.data_url())
+
+        payload, build_time = time_call(build_payload, client.collect_jobs(county_jobs), client.county_coordinates,
+                                        client.get_department_info, current_time)
+        data = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        size_kb = lambda text: len(text.encode('utf-8')) / 1024
+        print(f"{size:>10} {size_kb(inline_map):>9.0f}KB {size_kb(inline_table):>11.0f}KB "
+              f"{size_kb(client_map) + size_kb(client_table):>11.0f}KB {len(data) / 1024:>8.0f}KB "
+              f"{len(gzip.compress(data, mtime=0)) / 1024:>8.0f}KB {build_time:>10.3f}")
+
+
+def linear_search(jobs, query):
+    """The legacy filter: a substring of the department or county"""
+    query = query.lower()
+    return {position for position, job in enumerate(jobs)
+            if query in job['department'].lower() or query in job['county'].lower()}
+
+
+def brute_force_search(jobs, query):
+    """What the index should return, found by checking every word of every job"""
+    words = tokenize(query)
+    matches = set()
+    for position, job in enumerate(jobs):
+        job_words = [token for field in SEARCH_FIELDS for token in tokenize(job.get(field) or '')]
+        if all(any(token.startswith(word) for token in job_words) for word in words):
+            matches.add(position)
+    return matches
+
+
+def bench_search(sizes, queries=('marion', 'sheriff', 'fort wayne', 'lake county', 'dep')):
+    """Time the prebuilt prefix index against scanning every job per keystroke"""
+    scraper = IndianaPoliceJobsScraper()
+    print(f"{'postings':>10} {'index build (s)':>16} {'index size':>11} {'scan (ms/query)':>16} {'index (ms/query)':>17}")
+    for size in sizes:
+        jobs = extract_quietly(scraper, generate_bulletin(size).encode('utf-8'))
+        all_jobs = scraper.collect_jobs(scraper.process_job_data(jobs))
+        index, build_time = time_call(build_search_index, all_jobs)
+        index_size = len(json.dumps(index, separators=(',', ':')))
+
+        for query in queries:
+            if search(index, query) != brute_force_search(all_jobs, query):
+                raise AssertionError(f"Index search for {query!r} differs from a full scan")
+
+        repeat = 20
+        _, scan_time = time_call(lambda: [linear_search(all_jobs, q) for q in queries for _ in range(repeat)])
+        _, index_time = time_call(lambda: [search(index, q) for q in queries for _ in range(repeat)])
+        per_query = 1000 / (len(queries) * repeat)
+        print(f"{size:>10} {build_time:>16.3f} {index_size / 1024:>9.0f}KB {scan_time * per_query:>16.3f} {index_time * per_query:>17.3f}")
+
+
+def bench_store(sizes):
+    """Time job store upserts for a first run, an unchanged rerun and a run with edits"""
+    scraper = IndianaPoliceJobsScraper()
+    print(f"{'postings':>10} {'first run (s)':>14} {'rerun (s)':>10} {'10% edited (s)':>15} {'export (s)':>11} {'db':>8}")
+    for size in sizes:
+        county_jobs = scraper.process_job_data(extract_quietly(scraper, generate_bulletin(size).encode('utf-8')))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'jobs.db')
+            store = JobStore(path)
+            first, first_time = time_call(store.record_run, county_jobs, '2024-01-01T00:00:00')
+            rerun, rerun_time = time_call(store.record_run, county_jobs, '2024-01-02T00:00:00')
+
+            jobs = [job for jobs in county_jobs.values() for job in jobs]
+            for jobs_in_county in county_jobs.values():
+                for index in range(0, len(jobs_in_county), 10):
+                    job = jobs_in_county[index]
+                    jobs_in_county[index] = job.replace(full_description=job.full_description + ' Updated.')
+            edited, edited_time = time_call(store.record_run, county_jobs, '2024-01-03T00:00:00')
+            exported, export_time = time_call(store.county_jobs)
+
+            assert first['added'] == rerun['open'] == len(jobs), "every posting should be stored once"
+            assert rerun['added'] == rerun['changed'] == rerun['closed'] == 0, "an unchanged rerun should change nothing"
+            assert edited['changed'] == sum(len(jobs[::10]) for jobs in county_jobs.values()), \
+                "every edited posting should be counted"
+            assert sum(len(jobs) for jobs in exported.values()) == len(jobs), "the export should list every open posting"
+            db_size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+        print(f"{size:>10} {first_time:>14.3f} {rerun_time:>10.3f} {edited_time:>15.3f} {export_time:>11.3f} "
+              f"{db_size / 1024:>6.0f}KB")
+
+
+def retained_memory(func, *args):
+    """Return func's result and the bytes still allocated by it once it returns"""
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_postings(sizes, weekly=1000):
+    """Memory held by an archive of postings loaded as dicts versus JobPostings
+
+    The archive is a job store filled by weekly runs of the same bulletin under
+    new anchors, as a multi-year history would be, and is read back whole.
+    """
+    scraper = IndianaPoliceJobsScraper()
+    jobs = scraper.add_posting_details(extract_quietly(scraper, generate_bulletin(weekly).encode('utf-8')))
+    county_jobs = scraper.process_job_data(jobs)
+    per_week = sum(len(jobs) for jobs in county_jobs.values())
+    print(f"{'postings':>10} {'dicts':>10} {'JobPosting':>11} {'per posting':>16} {'saved':>6}  identical")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = JobStore(os.path.join(tmp, 'jobs.db'))
+            for week in range(-(-size // per_week)):
+                run = {}
+                for county, county_postings in county_jobs.items():
+                    run[county] = [job.replace(anchor_id=f"{job.anchor_id}w{week}",
+                                               ilea_link=f"{ILEA_BULLETIN_URL}#{job.anchor_id}w{week}",
+                                               date_posted=(date(2024, 1, 1) + timedelta(weeks=week)).isoformat())
+                                   for job in county_postings]
+                store.record_run(run, f"{date(2024, 1, 1) + timedelta(weeks=week)}T00:00:00")
+
+            def load(make):
+                with store.connect() as conn:
+                    rows = conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM postings LIMIT ?", (size,))
+                    return [make(decode_row(row)) for row in rows]
+
+            dicts, dict_bytes = retained_memory(load, dict)
+            postings, posting_bytes = retained_memory(load, lambda job: JobPosting(**job))
+        identical = [dict(posting) for posting in postings] == dicts
+        print(f"{len(postings):>10} {dict_bytes / 2**20:>8.1f}MB {posting_bytes / 2**20:>9.1f}MB "
+              f"{dict_bytes // len(dicts):>7}B -> {posting_bytes // len(postings):>5}B "
+              f"{1 - posting_bytes / dict_bytes:>6.0%}  {identical}")
+        if not identical:
+            raise SystemExit("JobPostings read back differently from the job dicts")
+
+
+def synthetic_history(size, weeks=52, seed=0):
+    """Postings first seen and closed on random days over a year of weekly runs"""
+    rng = random.Random(seed)
+    counties = list(IndianaPoliceJobsScraper().county_coordinates)
+    start = datetime(2024, 1, 1)
+    jobs = []
+    for i in range(size):
+        first_seen = start + timedelta(days=rng.randrange(weeks * 7))
+        closed_at = first_seen + timedelta(days=rng.randrange(7, 120))
+        jobs.append({
+            'department': f"Department {i % 500}",
+            'anchor_id': f"job{i}",
+            'county': rng.choice(counties),
+            'date_posted': first_seen.date().isoformat(),
+            'first_seen': first_seen,
+            'closed_at': closed_at if closed_at < start + timedelta(weeks=weeks) else None,
+        })
+    return jobs
+
+
+def loop_open_counts(jobs, period_ends):
+    """Open postings per county at each period end, one job dict at a time"""
+    counts = {}
+    for job in jobs:
+        for end in period_ends:
+            if job['first_seen'] < end and (job['closed_at'] is None or job['closed_at'] >= end):
+                counts[(end, job['county'])] = counts.get((end, job['county']), 0) + 1
+    return counts
+
+
+def bench_analytics(sizes):
+    """Time the weekly reports on pandas columns against a loop over job dicts"""
+    try:
+        from job_analytics import open_counts, openings, postings_frame, time_to_close
+    except ImportError:
+        print("pandas is not installed, skipping the analytics comparison (pip install pandas pyarrow)")
+        return
+
+    print(f"{'postings':>10} {'frame (s)':>10} {'reports (s)':>12} {'loop (s)':>10}")
+    for size in sizes:
+        jobs = synthetic_history(size)
+        frame, frame_time = time_call(postings_frame, jobs)
+
+        def reports():
+            return open_counts(frame), openings(frame, by='county'), time_to_close(frame)
+
+        (weekly, _, _), report_time = time_call(reports)
+        # Each weekly row counts what is open at the end of its Sunday
+        period_ends = [label.to_pydatetime() + timedelta(days=1) for label in weekly.index]
+        expected, loop_time = time_call(loop_open_counts, jobs, period_ends)
+        for end, label in zip(period_ends, weekly.index):
+            for county in weekly.columns:
+                assert weekly.at[label, county] == expected.get((end, county), 0), \
+                    f"open count mismatch for {county} in the week of {label.date()}"
+        print(f"{size:>10} {frame_time:>10.3f} {report_time:>12.3f} {loop_time:>10.3f}")
+
+
+def synthetic_archive(size, duplicate_rate=0.2, edit_rate=0.02, seed=0):
+    """Random descriptions, a share of them re-posted with a few words edited
+
+    Returns (texts, groups, reposts) where reposts maps each re-post to its original.
+    """
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(20000)]
+    texts, groups, reposts = [], [], {}
+    while len(texts) < size:
+        words = [rng.choice(vocabulary) for _ in range(rng.randint(50, 400))]
+        group = f"Department {rng.randrange(500)}"
+        texts.append(' '.join(words))
+        groups.append(group)
+        if len(texts) < size and rng.random() < duplicate_rate:
+            for _ in range(max(1, int(len(words) * edit_rate))):
+                words[rng.randrange(len(words))] = rng.choice(vocabulary)
+            reposts[len(texts)] = len(texts) - 1
+            texts.append(' '.join(words))
+            groups.append(group)
+    return texts, groups, reposts
+
+
+def pairwise_duplicates(texts, groups, threshold=DEFAULT_THRESHOLD):
+    """Every pair from the same group with exact shingle similarity at least threshold"""
+    shingle_sets = [shingles(text) for text in texts]
+    pairs = set()
+    for i in range(len(texts)):
+        for j in range(i + 1, len(texts)):
+            if groups[i] == groups[j]:
+                union = len(shingle_sets[i] | shingle_sets[j])
+                if union and len(shingle_sets[i] & shingle_sets[j]) / union >= threshold:
+                    pairs.add((i, j))
+    return pairs
+
+
+def bench_duplicates(sizes, pairwise_limit=5000):
+    """Time MinHash/LSH clustering, checked against exact pairwise comparison on small archives"""
+    print(f"{'postings':>10} {'signatures (s)':>15} {'clustering (s)':>15} {'pairwise (s)':>13} {'found':>8} {'missed':>7}")
+    for size in sizes:
+        texts, groups, reposts = synthetic_archive(size)
+        signatures, signature_time = time_call(lambda: [minhash_signature(text) for text in texts])
+        clusters, cluster_time = time_call(cluster_near_duplicates, texts, DEFAULT_THRESHOLD, groups, signatures)
+        found = {(cluster[0], member) for cluster in clusters for member in cluster[1:]}
+        assert all(reposts.get(member) == first for first, member in found), "a cluster joined unrelated postings"
+
+        pairwise_time = None
+        if size <= pairwise_limit:
+            # Every re-post in this archive pairs with one original, so clusters are pairs
+            expected, pairwise_time = time_call(pairwise_duplicates, texts, groups)
+            assert found <= expected, "LSH reported a pair below the similarity threshold"
+        missed = len(reposts) - len(found)
+        pairwise = f"{pairwise_time:>13.2f}" if pairwise_time is not None else f"{'-':>13}"
+        print(f"{size:>10} {signature_time:>15.2f} {cluster_time:>15.3f} {pairwise} {len(found):>8} {missed:>7}")
+
+
+def write_snapshots(directory, count, open_postings=100, turnover=5, edit_rate=0.02, seed=0):
+    """Write weekly bulletin snapshots to a directory, as a years-long archive would hold them
+
+    Each week the oldest postings drop off and new ones are added; a few are
+    edited, a few miss a week and come back, every tenth copy is gzipped and
+    the one in the middle is a saved error page.
+    """
+    rng = random.Random(seed)
+    pool = generate_postings(open_postings + count * turnover, seed)
+    edits = {}
+    first = datetime(2020, 1, 6, 6, 0)
+    for week in range(count):
+        listed = pool[week * turnover:week * turnover + open_postings]
+        for anchor_id, _, paragraphs in listed:
+            if rng.random() < edit_rate:
+                edits[anchor_id] = paragraphs[:-1] + [f"APPLICATIONS WILL BE ACCEPTED UNTIL DECEMBER {rng.randint(1, 28)}, 2025."]
+        missing = set(rng.sample(range(len(listed)), 2)) if rng.random() < 0.2 else set()
+        html = render_bulletin([(anchor_id, agency, edits.get(anchor_id, paragraphs))
+                                for i, (anchor_id, agency, paragraphs) in enumerate(listed) if i not in missing])
+        if week == count // 2:
+            html = '<html><body><h1>503 Service Unavailable</h1></body></html>'
+        name = f"bulletin-{(first + timedelta(weeks=week)).strftime('%Y-%m-%dT%H%M%S')}.html"
+        if week % 10 == 9:
+            with gzip.open(os.path.join(directory, name + '.gz'), 'wt', encoding='utf-8') as f:
+                f.write(html)
+        else:
+            with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+                f.write(html)
+
+
+def record_snapshots(snapshots, store):
+    """Record every snapshot as a live run of its own, one after another"""
+    init_worker()
+    for snapshot in snapshots:
+        postings = parse_snapshot(snapshot)
+        if not postings:
+            continue
+        county_jobs = defaultdict(list)
+        for job in postings.values():
+            county_jobs[job.county].append(job.replace(date_posted=snapshot.taken_at.date().isoformat()))
+        store.record_run(county_jobs, snapshot.taken_at.isoformat(timespec='seconds'))
+
+
+def store_contents(store):
+    """Every posting row and every run (without its id) in a job store"""
+    with store.connect() as conn:
+        postings = [tuple(row) for row in conn.execute("SELECT * FROM postings ORDER BY posting_key")]
+        runs = [tuple(row)[1:] for row in conn.execute("SELECT * FROM runs ORDER BY run_id")]
+    return postings, runs
+
+
+def bench_backfill(sizes, workers=None):
+    """Time the process-pool backfill over snapshot archives, checked against one live run per snapshot"""
+    worker_counts = sorted({1, workers or os.cpu_count() or 1})
+    columns = ''.join(f" {f'{count} worker(s) (s)':>18}" for count in worker_counts)
+    print(f"{'snapshots':>10} {'serial runs (s)':>16}{columns} {'per snapshot':>13}  identical")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            archive = os.path.join(tmp, 'snapshots')
+            os.mkdir(archive)
+            write_snapshots(archive, size)
+            reference = JobStore(os.path.join(tmp, 'serial.db'))
+            with contextlib.redirect_stdout(io.StringIO()):
+                _, serial_time = time_call(record_snapshots, find_snapshots(archive), reference)
+            expected = store_contents(reference)
+
+            times = []
+            identical = True
+            for count in worker_counts:
+                store = JobStore(os.path.join(tmp, f"backfill{count}.db"))
+                with contextlib.redirect_stdout(io.StringIO()):
+                    summary = backfill(archive, store, workers=count)
+                times.append(summary['seconds'])
+                identical = identical and store_contents(store) == expected
+        timings = ''.join(f" {seconds:>18.2f}" for seconds in times)
+        print(f"{size:>10} {serial_time:>16.2f}{timings} {min(times) / size * 1000:>11.1f}ms  {identical}")
+        if not identical:
+            raise SystemExit("The backfilled job store differs from recording each snapshot as a run")
+
+
+# Stages reported by the pipeline benchmark, in pipeline order
+PIPELINE_STAGES = ('fetch', 'parse', 'details', 'dedupe', 'resolve', 'digest', 'csv', 'map', 'table')
+
+# A slowdown or memory growth beyond this fraction of the baseline is a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+# The stand-in server's bulletin never changes, so it always has this date
+BULLETIN_LAST_MODIFIED = formatdate(datetime(2025, 9, 1, 6, 0).timestamp(), usegmt=True)
+
+
+class BulletinHandler(BaseHTTPRequestHandler):
+    """Serves the synthetic bulletin for every GET, with validators, answering 304 when unchanged"""
+
+    body = b''
+    etag = None
+    # Shared by every request to one server: GETs served and how many were 304s
+    counts = None
+
+    def not_modified(self):
+        if self.headers.get('If-None-Match') is not None:
+            return self.headers['If-None-Match'] == self.etag
+        since = self.headers.get('If-Modified-Since')
+        if since is None:
+            return False
+        try:
+            return parsedate_to_datetime(since) >= parsedate_to_datetime(BULLETIN_LAST_MODIFIED)
+        except (TypeError, ValueError):
+            return False
+
+    def do_GET(self):
+        self.counts['requests'] += 1
+        if self.not_modified():
+            self.counts['not_modified'] += 1
+            self.send_response(304)
+            self.send_header('ETag', self.etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.send_header('ETag', self.etag)
+        self.send_header('Last-Modified', BULLETIN_LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextlib.contextmanager
+def serve_bulletin(html, counts=None, port=0):
+    """Serve a bulletin on a local port for the duration of the block; yields its URL
+
+    counts, if given, is a dict that gets the number of requests and 304 answers.
+    port 0 picks a free port; passing an earlier URL's port brings that page back.
+    """
+    body = html.encode('utf-8')
+    counts = counts if counts is not None else {}
+    counts.update(requests=0, not_modified=0)
+    handler = type('Handler', (BulletinHandler,), {
+        'body': body,
+        'etag': f'"{hashlib.sha256(body).hexdigest()[:16]}"',
+        'counts': counts,
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run_pipeline(url, profile=None):
+    """Run the scraper end to end against url in a scratch directory; returns its RunMetrics"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            scraper = IndianaPoliceJobsScraper(sample_fallback=False, profile=profile, verbose=False)
+            scraper.base_url = url
+            with contextlib.redirect_stdout(io.StringIO()):
+                scraper.run()
+        finally:
+            os.chdir(cwd)
+    return scraper.metrics
+
+
+def check_http_cache(size=50):
+    """Check that a repeat fetch is a 304 served from the cache and an unchanged bulletin is not reprocessed"""
+    counts = {}
+    with serve_bulletin(generate_bulletin(size), counts) as url:
+        # Either validator on its own gets a 304
+        with urlopen(url) as response:
+            validators = [{'If-None-Match': response.headers['ETag']},
+                          {'If-Modified-Since': response.headers['Last-Modified']}]
+        for headers in validators:
+            try:
+                urlopen(Request(url, headers=headers)).close()
+                status = 200
+            except HTTPError as e:
+                status = e.code
+            assert status == 304, f"{headers} was answered {status}, not 304"
+
+        for scraper_class in (IndianaPoliceJobsScraper, AsyncIndianaPoliceJobsScraper):
+            cwd = os.getcwd()
+            with tempfile.TemporaryDirectory() as tmp:
+                os.chdir(tmp)
+                try:
+                    scraper = scraper_class(cache_dir='cache', sample_fallback=False, verbose=False)
+                    scraper.base_url = url
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        first = scraper.run()
+                        first_csv = open(scraper.csv_filename, 'rb').read()
+                        before = dict(counts)
+                        second = scraper.run()
+                        second_metrics = scraper.metrics.counters
+                        # A missing output is rebuilt from the cached body
+                        os.remove(scraper.csv_filename)
+                        third = scraper.run()
+                        third_csv = open(scraper.csv_filename, 'rb').read()
+                finally:
+                    os.chdir(cwd)
+            name = scraper_class.__name__
+            assert first[1] is not None, f"{name}: the first run should process the bulletin"
+            assert counts['not_modified'] - before['not_modified'] == 2, \
+                f"{name}: repeat fetches should be answered 304"
+            assert second == (None, None), f"{name}: an unchanged bulletin should not be reprocessed"
+            assert second_metrics['pages_not_modified'] == 1, f"{name}: the second fetch should come from the cache"
+            assert third[1] is not None and scraper.metrics.counters['pages_not_modified'] == 1, \
+                f"{name}: a missing output should be rebuilt from the cached body"
+            assert third_csv == first_csv, f"{name}: the cached body gave different postings"
+    print(f"HTTP cache: repeat fetches answered 304 from the cache, unchanged bulletin skipped ({size} postings)")
+
+
+def check_fallback_store(size=50):
+    """Check that a failed fetch, answered with the sample data, leaves the job store as it was"""
+    scraper = IndianaPoliceJobsScraper(verbose=False)
+    county_jobs = scraper.process_job_data(extract_quietly(scraper, generate_bulletin(size).encode('utf-8')))
+    with serve_bulletin('') as url:
+        pass  # the server is gone once the block ends, so its port refuses connections
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            store = JobStore('jobs.db')
+            store.record_run(county_jobs, '2024-01-01T00:00:00')
+            before = store_contents(store)
+            for scraper_class in (IndianaPoliceJobsScraper, AsyncIndianaPoliceJobsScraper):
+                scraper = scraper_class(store_path='jobs.db', verbose=False)
+                scraper.base_url = url
+                scraper.fetcher.retries = 0
+                with contextlib.redirect_stdout(io.StringIO()):
+                    scraper.run()
+                assert scraper.using_sample_data, "a failed fetch should fall back to the sample data"
+                assert store_contents(store) == before, \
+                    f"{scraper_class.__name__} recorded the sample data in the job store"
+        finally:
+            os.chdir(cwd)
+    print(f"Failed fetch with the sample data fallback: job store unchanged ({size} open postings)")
+
+
+@contextlib.contextmanager
+def count_calls(owner, name, counts):
+    """Count the calls to owner.name in counts[name] for the duration of the block"""
+    original = getattr(owner, name)
+
+    def counted(*args, **kwargs):
+        counts[name] = counts.get(name, 0) + 1
+        return original(*args, **kwargs)
+
+    setattr(owner, name, counted)
+    try:
+        yield
+    finally:
+        setattr(owner, name, original)
+
+
+def check_incremental_reuse(size=50):
+    """Check that incremental mode reuses the details and county of unchanged postings
+
+    The second run of an unchanged bulletin must extract no details and resolve
+    no county, yet give the same postings as a full run; editing one posting
+    re-derives that posting only.
+    """
+    html = generate_bulletin(size)
+    edited = html.replace('<a name="Posting0"></a>', '<a name="Posting0"></a><p>Now hiring for 12-hour shifts.</p>', 1)
+    calls = []
+    port = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        state_file = os.path.join(tmp, 'state.json')
+        # The edit is served at the same URL, as the bulletin would be
+        for page in (html, html, edited):
+            with serve_bulletin(page, port=port) as url:
+                port = urlsplit(url).port
+                reference = IndianaPoliceJobsScraper(verbose=False)
+                scraper = IndianaPoliceJobsScraper(state_file=state_file, verbose=False)
+                reference.base_url = scraper.base_url = url
+                counts = {}
+                with contextlib.redirect_stdout(io.StringIO()):
+                    expected = reference.scrape_postings()
+                    with count_calls(sys.modules[IndianaPoliceJobsScraper.__module__], 'extract_details', counts), \
+                            count_calls(scraper, 'match_county', counts):
+                        county_jobs = scraper.scrape_postings()
+                    scraper.posting_state.save(state_file)
+            assert county_jobs == expected, "incremental mode changed the postings"
+            calls.append((counts.get('extract_details', 0), counts.get('match_county', 0)))
+    assert calls[1] == (0, 0), f"an unchanged bulletin re-derived details and counties: {calls[1]} calls"
+    assert calls[2] == (1, 2), f"one edited posting should be re-derived once, got {calls[2]} calls"
+    print(f"Incremental mode: unchanged postings reuse their details and county "
+          f"({calls[0][0]} postings derived, then {calls[1][0]}, then {calls[2][0]} after one edit)")
+
+
+AGENCY_PAGE = ("<html><body><h1>Carmel Police Department</h1><p>Hiring lateral officers. Salary $62,000 "
+               "per year. Apply by December 1, 2025 to recruiting@carmel.in.gov.</p></body></html>")
+
+
+def check_partial_fetch(size=50):
+    """Check that a source that fails to fetch keeps its postings in the job store and incremental state
+
+    The agency page is up for the first run, down for the second and back for
+    the third: its posting must stay open, never be listed as removed or added,
+    and keep the date it was first seen.
+    """
+    first_seen = '2025-01-01'
+    for scraper_class in (IndianaPoliceJobsScraper, AsyncIndianaPoliceJobsScraper):
+        name = scraper_class.__name__
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp, serve_bulletin(generate_bulletin(size)) as url:
+            os.chdir(tmp)
+            try:
+                def run(agency_url):
+                    sources = [IleaBulletinSource(url), AgencyPageSource(agency_url, 'Carmel Police Department')]
+                    scraper = scraper_class(sources=sources, store_path='jobs.db', state_file='state.json',
+                                            sample_fallback=False, verbose=False)
+                    scraper.fetcher.retries = 0
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        scraper.run()
+                    with open('indiana_police_jobs_changes.json', encoding='utf-8') as f:
+                        changes = json.load(f)
+                    return scraper, changes
+
+                with serve_bulletin(AGENCY_PAGE) as agency_url:
+                    run(agency_url)
+                # Backdate the agency's posting, so a re-added posting would show
+                with open('state.json', encoding='utf-8') as f:
+                    state = json.load(f)
+                for entry in state['postings'].values():
+                    if entry['job']['department'] == 'Carmel Police Department':
+                        entry['job']['date_posted'] = first_seen
+                with open('state.json', 'w', encoding='utf-8') as f:
+                    json.dump(state, f)
+
+                # The agency's page is down for the second run and back for the third
+                down, down_changes = run(agency_url)
+                agency = down.job_store.postings(department='Carmel Police Department', include_closed=True)
+                with serve_bulletin(AGENCY_PAGE, port=urlsplit(agency_url).port):
+                    back, back_changes = run(agency_url)
+            finally:
+                os.chdir(cwd)
+        run_row = down.last_store_run
+        assert down.last_fetched_urls == {url}, f"{name}: the failed source should be left out of the fetched URLs"
+        assert run_row['closed'] == 0, f"{name}: a source that failed to fetch closed {run_row['closed']} posting(s)"
+        assert len(agency) == 1 and agency[0]['closed_at'] is None, f"{name}: the agency's posting should stay open"
+        assert not down_changes['removed'], f"{name}: the failed source's postings were listed as removed"
+        assert back.last_fetched_urls is None and not back_changes['added'], \
+            f"{name}: the source's postings were re-added when it came back"
+        dates = [entry['job']['date_posted'] for entry in back.posting_state.previous.values()
+                 if entry['job']['department'] == 'Carmel Police Department']
+        assert dates == [first_seen], f"{name}: the agency's posting lost its first-seen date ({dates})"
+    print(f"Partial fetch: a source that is down keeps its postings in the job store and incremental state "
+          f"({size} postings)")
+
+
+def bench_pipeline(sizes, repeat=3):
+    """Time every stage of IndianaPoliceJobsScraper.run() against a locally served bulletin
+
+    Each size keeps its fastest of repeat runs; the peak memory comes from one
+    more run under tracemalloc, which slows everything down. Returns the results
+    by size, in the form save_baseline() writes.
+    """
+    print(f"{'postings':>10} {'total (s)':>10} {'postings/s':>11} "
+          + ' '.join(f"{stage:>8}" for stage in PIPELINE_STAGES) + f" {'peak':>9}")
+    results = {}
+    for size in sizes:
+        with serve_bulletin(generate_bulletin(size)) as url:
+            metrics = min((run_pipeline(url) for _ in range(repeat)), key=lambda metrics: metrics.seconds)
+            peak = run_pipeline(url, profile='memory').memory_peak
+        stages = {name: stage['seconds'] for name, stage in metrics.stages.items()}
+        results[str(size)] = {
+            'seconds': metrics.seconds,
+            'postings_per_second': size / metrics.seconds,
+            'peak_bytes': peak,
+            'stages': stages,
+            'counters': metrics.counters,
+        }
+        print(f"{size:>10} {metrics.seconds:>10.3f} {size / metrics.seconds:>11.0f} "
+              + ' '.join(f"{stages.get(stage, 0):>8.3f}" for stage in PIPELINE_STAGES)
+              + f" {peak / 2**20:>7.1f}MB")
+    return results
+
+
+def save_baseline(results, path):
+    """Save pipeline results as the baseline later runs are checked against"""
+    baseline = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+    print(f"Baseline saved to {path}")
+
+
+def check_baseline(results, path, tolerance=DEFAULT_TOLERANCE):
+    """Exit with an error if throughput or peak memory regressed against a saved baseline
+
+    Only sizes in both are compared. Baselines are specific to a machine, so
+    compare runs made on the same one.
+    """
+    with open(path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = []
+    for size, result in results.items():
+        expected = baseline['results'].get(size)
+        if expected is None:
+            continue
+        throughput = result['postings_per_second'] / expected['postings_per_second']
+        memory = result['peak_bytes'] / expected['peak_bytes']
+        print(f"{size:>10} postings: throughput {throughput:.0%} of baseline, peak memory {memory:.0%}")
+        if throughput < 1 - tolerance:
+            regressions.append(f"{size} postings: {result['postings_per_second']:.0f} postings/s, "
+                               f"baseline {expected['postings_per_second']:.0f}")
+        if memory > 1 + tolerance:
+            regressions.append(f"{size} postings: peak {result['peak_bytes'] / 2**20:.1f}MB, "
+                               f"baseline {expected['peak_bytes'] / 2**20:.1f}MB")
+    if regressions:
+        raise SystemExit("Pipeline regressed against " + path + ":\n" + '\n'.join(regressions))
+
+
+# Modules the command line must not load for commands that only read the job store
+HEAVY_MODULES = ('requests', 'bs4', 'folium', 'branca', 'jinja2', 'pandas')
+
+# Seconds `run_scraper.py stats` may take to import and run, after interpreter start-up
+STATS_BUDGET = 0.1
+
+# Runs `run_scraper.py <command> --store <path>` (path, command and its arguments on the command line)
+COMMAND_PROBE = """
+import contextlib, io, json, sys, time
+start = time.perf_counter()
+import run_scraper
+with contextlib.redirect_stdout(io.StringIO()):
+    run_scraper.main(sys.argv[2:] + ['--store', sys.argv[1]])
+print(json.dumps({'seconds': time.perf_counter() - start, 'modules': sorted(sys.modules)}))
+"""
+
+
+def check_import_budget(size=1000, budget=STATS_BUDGET, repeat=3):
+    """Fail if the stats command loads a heavy module or runs over budget on a store of size postings,
+    or if export-csv, which fetches nothing, loads requests
+
+    Each run is a fresh interpreter, as from the shell; the fastest is kept.
+    """
+    scraper = IndianaPoliceJobsScraper()
+    county_jobs = scraper.process_job_data(extract_quietly(scraper, generate_bulletin(size).encode('utf-8')))
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'jobs.db')
+        JobStore(path).record_run(county_jobs)
+        def probe(*command):
+            return json.loads(subprocess.run([sys.executable, '-c', COMMAND_PROBE, path, *command], cwd=here,
+                                             check=True, capture_output=True, text=True).stdout)
+
+        probes = [probe('stats') for _ in range(repeat)]
+        export = probe('export-csv', '--output', os.path.join(tmp, 'jobs.csv'))
+    seconds = min(probe['seconds'] for probe in probes)
+    loaded = [name for name in HEAVY_MODULES if name in probes[0]['modules']]
+    print(f"stats on {size} postings: {seconds * 1000:.0f}ms (budget {budget * 1000:.0f}ms), "
+          f"heavy modules loaded: {', '.join(loaded) or 'none'}")
+    if loaded:
+        raise SystemExit(f"The stats command imported {', '.join(loaded)}")
+    if seconds > budget:
+        raise SystemExit(f"The stats command took {seconds * 1000:.0f}ms, over its {budget * 1000:.0f}ms budget")
+    if 'requests' in export['modules']:
+        raise SystemExit("The export-csv command imported requests")
+
+
+# Postings in the bulletin the backends are compared on by --checks-only
+CHECK_SIZE = 200
+
+
+def run_checks():
+    """Run the regression checks on their own, without the benchmarks (seconds, not minutes)"""
+    bench_backends([CHECK_SIZE])
+    check_parser_edge_cases()
+    check_golden_fields()
+    check_http_cache()
+    check_fallback_store()
+    check_partial_fetch()
+    check_incremental_reuse()
+    check_import_budget()
+
+
+def run_component_benchmarks(args):
+    """Benchmark each stage on its own, checked against the code it replaced"""
+    if not args.skip_legacy:
+        bench_sections(args.sizes)
+        print()
+    bench_backends(args.sizes)
+    check_parser_edge_cases()
+    print()
+    check_golden_fields()
+    bench_fields()
+    print()
+    bench_counties()
+    print()
+    bench_departments()
+    print()
+    bench_rendering(args.render_sizes)
+    print()
+    bench_payload(args.payload_sizes)
+    print()
+    bench_search(args.search_sizes)
+    print()
+    bench_store(args.store_sizes)
+    print()
+    bench_postings(args.posting_sizes)
+    print()
+    bench_analytics(args.analytics_sizes)
+    print()
+    bench_duplicates(args.duplicate_sizes)
+    print()
+    bench_backfill(args.backfill_sizes, args.backfill_workers)
+    print()
+    check_http_cache()
+    check_fallback_store()
+    check_partial_fetch()
+    check_incremental_reuse()
+    check_import_budget()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 500, 1000, 2000],
+                        help='Number of postings in each synthetic bulletin')
+    parser.add_argument('--render-sizes', type=int, nargs='+', default=[1000, 5000, 10000, 20000],
+                        help='Number of postings in each rendering comparison')
+    parser.add_argument('--payload-sizes', type=int, nargs='+', default=[45, 500, 2000, 10000],
+                        help='Number of postings in each client-side payload comparison')
+    parser.add_argument('--search-sizes', type=int, nargs='+', default=[500, 2000, 10000],
+                        help='Number of postings in each search index comparison')
+    parser.add_argument('--store-sizes', type=int, nargs='+', default=[500, 2000, 10000],
+                        help='Number of postings in each job store run')
+    parser.add_argument('--posting-sizes', type=int, nargs='+', default=[10000, 100000],
+                        help='Number of postings in each archive loaded as dicts and as JobPostings')
+    parser.add_argument('--analytics-sizes', type=int, nargs='+', default=[10000, 100000],
+                        help='Number of postings in each year of synthetic history for the analytics reports')
+    parser.add_argument('--duplicate-sizes', type=int, nargs='+', default=[2000, 20000, 100000],
+                        help='Number of postings in each archive for near-duplicate detection')
+    parser.add_argument('--backfill-sizes', type=int, nargs='+', default=[50, 200],
+                        help='Number of weekly bulletin snapshots in each backfill archive')
+    parser.add_argument('--backfill-workers', type=int,
+                        help='Worker processes for the backfill benchmark (default: one per core)')
+    parser.add_argument('--pipeline-sizes', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                        help='Number of postings in each end-to-end pipeline run (up to 100000)')
+    parser.add_argument('--pipeline-repeat', type=int, default=3,
+                        help='Pipeline runs per size; the fastest is kept')
+    parser.add_argument('--pipeline-only', action='store_true',
+                        help='Only run the end-to-end pipeline benchmark')
+    parser.add_argument('--save-baseline', help='Save the pipeline results as a baseline JSON file')
+    parser.add_argument('--baseline', help='Fail if the pipeline regressed against this baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Slowdown or memory growth (as a fraction) allowed against the baseline')
+    parser.add_argument('--skip-legacy', action='store_true',
+                        help='Skip the slow comparison against the per-link lookup')
+    parser.add_argument('--checks-only', action='store_true',
+                        help='Only run the regression checks (backend parity, golden fields, caching, '
+                             'job store, import budget), for CI')
+    args = parser.parse_args()
+
+    if args.checks_only:
+        run_checks()
+        return
+    if not args.pipeline_only:
+        run_component_benchmarks(args)
+        print()
+    results = bench_pipeline(args.pipeline_sizes, args.pipeline_repeat)
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+    if args.baseline:
+        check_baseline(results, args.baseline, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Build data/indiana_counties.topojson for the county choropleth
+Indiana's counties are cut out of a US counties TopoJSON, such as the
+us-atlas counties-10m.json (https://github.com/topojson/us-atlas) or the
+USCountiesMap.json bundled with bqplot. Each shared border is simplified once,
+so neighbouring counties still meet exactly, and the result is re-quantized
+"""
+
+import argparse
+import json
+
+from build_gazetteer import county_key
+from county_shapes import DEFAULT_COUNTY_SHAPES_PATH
+from indiana_police_jobs_scraper import IndianaPoliceJobsScraper
+
+INDIANA_FIPS = '18'
+
+
+def decode_arcs(topology):
+    """Return the topology's arcs as lists of (lon, lat) points"""
+    transform = topology.get('transform')
+    arcs = []
+    for arc in topology['arcs']:
+        if transform is None:
+            arcs.append([tuple(point[:2]) for point in arc])
+            continue
+        (scale_x, scale_y), (translate_x, translate_y) = transform['scale'], transform['translate']
+        x = y = 0
+        points = []
+        for dx, dy in (point[:2] for point in arc):
+            x += dx
+            y += dy
+            points.append((x * scale_x + translate_x, y * scale_y + translate_y))
+        arcs.append(points)
+    return arcs
+
+
+def simplify(points, tolerance):
+    """Douglas-Peucker simplification that always keeps both end points"""
+    if len(points) < 3:
+        return list(points)
+    if points[0] == points[-1]:
+        # A closed ring: split it at its farthest point so it cannot collapse
+        far = max(range(len(points)), key=lambda i: (points[i][0] - points[0][0]) ** 2 + (points[i][1] - points[0][1]) ** 2)
+        return simplify(points[:far + 1], tolerance)[:-1] + simplify(points[far:], tolerance)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        (x1, y1), (x2, y2) = points[first], points[last]
+        dx, dy = x2 - x1, y2 - y1
+        length = (dx * dx + dy * dy) ** 0.5
+        best, best_distance = None, tolerance
+        for i in range(first + 1, last):
+            x, y = points[i]
+            if length:
+                distance = abs(dy * (x - x1) - dx * (y - y1)) / length
+            else:
+                distance = ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+            if distance > best_distance:
+                best, best_distance = i, distance
+        if best is not None:
+            keep[best] = True
+            stack.append((first, best))
+            stack.append((best, last))
+    return [point for point, kept in zip(points, keep) if kept]
+
+
+def arc_indexes(arcs_field):
+    """Yield every arc index (negative means reversed) in a geometry's nested arcs"""
+    for item in arcs_field:
+        if isinstance(item, list):
+            yield from arc_indexes(item)
+        else:
+            yield item
+
+
+def remap(arcs_field, new_index):
+    """Rewrite a geometry's nested arc indexes through new_index"""
+    if isinstance(arcs_field, list):
+        return [remap(item, new_index) for item in arcs_field]
+    if arcs_field < 0:
+        return ~new_index[~arcs_field]
+    return new_index[arcs_field]
+
+
+def build(source, output, counties, tolerance=0.002, quantization=10000, object_name=None):
+    """Cut the counties out of a US TopoJSON, simplify them and write the result"""
+    with open(source, encoding='utf-8') as f:
+        topology = json.load(f)
+
+    objects = topology['objects']
+    object_name = object_name or next(name for name in ('counties', 'subunits') if name in objects)
+
+    # County FIPS codes are assigned alphabetically: Adams is 001, Allen 003, ...
+    by_fips = {f"{INDIANA_FIPS}{2 * i + 1:03d}": county for i, county in enumerate(sorted(counties, key=str.lower))}
+    geometries = []
+    for geometry in objects[object_name]['geometries']:
+        county = by_fips.get(f"{int(geometry.get('id', 0)):05d}")
+        if county is None:
+            continue
+        source_name = (geometry.get('properties') or {}).get('name')
+        if source_name and county_key(source_name) != county_key(county):
+            print(f"Warning: FIPS {geometry['id']} is {source_name} in the source, {county} here")
+        geometries.append((county, geometry))
+
+    missing = sorted(set(counties) - {county for county, _ in geometries})
+    if missing:
+        raise SystemExit(f"No shapes for: {', '.join(missing)}")
+
+    # Simplify every arc Indiana uses exactly once, so shared borders stay shared
+    arcs = decode_arcs(topology)
+    used = sorted({~index if index < 0 else index for _, geometry in geometries for index in arc_indexes(geometry['arcs'])})
+    new_index = {old: new for new, old in enumerate(used)}
+    simplified = [simplify(arcs[old], tolerance) for old in used]
+
+    min_x = min(x for arc in simplified for x, _ in arc)
+    min_y = min(y for arc in simplified for _, y in arc)
+    max_x = max(x for arc in simplified for x, _ in arc)
+    max_y = max(y for arc in simplified for _, y in arc)
+    scale_x = (max_x - min_x) / (quantization - 1)
+    scale_y = (max_y - min_y) / (quantization - 1)
+
+    encoded = []
+    for arc in simplified:
+        points = []
+        for x, y in arc:
+            point = (round((x - min_x) / scale_x), round((y - min_y) / scale_y))
+            if not points or point != points[-1]:
+                points.append(point)
+        if len(points) == 1:
+            points.append(points[0])
+        deltas = [list(points[0])] + [[x - px, y - py] for (px, py), (x, y) in zip(points, points[1:])]
+        encoded.append(deltas)
+
+    result = {
+        'type': 'Topology',
+        'transform': {'scale': [scale_x, scale_y], 'translate': [min_x, min_y]},
+        'objects': {
+            'counties': {
+                'type': 'GeometryCollection',
+                'geometries': [
+                    {'type': geometry['type'], 'arcs': remap(geometry['arcs'], new_index), 'properties': {'name': county}}
+                    for county, geometry in sorted(geometries)
+                ],
+            },
+        },
+        'arcs': encoded,
+    }
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, separators=(',', ':'))
+
+    points = sum(len(arc) for arc in encoded)
+    print(f"Wrote {len(geometries)} counties, {len(encoded)} arcs and {points} points to {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the simplified Indiana county shapes")
+    parser.add_argument('source', help="US counties TopoJSON with county FIPS codes as geometry ids")
+    parser.add_argument('--output', default=DEFAULT_COUNTY_SHAPES_PATH, help="TopoJSON file to write")
+    parser.add_argument('--tolerance', type=float, default=0.002,
+                        help="Simplification tolerance in degrees (0.002 is about 200 m)")
+    parser.add_argument('--quantization', type=int, default=10000, help="Grid size for the output coordinates")
+    parser.add_argument('--object', help="Name of the counties object in the source (default: counties or subunits)")
+    args = parser.parse_args()
+
+    counties = list(IndianaPoliceJobsScraper().county_coordinates)
+    build(args.source, args.output, counties, args.tolerance, args.quantization, args.object)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Build data/indiana_gazetteer.bin for the county resolver
+Cities and towns come from the USPS place names in the zipcodes package
+(pip install zipcodes); townships can be added from a Census Gazetteer county
+subdivisions file (https://www.census.gov/geographies/reference-files/time-series/geo/gazetteer-files.html)
+"""
+
+import argparse
+import csv
+import re
+from collections import Counter, defaultdict
+
+from gazetteer import DEFAULT_GAZETTEER_PATH, normalize_place_name, write_gazetteer
+from indiana_police_jobs_scraper import IndianaPoliceJobsScraper
+
+# Marion County's township school districts and fire departments post under the
+# township name alone; every one of these names is also used by townships in
+# other counties, so they are listed here rather than taken from the Census file
+MARION_COUNTY_TOWNSHIPS = {
+    'Pike Township': (39.870, -86.265),
+    'Washington Township': (39.870, -86.150),
+    'Lawrence Township': (39.870, -86.010),
+    'Wayne Township': (39.770, -86.265),
+    'Warren Township': (39.775, -86.010),
+    'Decatur Township': (39.680, -86.265),
+    'Perry Township': (39.680, -86.150),
+    'Franklin Township': (39.680, -86.010),
+}
+
+
+def county_key(name):
+    """Reduce a county name to a comparable key ("St. Joseph County" -> "saintjoseph")"""
+    name = re.sub(r'^st\.?\s', 'saint ', name.lower().replace(' county', ''))
+    return re.sub(r'[^a-z]', '', name)
+
+
+def zipcode_places(counties):
+    """Return {name: (county, lat, lon)} for every USPS place name in Indiana"""
+    import zipcodes
+
+    canonical = {county_key(county): county for county in counties}
+    # Count ZIP codes per (name, county); primary city names count before alternates
+    primary = defaultdict(Counter)
+    alternate = defaultdict(Counter)
+    coordinates = defaultdict(list)
+    for record in zipcodes.filter_by(state='IN'):
+        county = canonical.get(county_key(record['county'])) if record['county'] else None
+        if county is None:
+            continue
+        point = (float(record['lat']), float(record['long']))
+        primary[normalize_place_name(record['city'])][county] += 1
+        coordinates[(normalize_place_name(record['city']), county)].append(point)
+        for name in record['acceptable_cities']:
+            alternate[normalize_place_name(name)][county] += 1
+            coordinates[(normalize_place_name(name), county)].append(point)
+
+    places = {}
+    for source in (primary, alternate):
+        for name, county_counts in source.items():
+            if name in places:
+                continue
+            county = county_counts.most_common(1)[0][0]
+            points = coordinates[(name, county)]
+            places[name] = (
+                county,
+                sum(lat for lat, _ in points) / len(points),
+                sum(lon for _, lon in points) / len(points)
+            )
+    return places
+
+
+def census_townships(path, counties):
+    """Return {name: (county, lat, lon)} for townships whose name is unique in Indiana"""
+    # County FIPS codes are assigned alphabetically: Adams is 001, Allen 003, ...
+    by_fips = {f"{2 * i + 1:03d}": county for i, county in enumerate(sorted(counties, key=str.lower))}
+    found = defaultdict(list)
+    with open(path, encoding='utf-8') as f:
+        reader = csv.reader(f, delimiter='\t')
+        header = [column.strip() for column in next(reader)]
+        for row in reader:
+            row = dict(zip(header, (value.strip() for value in row)))
+            if row['USPS'] != 'IN' or not row['NAME'].lower().endswith(' township'):
+                continue
+            county = by_fips.get(row['GEOID'][2:5])
+            if county:
+                found[normalize_place_name(row['NAME'])].append((county, float(row['INTPTLAT']), float(row['INTPTLONG'])))
+    return {name: entries[0] for name, entries in found.items() if len(entries) == 1}
+
+
+def build(output, cousubs=None):
+    counties = list(IndianaPoliceJobsScraper().county_coordinates)
+    places = zipcode_places(counties)
+    if cousubs:
+        for name, place in census_townships(cousubs, counties).items():
+            places.setdefault(name, place)
+    for name, (lat, lon) in MARION_COUNTY_TOWNSHIPS.items():
+        places[normalize_place_name(name)] = ('Marion', lat, lon)
+
+    write_gazetteer(output, [(name, county, lat, lon) for name, (county, lat, lon) in places.items()])
+    print(f"Wrote {len(places)} places in {len(set(county for county, _, _ in places.values()))} counties to {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline Indiana gazetteer")
+    parser.add_argument('--output', default=DEFAULT_GAZETTEER_PATH, help="Gazetteer file to write")
+    parser.add_argument('--cousubs', help="Census Gazetteer county subdivisions file (adds townships)")
+    args = parser.parse_args()
+    build(args.output, args.cousubs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Bulletin page parsing for the ILEA job opportunities page
+Walks the document once and indexes every job section by its anchor name
+
+The section logic lives in ParserBackend and is shared by every backend;
+each backend only supplies the few tree accessors it needs. That keeps the
+extracted job_info identical whichever parser is selected, as long as the
+markup is well formed. Malformed markup is repaired differently: lxml and
+selectolax close a <p> at a block element or another <p>, as a browser does,
+while html.parser keeps the nesting as written, so text after the block can
+land in a different section (see PARSER_EDGE_CASES in benchmark.py).
+"""
+
+# Elements whose text makes up a job description
+SECTION_TAGS = ('p', 'h3', 'h4', 'h5', 'h6')
+
+
+def decode_content(content):
+    """Decode response bytes the same way BeautifulSoup would"""
+    if isinstance(content, str):
+        return content
+    from bs4 import UnicodeDammit
+    return UnicodeDammit(content, is_html=True).unicode_markup
+
+
+class ParserBackend:
+    """Base class for bulletin parsers"""
+
+    name = None
+
+    def parse(self, content):
+        """Return the in-page job links and an anchor name -> description index
+
+        job_links is a list of (link_text, anchor_id) tuples in document order.
+        Both the links and the named anchors are collected in a single pass over
+        the <a> elements, so the cost grows linearly with the page size.
+        """
+        root = self.load(content)
+        job_links = []
+        anchors = []
+
+        for a in self.iter_anchors(root):
+            href = self.attr(a, 'href')
+            if href and href.startswith('#'):
+                job_links.append((self.text(a), href[1:]))
+            if self.attr(a, 'name'):
+                anchors.append(a)
+
+        return job_links, self.index_sections(anchors)
+
+    def index_sections(self, anchors):
+        """Map each anchor name to the description text that follows it
+
+        A section runs from a named anchor up to the next named anchor among its
+        siblings. Each parent element is walked once, instead of searching the
+        whole document for every anchor.
+        """
+        # The first anchor in document order wins, matching soup.find()
+        first_anchor = {}
+        for anchor in anchors:
+            first_anchor.setdefault(self.attr(anchor, 'name'), anchor)
+        first_ids = {self.node_id(anchor) for anchor in first_anchor.values()}
+
+        sections = {}
+        # Hold on to walked parents so their ids stay unique while we run
+        walked_parents = {}
+
+        for anchor in anchors:
+            parent = self.parent(anchor)
+            if parent is None or self.node_id(parent) in walked_parents:
+                continue
+            walked_parents[self.node_id(parent)] = parent
+
+            current_content = None
+            for child in self.children(parent):
+                tag = self.tag(child)
+                if tag == 'a' and self.attr(child, 'name'):
+                    if self.node_id(child) in first_ids:
+                        current_content = sections[self.attr(child, 'name')] = []
+                    else:
+                        current_content = None
+                    continue
+                if current_content is not None and tag in SECTION_TAGS:
+                    text = self.text(child)
+                    if text and not text.startswith('Job closing dates'):
+                        current_content.append(text)
+
+        descriptions = {}
+        for name, content in sections.items():
+            description = ' '.join(content)
+            if not description:
+                description = self.fallback_description(first_anchor[name])
+            descriptions[name] = description
+
+        return descriptions
+
+    def fallback_description(self, anchor):
+        """Collect text after the next h3 when the anchor has no sibling content"""
+        description_content = []
+        next_h3 = self.find_next(anchor, 'h3')
+        if next_h3 is not None:
+            # Get all text from h3 until the next hr or h3
+            for current in self.next_siblings(next_h3):
+                tag = self.tag(current)
+                if tag in ('hr', 'h3'):
+                    break
+                if tag in ('p', 'div'):
+                    text = self.text(current)
+                    if text:
+                        description_content.append(text)
+        return ' '.join(description_content)
+
+    def page_text(self, content):
+        """Return the text of every paragraph and heading on a page, in order"""
+        root = self.load(content)
+        texts = (self.text(node) for node in self.iter_tags(root, SECTION_TAGS))
+        return ' '.join(text for text in texts if text)
+
+    # Tree accessors implemented by each backend
+
+    def load(self, content):
+        raise NotImplementedError
+
+    def iter_anchors(self, root):
+        raise NotImplementedError
+
+    def iter_tags(self, root, tags):
+        raise NotImplementedError
+
+    def attr(self, node, key):
+        raise NotImplementedError
+
+    def text(self, node):
+        raise NotImplementedError
+
+    def tag(self, node):
+        raise NotImplementedError
+
+    def node_id(self, node):
+        return id(node)
+
+    def parent(self, node):
+        raise NotImplementedError
+
+    def children(self, node):
+        raise NotImplementedError
+
+    def next_siblings(self, node):
+        raise NotImplementedError
+
+    def find_next(self, node, tag):
+        raise NotImplementedError
+
+
+class SoupBackend(ParserBackend):
+    """BeautifulSoup with the pure-Python html.parser (malformed nesting is kept as written)"""
+
+    name = 'html.parser'
+
+    def load(self, content):
+        # bs4 is imported on first use, so commands that never parse a page skip it
+        from bs4 import BeautifulSoup, Tag
+        self._tag_class = Tag
+        return BeautifulSoup(content, 'html.parser')
+
+    def iter_anchors(self, root):
+        return root.find_all('a')
+
+    def iter_tags(self, root, tags):
+        return root.find_all(list(tags))
+
+    def attr(self, node, key):
+        return node.get(key)
+
+    def text(self, node):
+        return node.get_text(strip=True)
+
+    def tag(self, node):
+        return node.name
+
+    def parent(self, node):
+        return node.parent
+
+    def children(self, node):
+        return (child for child in node.children if isinstance(child, self._tag_class))
+
+    def next_siblings(self, node):
+        return (sibling for sibling in node.next_siblings if isinstance(sibling, self._tag_class))
+
+    def find_next(self, node, tag):
+        return node.find_next(tag)
+
+
+class LxmlBackend(ParserBackend):
+    """lxml.html element tree (libxml2)"""
+
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        self._lxml_html = lxml.html
+
+    def load(self, content):
+        return self._lxml_html.document_fromstring(decode_content(content))
+
+    def iter_anchors(self, root):
+        return root.iter('a')
+
+    def iter_tags(self, root, tags):
+        return root.iter(*tags)
+
+    def attr(self, node, key):
+        return node.get(key)
+
+    def text(self, node):
+        return ''.join(s.strip() for s in node.itertext())
+
+    def tag(self, node):
+        return node.tag
+
+    def parent(self, node):
+        return node.getparent()
+
+    def children(self, node):
+        # Comments and processing instructions have a non-string tag
+        return (child for child in node if isinstance(child.tag, str))
+
+    def next_siblings(self, node):
+        return (sibling for sibling in node.itersiblings() if isinstance(sibling.tag, str))
+
+    def find_next(self, node, tag):
+        found = node.xpath(f'(descendant::{tag} | following::{tag})[1]')
+        return found[0] if found else None
+
+
+class SelectolaxBackend(ParserBackend):
+    """selectolax with the lexbor HTML5 engine (C-accelerated)"""
+
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_class = LexborHTMLParser
+
+    def load(self, content):
+        return self._parser_class(decode_content(content))
+
+    def iter_anchors(self, root):
+        return root.css('a')
+
+    def iter_tags(self, root, tags):
+        return root.css(', '.join(tags))
+
+    def attr(self, node, key):
+        return node.attributes.get(key)
+
+    def text(self, node):
+        return node.text(deep=True, separator='', strip=True)
+
+    def tag(self, node):
+        return node.tag
+
+    def node_id(self, node):
+        # selectolax creates a new Node wrapper on every access
+        return node.mem_id
+
+    def parent(self, node):
+        return node.parent
+
+    def children(self, node):
+        return (child for child in node.iter(include_text=False) if self._is_element(child))
+
+    def next_siblings(self, node):
+        sibling = node.next
+        while sibling is not None:
+            if self._is_element(sibling):
+                yield sibling
+            sibling = sibling.next
+
+    def find_next(self, node, tag):
+        # Descendants first, then everything after the node in document order
+        for descendant in node.traverse(include_text=False):
+            if descendant.mem_id != node.mem_id and descendant.tag == tag:
+                return descendant
+        current = node
+        while current is not None:
+            sibling = current.next
+            while sibling is not None:
+                if self._is_element(sibling):
+                    for descendant in sibling.traverse(include_text=False):
+                        if descendant.tag == tag:
+                            return descendant
+                sibling = sibling.next
+            current = current.parent
+        return None
+
+    @staticmethod
+    def _is_element(node):
+        # Text and comment nodes use pseudo tags such as -text and -comment
+        return not node.tag.startswith('-')
+
+
+PARSER_BACKENDS = {
+    SoupBackend.name: SoupBackend,
+    LxmlBackend.name: LxmlBackend,
+    SelectolaxBackend.name: SelectolaxBackend,
+}
+
+
+def get_parser_backend(name='html.parser'):
+    """Return a parser backend instance by name"""
+    try:
+        backend_class = PARSER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown parser backend '{name}'. Choose from: {', '.join(PARSER_BACKENDS)}")
+    return backend_class()
+
+
+def available_parser_backends():
+    """Return the names of the backends whose dependencies are installed"""
+    available = []
+    for name in PARSER_BACKENDS:
+        try:
+            get_parser_backend(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def parse_bulletin(content, backend='html.parser'):
+    """Parse bulletin HTML with the named backend"""
+    return get_parser_backend(backend).parse(content)
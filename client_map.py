@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Compact JSON payload for the client-side map and jobs table
+Every job is written once to a data file (optionally gzipped), with department
+details and county centres stored once and referenced by index; the map's
+popups and side panel and the table rows are rendered from it in the browser.
+The same payload, embedded in the page, drives the clustered per-posting markers
+"""
+
+import gzip
+import json
+from datetime import date
+
+from branca.element import MacroElement
+from folium.elements import JSCSSMixin
+from folium.plugins import MarkerCluster
+from jinja2 import Template
+
+from field_extraction import DETAIL_FIELDS
+from output_files import atomic_open
+from search_index import build_search_index
+
+PAYLOAD_VERSION = 1
+
+# Columns of each job row; county and department are indexes into their own lists.
+# The numeric pay fields let the browser filter by pay without reading descriptions
+JOB_FIELDS = ('county', 'department', 'location', 'details', 'closing_date', 'contact_info', 'ilea_link',
+              'date_posted') + DETAIL_FIELDS
+
+
+def build_payload(jobs, county_coordinates, department_info, current_time, locate=None, search=True):
+    """Return the payload dict for jobs that already carry job['county']
+
+    With locate, a function returning a job's (lat, lon) or None, each row also
+    holds the posting's coordinates for per-posting markers. search=False leaves
+    out the side panel's search index.
+    """
+    fields = list(JOB_FIELDS) + (['lat', 'lon'] if locate else [])
+    county_index = {}
+    counties = []
+    department_index = {}
+    departments = []
+    rows = []
+    for job in jobs:
+        county = job['county']
+        if county not in county_index:
+            county_index[county] = len(counties)
+            lat, lon = county_coordinates.get(county, (None, None))
+            counties.append([county, lat, lon])
+        department = job['department']
+        if department not in department_index:
+            department_index[department] = len(departments)
+            info = department_info(department)
+            departments.append([department, info['badge'], info['website'], info['fast_facts']])
+
+        row = [job.get(field) for field in JOB_FIELDS]
+        row[0] = county_index[county]
+        row[1] = department_index[department]
+        row = [value.isoformat() if isinstance(value, date) else value for value in row]
+        if locate:
+            row.extend(locate(job) or (None, None))
+        rows.append(row)
+
+    payload = {
+        'version': PAYLOAD_VERSION,
+        'updated': current_time,
+        'fields': fields,
+        'counties': counties,
+        'departments': departments,
+        'jobs': rows,
+    }
+    if search:
+        # Positions in the index are positions in jobs, as in the side panel
+        payload['search'] = build_search_index(jobs)
+    return payload
+
+
+def write_payload(payload, path):
+    """Write the payload as compact JSON, gzip-compressed when path ends in .gz
+
+    Returns the number of bytes written.
+    """
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if path.endswith('.gz'):
+        # A fixed mtime keeps the file byte-identical when the jobs have not changed
+        data = gzip.compress(data, compresslevel=9, mtime=0)
+    with atomic_open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+class JobsDataLayer(JSCSSMixin, MacroElement):
+    """Adds the payload's markers and side panel to a folium map in the browser
+
+    The side panel template defines renderJobsMap(); this element calls it from the
+    map's own script, after the Leaflet map object has been created. With cluster,
+    each posting gets its own marker instead of one marker per county.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            renderJobsMap({{ this._parent.get_name() }}, {{ this.data_url|tojson }}, {{ this.cluster|tojson }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, data_url, cluster=False):
+        super().__init__()
+        self._name = 'JobsDataLayer'
+        self.data_url = data_url
+        self.cluster = cluster
+        # Instance lists, so the class defaults shared by every map stay untouched
+        self.default_js = list(MarkerCluster.default_js) if cluster else []
+        self.default_css = list(MarkerCluster.default_css) if cluster else []
+
+
+class PostingClusterLayer(JSCSSMixin, MacroElement):
+    """Clustered per-posting markers for a folium map, from an embedded payload
+
+    script is the posting_clusters.js template rendered with the payload: a
+    function of the Leaflet map that unpacks the jobs and adds the clusters.
+    """
+
+    default_js = MarkerCluster.default_js
+    default_css = MarkerCluster.default_css
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            {{ this.script }}({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, script):
+        super().__init__()
+        self._name = 'PostingClusterLayer'
+        self.script = script
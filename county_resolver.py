@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+County resolution for Indiana agency and location strings
+A token trie of county names, "<name> County" phrases and city names is built
+once per process; each lookup is a single left-to-right pass over the words.
+Strings those names cannot place fall back to the offline gazetteer of every
+Indiana city, town and township, which is only opened when first needed
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from gazetteer import DEFAULT_GAZETTEER_PATH, get_gazetteer
+
+# City to county mappings (major cities and towns that post on the bulletin)
+CITY_TO_COUNTY = {
+    'indianapolis': 'Marion',
+    'fort wayne': 'Allen',
+    'evansville': 'Vanderburgh',
+    'south bend': 'Saint Joseph',
+    'carmel': 'Hamilton',
+    'fishers': 'Hamilton',
+    'bloomington': 'Monroe',
+    'lafayette': 'Tippecanoe',
+    'gary': 'Lake',
+    'hammond': 'Lake',
+    'muncie': 'Delaware',
+    'anderson': 'Madison',
+    'terre haute': 'Vigo',
+    'elkhart': 'Elkhart',
+    'kokomo': 'Howard',
+    'noblesville': 'Hamilton',
+    'greenwood': 'Johnson',
+    'michigan city': 'LaPorte',
+    'merrillville': 'Lake',
+    'lawrence': 'Marion',
+    'greenfield': 'Hancock',
+    'new albany': 'Floyd',
+    'jeffersonville': 'Clark',
+    'richmond': 'Wayne',
+    'columbus': 'Bartholomew',
+    'plainfield': 'Hendricks',
+    'kingsford heights': 'LaPorte',
+    'alexandria': 'Madison',
+    'roseland': 'Saint Joseph',
+    'monrovia': 'Morgan',
+    'eaton': 'Delaware',
+    'frankfort': 'Clinton',
+    'mccordsville': 'Hancock',
+    'shelbyville': 'Shelby',
+    'scottsburg': 'Scott',
+    'sweetser': 'Grant',
+    'lebanon': 'Boone',
+    'rochester': 'Fulton',
+    'waterloo': 'DeKalb',
+    'cumberland': 'Marion',
+    'brazil': 'Clay',
+    'fortville': 'Hancock',
+    'dyer': 'Lake',
+    'dunkirk': 'Jay',
+    'princeton': 'Gibson',
+    'portland': 'Jay',
+    'montpelier': 'Blackford',
+    'homecroft': 'Marion',
+    'jonesboro': 'Grant',
+    'westville': 'LaPorte',
+    'valparaiso': 'Porter',
+    'warsaw': 'Kosciusko',
+    'hartford city': 'Blackford',
+    'logansport': 'Cass',
+    'mount vernon': 'Posey',
+    'frankton': 'Madison',
+    'west lafayette': 'Tippecanoe',
+}
+
+# Other spellings of county names seen in agency names
+COUNTY_ALIASES = {
+    'Saint Joseph': ['st joseph'],
+    'LaPorte': ['la porte'],
+    'DeKalb': ['de kalb'],
+}
+
+# Rules in order of preference when a string matches more than one
+RULE_COUNTY = 'county'            # "Lawrence County Sheriff"
+RULE_CITY = 'city'                # "Lawrence Police Department" (a city in Marion County)
+RULE_COUNTY_NAME = 'county_name'  # "Lawrence" on its own
+RULE_PLACE = 'place'              # "Clarksville Police Department" (from the gazetteer)
+RULE_RANK = {RULE_COUNTY: 0, RULE_CITY: 1, RULE_COUNTY_NAME: 2, RULE_PLACE: 3}
+
+# Gazetteer place names that are also ordinary words in agency names
+PLACE_STOPWORDS = {'central', 'deputy'}
+
+RESOLVE_CACHE_SIZE = 4096
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+CountyMatch = namedtuple('CountyMatch', ['county', 'rule', 'text'])
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class CountyResolver:
+    """Resolve free text to an Indiana county with a word-level trie
+
+    Every phrase is stored as a path of tokens, so matches always fall on word
+    boundaries. At each word the longest phrase wins, and matched words are not
+    reused. "Fort Wayne" therefore resolves to Allen, not Wayne. Among the
+    matches found, the best rule wins and then the leftmost match.
+
+    Gazetteer places compete for the longest phrase but rank last, so they only
+    decide strings with no county, city or county name in them ("Perry Township"
+    beats "Perry"; "Hamilton Southeastern Schools" stays in Hamilton County).
+    Results are memoized per resolver.
+    """
+
+    def __init__(self, counties, cities=CITY_TO_COUNTY, aliases=COUNTY_ALIASES, gazetteer_path=DEFAULT_GAZETTEER_PATH):
+        self.gazetteer_path = gazetteer_path
+        self.resolve = lru_cache(maxsize=RESOLVE_CACHE_SIZE)(self.resolve)
+        self.root = {}
+        for county in counties:
+            spellings = [county.lower()] + aliases.get(county, [])
+            for spelling in spellings:
+                self.add(f"{spelling} county", county, RULE_COUNTY)
+                self.add(spelling, county, RULE_COUNTY_NAME)
+        for city, county in cities.items():
+            self.add(city, county, RULE_CITY)
+
+    def add(self, phrase, county, rule):
+        """Insert a phrase, keeping the better rule if it is already present"""
+        node = self.root
+        for token in tokenize(phrase):
+            node = node.setdefault(token, {})
+        existing = node.get(None)
+        if existing is None or RULE_RANK[rule] < RULE_RANK[existing[1]]:
+            node[None] = (county, rule)
+
+    def resolve(self, text):
+        """Return the best CountyMatch for the text, or None"""
+        tokens = tokenize(text)
+        best = self.scan(tokens)
+        if best is None or best.rule == RULE_COUNTY_NAME:
+            # Only open the gazetteer for strings the curated names cannot place
+            best = self.scan(tokens, get_gazetteer(self.gazetteer_path))
+        return best
+
+    def scan(self, tokens, gazetteer=None):
+        """Match phrases left to right, returning the best-ranked CountyMatch"""
+        best = None
+        i = 0
+        while i < len(tokens):
+            node = self.root
+            found = None
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if None in node:
+                    found = (node[None], j)
+
+            if gazetteer is not None:
+                place = self.match_place(tokens, i, gazetteer)
+                if place is not None and (found is None or place[1] > found[1]):
+                    found = place
+
+            if found is None:
+                i += 1
+                continue
+
+            (county, rule), end = found
+            if best is None or RULE_RANK[rule] < RULE_RANK[best.rule]:
+                best = CountyMatch(county, rule, ' '.join(tokens[i:end]))
+                if rule == RULE_COUNTY:
+                    break
+            i = end
+
+        return best
+
+    @staticmethod
+    def match_place(tokens, start, gazetteer):
+        """Return ((county, RULE_PLACE), end) for the longest place name at start"""
+        if not gazetteer.starts_place(tokens[start]):
+            return None
+        for end in range(min(len(tokens), start + gazetteer.max_words), start, -1):
+            name = ' '.join(tokens[start:end])
+            if name in PLACE_STOPWORDS:
+                continue
+            place = gazetteer.lookup(name)
+            if place is not None:
+                return (place.county, RULE_PLACE), end
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_county_resolver(counties):
+    """Return the shared resolver for a tuple of county names, built once"""
+    return CountyResolver(counties)
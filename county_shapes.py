@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+County choropleth for the Indiana Police Jobs map
+The simplified county boundaries in data/indiana_counties.topojson are read and
+serialized once per process; each run only joins its job counts onto them,
+coloured on a quantile scale
+"""
+
+import json
+import os
+from bisect import bisect_left
+from functools import lru_cache
+from statistics import quantiles
+
+from branca.element import MacroElement
+from folium.elements import JSCSSMixin
+from folium.features import TopoJson
+from jinja2 import Template
+
+DEFAULT_COUNTY_SHAPES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'indiana_counties.topojson')
+
+# ColorBrewer's 4-class YlOrRd, light to dark; counties without jobs stay grey
+QUANTILE_COLORS = ['#ffffb2', '#fecc5c', '#fd8d3c', '#e31a1c']
+NO_JOBS_COLOR = '#f0f0f0'
+
+
+@lru_cache(maxsize=None)
+def get_county_topology(path=DEFAULT_COUNTY_SHAPES_PATH):
+    """Return the county TopoJSON for a file as compact JSON text, read once"""
+    with open(path, encoding='utf-8') as f:
+        topology = json.load(f)
+    return json.dumps(topology, separators=(',', ':'))
+
+
+class QuantileScale:
+    """Colour job counts by quantile: each colour covers about as many counties
+
+    Built from the counts of the counties that have jobs. Ties can merge classes,
+    so a scale over few distinct counts uses fewer colours.
+    """
+
+    def __init__(self, counts, colors=QUANTILE_COLORS):
+        values = sorted(count for count in counts if count > 0)
+        classes = min(len(colors), len(set(values)))
+        cuts = quantiles(values, n=classes, method='inclusive') if classes > 1 else []
+        # Class i holds the counts up to and including thresholds[i]
+        self.thresholds = sorted(set(cuts))
+        # Spread the colours across the whole ramp when there are fewer classes
+        count = len(self.thresholds) + 1
+        if count == 1:
+            self.colors = [colors[-1]]
+        else:
+            self.colors = [colors[round(i * (len(colors) - 1) / (count - 1))] for i in range(count)]
+        self.members = [[] for _ in self.colors]
+        for value in values:
+            self.members[bisect_left(self.thresholds, value)].append(value)
+
+    def color(self, count):
+        """Return the fill colour for a county with this many jobs"""
+        if count <= 0:
+            return NO_JOBS_COLOR
+        return self.colors[bisect_left(self.thresholds, count)]
+
+    def legend(self):
+        """Return [(color, label)] for the classes that hold counties, lightest first"""
+        entries = []
+        for color, members in zip(self.colors, self.members):
+            if not members:
+                continue
+            low, high = members[0], members[-1]
+            jobs = 'job' if high == 1 else 'jobs'
+            entries.append((color, f"{low} {jobs}" if low == high else f"{low}-{high} {jobs}"))
+        return entries
+
+
+class CountyChoroplethLayer(JSCSSMixin, MacroElement):
+    """County polygons filled by job count, with a tooltip and optional popups
+
+    popups maps county names to popup HTML, bound when a county is first clicked.
+    The layer is also kept as window.jobsCountyLayer, so the client-side map can
+    bind popups built from its payload.
+    """
+
+    default_js = TopoJson.default_js
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function () {
+                var topology = {{ this.topology }};
+                var counts = {{ this.counts|tojson }};
+                var colors = {{ this.colors|tojson }};
+                var popups = {{ this.popups|tojson }};
+                return L.geoJson(topojson.feature(topology, topology.objects.counties), {
+                    style: function (feature) {
+                        return {
+                            fillColor: colors[feature.properties.name] || {{ this.no_jobs_color|tojson }},
+                            fillOpacity: 0.6,
+                            color: '#555',
+                            weight: 1
+                        };
+                    },
+                    onEachFeature: function (feature, layer) {
+                        var name = feature.properties.name;
+                        layer.bindTooltip(name + ' County: ' + (counts[name] || 0) + ' job(s)', {sticky: true});
+                        if (popups[name]) {
+                            layer.bindPopup(function () {
+                                return popups[name];
+                            }, {maxWidth: 400});
+                        }
+                    }
+                }).addTo({{ this._parent.get_name() }});
+            })();
+            window.jobsCountyLayer = {{ this.get_name() }};
+        {% endmacro %}
+    """)
+
+    def __init__(self, county_jobs, scale, popups=None, path=DEFAULT_COUNTY_SHAPES_PATH):
+        super().__init__()
+        self._name = 'CountyChoroplethLayer'
+        self.topology = get_county_topology(path)
+        self.counts = {county: len(jobs) for county, jobs in county_jobs.items()}
+        self.colors = {county: scale.color(count) for county, count in self.counts.items()}
+        self.popups = popups or {}
+        self.no_jobs_color = NO_JOBS_COLOR
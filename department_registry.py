@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Department registry for the map popups, side panel and jobs table
+Badges, websites and fast facts live in data/departments.json (or a TOML file
+with the same layout); the registry is loaded once per process into name and
+alias indexes, and every resolved department name is memoized
+"""
+
+import json
+import os
+import re
+from functools import lru_cache
+
+REGISTRY_VERSION = 1
+DEFAULT_DEPARTMENT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'departments.json')
+
+INFO_FIELDS = ('badge', 'website', 'fast_facts')
+LOOKUP_CACHE_SIZE = 4096
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def normalize_department_name(name):
+    """Lowercase a department name and reduce it to single-spaced word tokens"""
+    return ' '.join(TOKEN_PATTERN.findall(name.lower()))
+
+
+def load_registry_file(path):
+    """Read a registry file, choosing the JSON or TOML reader by extension"""
+    if path.endswith('.toml'):
+        import tomllib  # Python 3.11+
+
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class DepartmentRegistry:
+    """Indexed department metadata
+
+    Lookups try, in order: the full normalized name or an alias, a registered
+    name or alias appearing as whole words in the department name, the
+    department name appearing inside a registered name, a category keyword
+    ("sheriff", "airport", ...) and finally the default entry.
+    """
+
+    def __init__(self, data):
+        if data.get('version') != REGISTRY_VERSION:
+            raise ValueError(f"Unsupported department registry version: {data.get('version')}")
+
+        self.names = {}
+        self.phrases = {}
+        self.max_words = 0
+        for entry in data['departments']:
+            info = {field: entry.get(field) for field in INFO_FIELDS}
+            for name in [entry['name']] + entry.get('aliases', []):
+                key = normalize_department_name(name)
+                self.names.setdefault(key, info)
+                words = key.split()
+                self.max_words = max(self.max_words, len(words))
+                # Every run of words inside a registered name, for short queries like "Indiana State"
+                for start in range(len(words)):
+                    for end in range(start + 1, len(words) + 1):
+                        self.phrases.setdefault(' '.join(words[start:end]), info)
+
+        self.categories = [
+            (entry['keyword'].lower(), {field: entry.get(field) for field in INFO_FIELDS})
+            for entry in data.get('categories', [])
+        ]
+        self.default = {field: data['default'].get(field) for field in INFO_FIELDS}
+        self.lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self.lookup)
+
+    @classmethod
+    def load(cls, path=DEFAULT_DEPARTMENT_REGISTRY_PATH):
+        """Build a registry from a JSON or TOML file"""
+        return cls(load_registry_file(path))
+
+    def lookup(self, department_name):
+        """Return the badge, website and fast facts for a department name
+
+        The returned dict is shared between calls and must not be modified.
+        """
+        key = normalize_department_name(department_name)
+        if key in self.names:
+            return self.names[key]
+
+        # Longest registered name found as whole words, leftmost first
+        words = key.split()
+        for length in range(min(self.max_words, len(words)), 0, -1):
+            for start in range(len(words) - length + 1):
+                info = self.names.get(' '.join(words[start:start + length]))
+                if info is not None:
+                    return info
+
+        if key in self.phrases:
+            return self.phrases[key]
+
+        department_lower = department_name.lower()
+        for keyword, info in self.categories:
+            if keyword in department_lower:
+                return info
+
+        return self.default
+
+
+@lru_cache(maxsize=None)
+def get_department_registry(path=DEFAULT_DEPARTMENT_REGISTRY_PATH):
+    """Return the shared registry for a file, loaded on first use"""
+    return DepartmentRegistry.load(path)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Offline gazetteer of Indiana places
+Place names, counties and coordinates are stored in a compact binary file
+(data/indiana_gazetteer.bin, written by build_gazetteer.py) that is memory-mapped
+on first use and searched in place, so nothing is loaded or parsed up front
+"""
+
+import mmap
+import os
+import re
+import struct
+from collections import namedtuple
+from functools import lru_cache
+
+MAGIC = b'INGZ'
+VERSION = 1
+
+# File layout: header, county name table, fixed-size records sorted by name, name bytes
+HEADER = struct.Struct('<4sHHI')    # magic, version, longest name in words, place count
+RECORD = struct.Struct('<IHBxii')   # name offset, name length, county index, lat, lon
+COORD_SCALE = 100000                # coordinates are stored in 1e-5 degrees (about 1 m)
+
+LOOKUP_CACHE_SIZE = 16384
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'indiana_gazetteer.bin')
+
+NAME_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+NAME_ABBREVIATIONS = {'st': 'saint', 'mt': 'mount', 'ft': 'fort'}
+
+Place = namedtuple('Place', ['name', 'county', 'lat', 'lon'])
+
+
+def normalize_place_name(name):
+    """Lowercase a place name and reduce it to single-spaced, unabbreviated words"""
+    return ' '.join(NAME_ABBREVIATIONS.get(token, token) for token in NAME_TOKEN_PATTERN.findall(name.lower()))
+
+
+def write_gazetteer(path, places):
+    """Write (name, county, lat, lon) tuples to a gazetteer file
+
+    Names are normalized and must be unique after normalization.
+    """
+    places = sorted((normalize_place_name(name).encode('utf-8'), county, lat, lon) for name, county, lat, lon in places)
+    counties = sorted({county for _, county, _, _ in places})
+    county_index = {county: i for i, county in enumerate(counties)}
+
+    names = bytearray()
+    records = bytearray()
+    previous = None
+    for name, county, lat, lon in places:
+        if name == previous:
+            raise ValueError(f"Duplicate place name: {name.decode('utf-8')}")
+        previous = name
+        records += RECORD.pack(len(names), len(name), county_index[county],
+                               round(lat * COORD_SCALE), round(lon * COORD_SCALE))
+        names += name
+
+    county_table = bytearray([len(counties)])
+    for county in counties:
+        encoded = county.encode('utf-8')
+        county_table += bytes([len(encoded)]) + encoded
+
+    max_words = max((name.count(b' ') + 1 for name, _, _, _ in places), default=0)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, max_words, len(places)))
+        f.write(county_table)
+        f.write(records)
+        f.write(names)
+    os.replace(tmp_path, path)
+
+
+class Gazetteer:
+    """Read-only view of a gazetteer file, searched by binary search over the mapping
+
+    Lookups are memoized per instance, since agency names repeat the same words.
+    """
+
+    def __init__(self, path=DEFAULT_GAZETTEER_PATH):
+        self.lookup = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self.lookup)
+        self.starts_place = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self.starts_place)
+        with open(path, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.max_words, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} gazetteer file")
+
+        offset = HEADER.size
+        self.counties = []
+        for _ in range(self.data[offset]):
+            length = self.data[offset + 1]
+            self.counties.append(self.data[offset + 2:offset + 2 + length].decode('utf-8'))
+            offset += 1 + length
+        offset += 1
+
+        self.records_offset = offset
+        self.names_offset = offset + self.count * RECORD.size
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self._place(index)
+
+    def _name(self, index):
+        name_offset, name_length = RECORD.unpack_from(self.data, self.records_offset + index * RECORD.size)[:2]
+        start = self.names_offset + name_offset
+        return self.data[start:start + name_length]
+
+    def _place(self, index):
+        name_offset, name_length, county, lat, lon = RECORD.unpack_from(self.data, self.records_offset + index * RECORD.size)
+        start = self.names_offset + name_offset
+        return Place(
+            self.data[start:start + name_length].decode('utf-8'),
+            self.counties[county],
+            lat / COORD_SCALE,
+            lon / COORD_SCALE
+        )
+
+    def _bisect(self, key):
+        """Index of the first name not less than key"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._name(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def lookup(self, name):
+        """Return the Place for a name (any case or punctuation), or None"""
+        key = normalize_place_name(name).encode('utf-8')
+        index = self._bisect(key)
+        if index < self.count and self._name(index) == key:
+            return self._place(index)
+        return None
+
+    def starts_place(self, word):
+        """Return True if some place name begins with this word"""
+        key = normalize_place_name(word).encode('utf-8')
+        index = self._bisect(key)
+        if index >= self.count:
+            return False
+        name = self._name(index)
+        return name == key or name.startswith(key + b' ')
+
+
+@lru_cache(maxsize=None)
+def get_gazetteer(path=DEFAULT_GAZETTEER_PATH):
+    """Return the shared gazetteer for a file, opened on first use"""
+    return Gazetteer(path)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Template rendering for the map popups, side panel and jobs table
+The Jinja2 templates in templates/ are compiled once per process (and cached as
+bytecode on disk between runs); the jobs table is streamed to its file in
+chunks instead of being assembled in memory
+"""
+
+import os
+from functools import lru_cache
+
+from search_index import build_search_index
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+
+
+@lru_cache(maxsize=None)
+def get_template_environment(template_dir=TEMPLATE_DIR):
+    """Return the shared Jinja2 environment for a template directory"""
+    # Imported here so the scraper can be created without loading Jinja2
+    from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        bytecode_cache=FileSystemBytecodeCache(),
+        # Job text is inserted as-is, exactly as the f-string builders did
+        autoescape=False,
+        keep_trailing_newline=True,
+    )
+
+
+class HtmlRenderer:
+    """Render the scraper's HTML fragments and pages from templates
+
+    department_info is called from the templates with a department name and
+    returns its badge, website and fast facts.
+    """
+
+    def __init__(self, department_info, template_dir=TEMPLATE_DIR):
+        self.department_info = department_info
+        self.template_dir = template_dir
+
+    def _template(self, name):
+        return get_template_environment(self.template_dir).get_template(name)
+
+    def county_popup(self, county, jobs, current_time):
+        """Return the popup HTML for a county's marker (first five jobs)"""
+        return self._template('county_popup.html').render(
+            county=county, jobs=jobs, current_time=current_time, department_info=self.department_info
+        )
+
+    def side_panel(self, jobs, current_time, data_url=None):
+        """Return the side panel HTML for jobs sorted by county
+
+        The page carries a prefix search index over the jobs. With data_url the
+        job list and index are left out and loaded in the browser from that
+        payload, which also supplies the map's markers and popups.
+        """
+        if data_url:
+            return self._template('side_panel_client.html').render(
+                jobs=jobs, current_time=current_time, department_info=self.department_info, data_url=data_url
+            )
+        return self._template('side_panel.html').render(
+            jobs=jobs, current_time=current_time, department_info=self.department_info,
+            search_index=build_search_index(jobs)
+        )
+
+    def posting_clusters(self, payload):
+        """Return the script that adds clustered per-posting markers for a payload"""
+        return self._template('posting_clusters.js').render(payload=payload)
+
+    def _jobs_table_context(self, county_jobs, current_time, data_url):
+        return {
+            'counties': sorted(county_jobs.items()),
+            'total_jobs': sum(len(jobs) for jobs in county_jobs.values()),
+            'current_time': current_time,
+            'department_info': self.department_info,
+            'data_url': data_url,
+        }
+
+    def _jobs_table_template(self, data_url):
+        return self._template('jobs_table_client.html' if data_url else 'jobs_table.html')
+
+    def write_jobs_table(self, county_jobs, f, current_time, data_url=None):
+        """Stream the jobs table page to an open text file as it is rendered
+
+        With data_url the rows are rendered in the browser from that payload.
+        """
+        # The file's own write buffer groups the template's output into chunks
+        context = self._jobs_table_context(county_jobs, current_time, data_url)
+        f.writelines(self._jobs_table_template(data_url).generate(context))
+
+    def jobs_table(self, county_jobs, current_time, data_url=None):
+        """Return the jobs table page as one string"""
+        context = self._jobs_table_context(county_jobs, current_time, data_url)
+        return self._jobs_table_template(data_url).render(context)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Persistent HTTP cache for the scraper's requests.Session
+Revalidates with If-None-Match / If-Modified-Since and keeps gzip-compressed
+bodies on disk, so an unchanged bulletin page costs a 304 and no download
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+
+from requests.adapters import HTTPAdapter
+
+
+class HttpCache:
+    """On-disk store of response bodies and their validators, keyed by URL"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, suffix):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.cache_dir, f"{key}{suffix}")
+
+    def load(self, url):
+        """Return the cached metadata for a URL, or None if nothing usable is stored"""
+        try:
+            with open(self._path(url, '.json'), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._path(url, '.body.gz')):
+            return None
+        return entry
+
+    def read_body(self, url):
+        """Return the decompressed cached body for a URL"""
+        with gzip.open(self._path(url, '.body.gz'), 'rb') as f:
+            return f.read()
+
+    def store(self, url, content, etag=None, last_modified=None):
+        """Store a response body and its validators, returning the content hash"""
+        content_hash = hashlib.sha256(content).hexdigest()
+        entry = self.load(url) or {}
+
+        if entry.get('content_hash') != content_hash:
+            self._write_atomic(self._path(url, '.body.gz'), gzip.compress(content))
+
+        entry.update({
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'content_hash': content_hash,
+            'fetched_at': time.time(),
+        })
+        self._write_metadata(url, entry)
+        return content_hash
+
+    def touch(self, url):
+        """Record a successful revalidation of the cached body"""
+        entry = self.load(url)
+        if entry is not None:
+            entry['fetched_at'] = time.time()
+            self._write_metadata(url, entry)
+
+    def is_processed(self, url, content_hash):
+        """Return True if this exact body was already parsed and rendered"""
+        entry = self.load(url)
+        return entry is not None and entry.get('processed_hash') == content_hash
+
+    def mark_processed(self, url, content_hash):
+        """Remember that the outputs were built from this body"""
+        entry = self.load(url)
+        if entry is not None:
+            entry['processed_hash'] = content_hash
+            self._write_metadata(url, entry)
+
+    def _write_metadata(self, url, entry):
+        self._write_atomic(self._path(url, '.json'), json.dumps(entry, indent=2).encode('utf-8'))
+
+    @staticmethod
+    def _write_atomic(path, data):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class CachingAdapter(HTTPAdapter):
+    """Transport adapter that makes every GET a conditional request
+
+    Responses gain two attributes: from_cache (True when the server answered
+    304 and the body came from disk) and content_hash (SHA-256 of the body).
+    """
+
+    def __init__(self, cache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != 'GET':
+            return super().send(request, **kwargs)
+
+        entry = self.cache.load(request.url)
+        if entry is not None:
+            if entry.get('etag'):
+                request.headers.setdefault('If-None-Match', entry['etag'])
+            if entry.get('last_modified'):
+                request.headers.setdefault('If-Modified-Since', entry['last_modified'])
+
+        response = super().send(request, **kwargs)
+        response.from_cache = False
+        response.content_hash = None
+
+        if response.status_code == 304 and entry is not None:
+            # Serve the stored body as if the server had sent it again
+            response.status_code = 200
+            response.reason = 'OK (cached)'
+            response._content = self.cache.read_body(request.url)
+            response.from_cache = True
+            response.content_hash = entry['content_hash']
+            self.cache.touch(request.url)
+        elif response.status_code == 200:
+            response.content_hash = self.cache.store(
+                request.url,
+                response.content,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+
+        return response
@@ -4,23 +4,128 @@ Indiana Law Enforcement Job Opportunities Scraper and Mapper
 Scrapes job opportunities from ILEA website and maps them by county
 """
 
-import requests
-from bs4 import BeautifulSoup
-import folium
 import json
-import re
+import os
 import csv
+import hashlib
 from collections import defaultdict
 import time
-from datetime import datetime
+from datetime import date, datetime
+
+from bulletin_parser import get_parser_backend
+from county_resolver import RULE_CITY, RULE_PLACE, RULE_RANK, get_county_resolver
+from department_registry import DEFAULT_DEPARTMENT_REGISTRY_PATH, get_department_registry
+from field_extraction import extract_details, extract_fields, extract_location
+from gazetteer import get_gazetteer
+from html_renderer import HtmlRenderer
+from job_sources import ILEA_BULLETIN_URL, IleaBulletinSource
+from job_posting import POSTING_FIELDS, JobPosting
+from job_store import JobStore
+from near_duplicates import DEFAULT_THRESHOLD, cluster_near_duplicates
+from output_files import OutputState, atomic_open
+from polite_fetcher import DEFAULT_MAX_WORKERS, PoliteFetcher
+from posting_state import PostingState, encode_job, posting_key, section_hash
+from run_metrics import RunMetrics
+from search_index import tokenize
+
+# requests (with the HTTP cache), folium, the map layers (client_map, county_shapes) and
+# pandas are imported where they are used, so commands that never fetch a page, render
+# a map or export Parquet start quickly
 
 class IndianaPoliceJobsScraper:
-    def __init__(self):
-        self.base_url = "https://www.in.gov/ilea/bulletin-board/law-enforcement-job-opportunities/"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    def __init__(self, parser_backend='html.parser', cache_dir=None, state_file=None,
+                 department_registry=DEFAULT_DEPARTMENT_REGISTRY_PATH, sources=None,
+                 client_side=False, compress_data=False, cluster_markers=False, choropleth=False,
+                 store_path=None, columnar_format=None, duplicate_threshold=DEFAULT_THRESHOLD,
+                 output_state_file=None, sample_fallback=True, metrics_file=None, prometheus_file=None,
+                 profile=None, verbose=True):
+        self.base_url = ILEA_BULLETIN_URL
+        # The pooled requests.Session and the fetcher using it are built on first use
+        self._session = None
+        self._fetcher = None
+        
+        # HTML parser used for the bulletin page ('html.parser', 'lxml' or 'selectolax')
+        self.parser = get_parser_backend(parser_backend)
+        
+        # Optional on-disk HTTP cache: requests become conditional and unchanged pages skip re-rendering
+        self.http_cache = None
+        self.last_content_hashes = {}
+        if cache_dir:
+            from http_cache import HttpCache
+            
+            self.http_cache = HttpCache(cache_dir)
+        
+        # Output files written by run()
+        self.map_filename = 'indiana_police_jobs_map.html'
+        self.table_filename = 'indiana_police_jobs_table.html'
+        self.csv_filename = 'indiana_police_jobs.csv'
+        
+        # Optional typed export for pandas analytics: 'parquet' or 'arrow' (needs pandas and pyarrow)
+        self.columnar_format = columnar_format
+        self.columnar_filename = f"indiana_police_jobs.{columnar_format}" if columnar_format else None
+        
+        # Optional client-side mode: jobs are written once to a compact JSON data file
+        # (gzipped with compress_data) and the map and table render from it in the browser
+        self.client_side = client_side
+        self.data_filename = 'indiana_police_jobs_data.json' + ('.gz' if compress_data else '')
+        
+        # Optional per-posting markers at each agency's city or town, grouped into clusters
+        self.cluster_markers = cluster_markers
+        
+        # Optional county choropleth from bundled, simplified boundaries (read once per process);
+        # county_shapes can name another TopoJSON file
+        self.choropleth = choropleth
+        self.county_shapes = None
+        
+        # Optional output state: outputs whose postings and options are unchanged since
+        # they were last written are left alone instead of being rewritten
+        self.output_state_file = output_state_file
+        self.output_state = OutputState.load(output_state_file) if output_state_file else None
+        self.stale = {}
+        
+        # Without the sample data fallback a failed scrape raises instead, so the
+        # previous outputs stay in place (watch mode)
+        self.sample_fallback = sample_fallback
+        # Set when this run's postings are the sample data, which never goes in the job store
+        self.using_sample_data = False
+        
+        # Stage timings and counters for each run, optionally saved as a JSON report and a
+        # Prometheus textfile; profile adds a 'cpu' (cProfile) or 'memory' (tracemalloc) profile
+        self.metrics_file = metrics_file
+        self.prometheus_file = prometheus_file
+        self.profile = profile
+        self.metrics = RunMetrics(profile)
+        
+        # Print a line for every posting as it is parsed
+        self.verbose = verbose
+        
+        # Templates for the map popups, side panel and jobs table
+        self.renderer = HtmlRenderer(self.get_department_info)
+        
+        # Extra pages to read postings from (the ILEA bulletin at base_url is the default),
+        # fetched concurrently with per-host rate limits
+        self.sources = sources
+        # URLs of the sources the last scrape read when another failed (None when all were read),
+        # so postings from a source that is down are not taken as closed
+        self.last_fetched_urls = None
+        
+        # Optional incremental mode: unchanged sections reuse the previous run's job record
+        self.state_file = state_file
+        self.posting_state = PostingState.load(state_file) if state_file else None
+        
+        # Re-posted or lightly edited postings from the same department are merged when
+        # their descriptions are at least this similar (None keeps every posting)
+        self.duplicate_threshold = duplicate_threshold
+        self.duplicate_clusters = []
+        
+        # Optional SQLite job store: each run is upserted into it with first/last seen
+        # dates, and the CSV, map and table are exported from its open postings
+        self.store_path = store_path
+        self.job_store = JobStore(store_path) if store_path else None
+        self.last_store_run = None
+        
+        # Department badges, websites and fast facts (JSON or TOML), loaded once on first use
+        self.department_registry = department_registry
         
         # Indiana counties with their coordinates (approximate center points)
         self.county_coordinates = {
@@ -118,102 +223,89 @@ class IndianaPoliceJobsScraper:
             'Whitley': (41.1397, -85.4986)
         }
 
-    def scrape_job_opportunities(self):
-        """Scrape job opportunities from the ILEA website"""
+    @property
+    def session(self):
+        """The pooled requests.Session for the source pages (conditional with an HTTP cache)"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            
+            session = requests.Session()
+            session.headers.update({
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            })
+            pool_options = {'pool_connections': DEFAULT_MAX_WORKERS, 'pool_maxsize': DEFAULT_MAX_WORKERS}
+            if self.http_cache is not None:
+                from http_cache import CachingAdapter
+                adapter = CachingAdapter(self.http_cache, **pool_options)
+            else:
+                adapter = HTTPAdapter(**pool_options)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            self._session = session
+        return self._session
+    
+    @property
+    def fetcher(self):
+        """The PoliteFetcher that fetches every source concurrently with per-host rate limits"""
+        if self._fetcher is None:
+            self._fetcher = PoliteFetcher(self.session)
+        return self._fetcher
+    
+    def scrape_job_opportunities(self, skip_unchanged=False):
+        """Scrape job opportunities from the ILEA website and any other sources
+        
+        Every source page is fetched concurrently and the jobs are merged in source
+        order. With skip_unchanged and an HTTP cache, returns None without parsing
+        when every page body is identical to the one the current outputs were built from.
+        """
+        self.last_content_hashes = {}
+        self.last_fetched_urls = None
+        self.using_sample_data = False
+        sources = self.sources or [IleaBulletinSource(self.base_url)]
         try:
-            print("Scraping job opportunities from ILEA website...")
-            response = self.session.get(self.base_url, timeout=30)
-            response.raise_for_status()
+            print(f"Scraping job opportunities from {len(sources)} source(s)...")
+            with self.metrics.stage('fetch'):
+                responses = self.fetcher.fetch_all(source.url for source in sources)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            fetched = []
+            for source in sources:
+                response = responses[source.url]
+                if isinstance(response, Exception):
+                    print(f"Error fetching {source.name}: {response}")
+                    continue
+                fetched.append((source, response))
+                self.count_fetch(response.content, getattr(response, 'from_cache', False))
+                if self.http_cache is not None:
+                    self.last_content_hashes[source.url] = response.content_hash
+                    if response.from_cache:
+                        print(f"{source.name} not modified (HTTP 304), using cached copy")
             
-            job_listings = []
+            if not fetched:
+                raise RuntimeError("no source could be fetched")
+            if len(fetched) < len(sources):
+                self.last_fetched_urls = {source.url for source, _ in fetched}
             
-            # Find all job links in the list
-            job_links = soup.find_all('a', href=re.compile(r'^#'))
+            if (skip_unchanged and self.http_cache is not None and len(fetched) == len(sources)
+                    and all(self.http_cache.is_processed(url, content_hash) for url, content_hash in self.last_content_hashes.items())):
+                print("Source pages unchanged since last run")
+                return None
             
-            print(f"Found {len(job_links)} job links")
+            if self.posting_state is not None:
+                self.posting_state.current = {}
             
-            for link in job_links:
-                link_text = link.get_text(strip=True)
-                if link_text.startswith('Hiring:'):
-                    # Extract department name from link text
-                    department = link_text.replace('Hiring:', '').strip()
-                    anchor_id = link.get('href')[1:]  # Remove the # from href
-                    
-                    # Find the corresponding job description section
-                    job_section = soup.find('a', attrs={'name': anchor_id})
-                    if job_section:
-                        # Get the job description content
-                        description_content = []
-                        current_element = job_section.find_next_sibling()
-                        
-                        # Collect content until we hit the next job section or end
-                        while current_element and not (current_element.name == 'a' and current_element.get('name')):
-                            if current_element.name in ['p', 'h3', 'h4', 'h5', 'h6']:
-                                text = current_element.get_text(strip=True)
-                                if text and not text.startswith('Job closing dates'):
-                                    description_content.append(text)
-                            current_element = current_element.find_next_sibling()
-                        
-                        # Join the description content
-                        description = ' '.join(description_content)
-                        
-                        # If description is still empty, try a different approach
-                        if not description:
-                            # Look for the next h3 element which should contain the department name
-                            next_h3 = job_section.find_next('h3')
-                            if next_h3:
-                                # Get all text from h3 until the next hr or h3
-                                current = next_h3.find_next_sibling()
-                                while current and current.name not in ['hr', 'h3']:
-                                    if current.name in ['p', 'div']:
-                                        text = current.get_text(strip=True)
-                                        if text:
-                                            description_content.append(text)
-                                    current = current.find_next_sibling()
-                                description = ' '.join(description_content)
-                        
-                        # Debug: Print first few characters of description
-                        if description:
-                            print(f"  - {department}: {description[:100]}...")
-                        else:
-                            print(f"  - {department}: No description found")
-                        
-                        # Extract closing date if present
-                        closing_date = None
-                        date_match = re.search(r'UNTIL\s+([A-Z]+\s+\d{1,2},?\s+\d{4})', description, re.IGNORECASE)
-                        if date_match:
-                            closing_date = date_match.group(1)
-                        
-                        # Extract contact information
-                        contact_info = []
-                        email_matches = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', description)
-                        phone_matches = re.findall(r'\(\d{3}\)\s*\d{3}-\d{4}', description)
-                        
-                        if email_matches:
-                            contact_info.extend(email_matches)
-                        if phone_matches:
-                            contact_info.extend(phone_matches)
-                        
-                        job_info = {
-                            'department': department,
-                            'location': self.extract_location_from_department(department),
-                            'details': description[:500] + '...' if len(description) > 500 else description,
-                            'full_description': description,
-                            'closing_date': closing_date,
-                            'contact_info': '; '.join(contact_info) if contact_info else '',
-                            'anchor_id': anchor_id,
-                            'ilea_link': f"{self.base_url}#{anchor_id}",
-                            'date_posted': datetime.now().strftime('%Y-%m-%d')
-                        }
-                        
-                        job_listings.append(job_info)
+            job_listings = []
+            with self.metrics.stage('parse'):
+                for source, response in fetched:
+                    job_listings.extend(source.parse(self, response.content))
             
+            self.metrics.add('jobs_extracted', len(job_listings))
             print(f"Successfully extracted {len(job_listings)} job listings")
             
             # If no jobs found, use sample data for demonstration
             if not job_listings:
+                if not self.sample_fallback:
+                    raise RuntimeError("no job listings found")
                 print("No job listings found on website, using sample data for demonstration...")
                 return self.get_sample_data()
             
@@ -221,289 +313,274 @@ class IndianaPoliceJobsScraper:
             
         except Exception as e:
             print(f"Error scraping website: {e}")
+            if not self.sample_fallback:
+                raise
             # Return sample data for demonstration
             return self.get_sample_data()
     
-    def extract_location_from_department(self, department):
-        """Extract location information from department name"""
-        # Common patterns in department names
-        location_patterns = [
-            r'(\w+\s+County)\s+Sheriff',
-            r'(\w+\s+Police\s+Department)',
-            r'(\w+\s+Marshal)',
-            r'(\w+\s+University)',
-            r'(\w+\s+Schools)',
-            r'(\w+\s+Township)',
-            r'(\w+\s+International\s+Airport)',
-            r'(\w+\s+Department\s+Of\s+Natural\s+Resources)',
-            r'(\w+\s+Department\s+Of\s+Correction)'
-        ]
+    def extract_jobs_from_html(self, content, page_url=None):
+        """Extract job listings from the bulletin page HTML"""
+        # Index every job section in one pass instead of searching per link
+        job_links, sections = self.parser.parse(content)
+        page_url = page_url or self.base_url
+        
+        print(f"Found {len(job_links)} job links")
+        
+        job_listings = []
+        for link_text, anchor_id in job_links:
+            if link_text.startswith('Hiring:'):
+                # Extract department name from link text
+                department = link_text.replace('Hiring:', '').strip()
+                
+                # Find the corresponding job description section
+                if anchor_id in sections:
+                    description = sections[anchor_id]
+                    
+                    # Debug: Print first few characters of description
+                    if self.verbose and description:
+                        print(f"  - {department}: {description[:100]}...")
+                    elif self.verbose:
+                        print(f"  - {department}: No description found")
+                    
+                    job_listings.append(self.extract_job(department, anchor_id, description, link=f"{page_url}#{anchor_id}"))
+        
+        return job_listings
+    
+    def extract_job(self, department, anchor_id, description, link=None):
+        """Build a job record, reusing the previous run's record for unchanged sections"""
+        if self.posting_state is None:
+            return self.build_job_info(department, anchor_id, description, link)
+        
+        key = posting_key(anchor_id, department)
+        digest = section_hash(department, description)
+        job_info = self.posting_state.lookup(key, digest)
+        if job_info is None:
+            # An edited posting keeps the date it was first seen
+            job_info = self.build_job_info(department, anchor_id, description, link,
+                                           date_posted=self.posting_state.first_seen(key))
+        
+        self.posting_state.record(key, digest, job_info)
+        return job_info
+    
+    def build_job_info(self, department, anchor_id, description, link=None, date_posted=None):
+        """Build a JobPosting from a department and its description
+        
+        link is the posting's URL; it defaults to the anchor on the ILEA bulletin.
+        date_posted defaults to today.
+        """
+        # Closing date, emails and phone numbers, each from its own anchored scan of the description
+        fields = extract_fields(description)
+        contact_info = fields['emails'] + fields['phones']
+        
+        return JobPosting(
+            department=department,
+            location=self.extract_location_from_department(department),
+            full_description=description,
+            closing_date=fields['closing_date'],
+            contact_info='; '.join(contact_info),
+            anchor_id=anchor_id,
+            ilea_link=link or f"{self.base_url}#{anchor_id}",
+            date_posted=date_posted or datetime.now().strftime('%Y-%m-%d')
+        )
+    
+    def add_posting_details(self, job_listings):
+        """Return the jobs with the structured pay, shift and certification fields (DETAIL_FIELDS) filled in
+        
+        In incremental mode an unchanged posting reuses the previous run's fields.
+        """
+        if self.posting_state is None:
+            return [job.replace(**extract_details(job.full_description or '')) for job in job_listings]
+        
+        jobs = []
+        for job in job_listings:
+            key = posting_key(job.anchor_id, job.department)
+            details = self.posting_state.derived(key).get('details')
+            if details is None:
+                details = extract_details(job.full_description or '')
+            self.posting_state.record_derived(key, details=details)
+            jobs.append(job.replace(**details))
+        return jobs
+    
+    def merge_near_duplicates(self, job_listings):
+        """Drop postings whose description nearly repeats an earlier one from the same department
         
-        for pattern in location_patterns:
-            match = re.search(pattern, department, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        The first posting of each cluster is kept; the clusters are left in
+        self.duplicate_clusters.
+        """
+        self.duplicate_clusters = []
+        if self.duplicate_threshold is None:
+            return job_listings
         
-        # If no pattern matches, return the department name
-        return department
+        clusters = cluster_near_duplicates(
+            [job.get('full_description') or '' for job in job_listings],
+            threshold=self.duplicate_threshold,
+            groups=[' '.join(tokenize(job['department'])) for job in job_listings]
+        )
+        self.duplicate_clusters = [[job_listings[index] for index in cluster] for cluster in clusters]
+        duplicates = {index for cluster in clusters for index in cluster[1:]}
+        if duplicates:
+            self.metrics.add('duplicates_merged', len(duplicates))
+            print(f"Merged {len(duplicates)} near-duplicate posting(s) into {len(clusters)} posting(s)")
+        return [job for index, job in enumerate(job_listings) if index not in duplicates]
+    
+    def extract_location_from_department(self, department):
+        """Extract location information from department name"""
+        return extract_location(department)
     
     def get_sample_data(self):
         """Return sample data for demonstration purposes"""
         print("Using sample data for demonstration...")
+        self.using_sample_data = True
         return [
-            {
-                'department': 'Indianapolis Metropolitan Police Department',
-                'location': 'Marion County',
-                'details': 'Police Officer - Entry Level Position',
-                'full_description': 'Police Officer - Entry Level Position with competitive salary and benefits.',
-                'closing_date': '2024-12-31',
-                'contact_info': 'hr@indy.gov',
-                'anchor_id': 'IMPD',
-                'date_posted': '2024-01-15'
-            },
-            {
-                'department': 'Fort Wayne Police Department',
-                'location': 'Allen County',
-                'details': 'Patrol Officer - Lateral Transfer',
-                'full_description': 'Patrol Officer - Lateral Transfer position available for experienced officers.',
-                'closing_date': '2024-11-30',
-                'contact_info': 'recruiting@fwpd.org',
-                'anchor_id': 'FWPD',
-                'date_posted': '2024-01-14'
-            },
-            {
-                'department': 'Evansville Police Department',
-                'location': 'Vanderburgh County',
-                'details': 'Police Officer - Academy Graduate',
-                'full_description': 'Police Officer position for academy graduates with competitive benefits.',
-                'closing_date': '2024-10-15',
-                'contact_info': 'careers@evansvillepolice.com',
-                'anchor_id': 'EPD',
-                'date_posted': '2024-01-13'
-            }
+            JobPosting(
+                department='Indianapolis Metropolitan Police Department',
+                location='Marion County',
+                full_description='Police Officer - Entry Level Position with competitive salary and benefits.',
+                closing_date=date(2024, 12, 31),
+                contact_info='hr@indy.gov',
+                anchor_id='IMPD',
+                date_posted='2024-01-15'
+            ),
+            JobPosting(
+                department='Fort Wayne Police Department',
+                location='Allen County',
+                full_description='Patrol Officer - Lateral Transfer position available for experienced officers.',
+                closing_date=date(2024, 11, 30),
+                contact_info='recruiting@fwpd.org',
+                anchor_id='FWPD',
+                date_posted='2024-01-14'
+            ),
+            JobPosting(
+                department='Evansville Police Department',
+                location='Vanderburgh County',
+                full_description='Police Officer position for academy graduates with competitive benefits.',
+                closing_date=date(2024, 10, 15),
+                contact_info='careers@evansvillepolice.com',
+                anchor_id='EPD',
+                date_posted='2024-01-13'
+            )
         ]
     
     def extract_county_from_location(self, location):
         """Extract county name from location string"""
-        location_lower = location.lower()
-        
-        # Direct county matches
-        for county in self.county_coordinates.keys():
-            if county.lower() in location_lower:
-                return county
-        
-        # City to county mappings (major cities)
-        city_to_county = {
-            'indianapolis': 'Marion',
-            'fort wayne': 'Allen',
-            'evansville': 'Vanderburgh',
-            'south bend': 'Saint Joseph',
-            'carmel': 'Hamilton',
-            'fishers': 'Hamilton',
-            'bloomington': 'Monroe',
-            'lafayette': 'Tippecanoe',
-            'gary': 'Lake',
-            'hammond': 'Lake',
-            'muncie': 'Delaware',
-            'anderson': 'Madison',
-            'terre haute': 'Vigo',
-            'elkhart': 'Elkhart',
-            'kokomo': 'Howard',
-            'noblesville': 'Hamilton',
-            'greenwood': 'Johnson',
-            'michigan city': 'LaPorte',
-            'merrillville': 'Lake',
-            'lawrence': 'Marion',
-            'greenfield': 'Hancock',
-            'new albany': 'Floyd',
-            'jeffersonville': 'Clark',
-            'richmond': 'Wayne',
-            'columbus': 'Bartholomew',
-            'plainfield': 'Hendricks',
-            'kingsford heights': 'LaPorte',
-            'alexandria': 'Madison',
-            'roseland': 'Saint Joseph',
-            'monrovia': 'Morgan',
-            'eaton': 'Delaware',
-            'frankfort': 'Clinton',
-            'mccordsville': 'Hancock',
-            'shelbyville': 'Shelby',
-            'scottsburg': 'Scott',
-            'sweetser': 'Grant',
-            'lebanon': 'Boone',
-            'rochester': 'Fulton',
-            'waterloo': 'DeKalb',
-            'cumberland': 'Marion',
-            'brazil': 'Clay',
-            'fortville': 'Hancock',
-            'dyer': 'Lake',
-            'dunkirk': 'Jay',
-            'princeton': 'Gibson',
-            'portland': 'Jay',
-            'montpelier': 'Blackford',
-            'homecroft': 'Marion',
-            'jonesboro': 'Grant',
-            'westville': 'LaPorte',
-            'valparaiso': 'Porter',
-            'warsaw': 'Kosciusko',
-            'hartford city': 'Blackford',
-            'logansport': 'Cass',
-            'mount vernon': 'Posey',
-            'boone': 'Boone',
-            'grant': 'Grant',
-            'elkhart': 'Elkhart',
-            'monroe': 'Monroe',
-            'tippecanoe': 'Tippecanoe',
-            'frankton': 'Madison',
-            'west lafayette': 'Tippecanoe',
-            'gibson': 'Gibson',
-            'wayne': 'Wayne',
-            'starke': 'Starke',
-            'whitley': 'Whitley',
-            'steuben': 'Steuben'
-        }
-        
-        for city, county in city_to_county.items():
-            if city in location_lower:
-                return county
-        
-        return None
+        match = self.match_county(location)
+        return match.county if match else None
+    
+    def match_county(self, text):
+        """Return the CountyMatch (county, rule, matched text) for a string, or None"""
+        return get_county_resolver(tuple(self.county_coordinates)).resolve(text)
     
     def get_department_info(self, department_name):
         """Get department information, badge, and fast facts"""
-        department_lower = department_name.lower()
-        
-        # Department information database
-        department_info = {
-            'indianapolis metropolitan police department': {
-                'badge': '🟦',
-                'website': 'https://www.indy.gov/agency/metropolitan-police-department',
-                'fast_facts': 'Largest police department in Indiana • 1,700+ sworn officers • Founded 1970'
-            },
-            'fort wayne police department': {
-                'badge': '🟧',
-                'website': 'https://www.cityoffortwayne.org/police-department.html',
-                'fast_facts': 'Second largest department • 450+ officers • Community policing focus'
-            },
-            'evansville police department': {
-                'badge': '🟨',
-                'website': 'https://www.evansvillepolice.com/',
-                'fast_facts': 'River city department • 300+ officers • Strong community partnerships'
-            },
-            'south bend police department': {
-                'badge': '🟩',
-                'website': 'https://southbendin.gov/departments/police/',
-                'fast_facts': 'Notre Dame area • 250+ officers • University collaboration'
-            },
-            'indiana state police': {
-                'badge': '🟥',
-                'website': 'https://www.in.gov/isp/',
-                'fast_facts': 'Statewide jurisdiction • 1,300+ troopers • Highway patrol focus'
-            },
-            'lake county sheriff': {
-                'badge': '🟪',
-                'website': 'https://www.lakecountyin.org/sheriff',
-                'fast_facts': 'Largest county sheriff • 400+ deputies • Gary area coverage'
-            },
-            'marion county sheriff': {
-                'badge': '🟫',
-                'website': 'https://www.indy.gov/agency/marion-county-sheriff-s-office',
-                'fast_facts': 'Indianapolis area • 300+ deputies • Court security focus'
-            },
-            'hamilton county sheriff': {
-                'badge': '🔵',
-                'website': 'https://www.hamiltoncounty.in.gov/sheriff/',
-                'fast_facts': 'Fastest growing county • 200+ deputies • Suburban focus'
-            },
-            'allen county sheriff': {
-                'badge': '🟢',
-                'website': 'https://www.allencountysheriff.com/',
-                'fast_facts': 'Fort Wayne area • 150+ deputies • Rural & urban mix'
-            },
-            'vanderburgh county sheriff': {
-                'badge': '🟡',
-                'website': 'https://www.vanderburghsheriff.com/',
-                'fast_facts': 'Evansville area • 100+ deputies • Countywide jurisdiction'
-            }
-        }
-        
-        # Try exact match first
-        if department_name in department_info:
-            return department_info[department_name]
-        
-        # Try partial matches
-        for key, info in department_info.items():
-            if key in department_lower or department_lower in key:
-                return info
-        
-        # Check for common patterns
-        if 'sheriff' in department_lower:
-            return {
-                'badge': '🛡️',
-                'website': None,
-                'fast_facts': 'County law enforcement • Elected position • Rural jurisdiction'
-            }
-        elif 'police department' in department_lower:
-            return {
-                'badge': '👮',
-                'website': None,
-                'fast_facts': 'Municipal law enforcement • Sworn officers • Community service'
-            }
-        elif 'university' in department_lower:
-            return {
-                'badge': '🎓',
-                'website': None,
-                'fast_facts': 'Campus law enforcement • Student safety • University jurisdiction'
-            }
-        elif 'airport' in department_lower:
-            return {
-                'badge': '✈️',
-                'website': None,
-                'fast_facts': 'Aviation security • Federal regulations • Transportation safety'
-            }
-        elif 'correction' in department_lower:
-            return {
-                'badge': '🔒',
-                'website': None,
-                'fast_facts': 'Corrections facility • Inmate supervision • Rehabilitation focus'
-            }
-        
-        # Default for unknown departments
-        return {
-            'badge': '🏛️',
-            'website': None,
-            'fast_facts': 'Law enforcement agency • Public safety • Community service'
-        }
+        return get_department_registry(self.department_registry).lookup(department_name)
     
     def process_job_data(self, job_listings):
-        """Process job listings and group by county"""
+        """Process job listings and group by county, setting each job's county"""
         county_jobs = defaultdict(list)
         
         for job in job_listings:
-            county = self.extract_county_from_location(job['location'])
-            if county:
-                county_jobs[county].append(job)
+            county = self.job_county(job)
+            if county is not None:
+                county_jobs[county].append(job if job.county == county else job.replace(county=county))
             else:
-                # If county not found, try to extract from department name
-                county = self.extract_county_from_location(job['department'])
-                if county:
-                    county_jobs[county].append(job)
+                self.metrics.add('unresolved_counties')
         
         return county_jobs
     
+    def job_county(self, job):
+        """Return the county a job is in, or None; in incremental mode an unchanged posting reuses last run's"""
+        key = posting_key(job['anchor_id'], job['department']) if self.posting_state is not None else None
+        derived = self.posting_state.derived(key) if key is not None else {}
+        if 'county' in derived:
+            county = derived['county']
+        else:
+            # The location is cut out of the department name, so the full name can
+            # hold a better match ("Vernon Police Department" vs "Mount Vernon ...")
+            matches = [match for match in (self.match_county(job['location']), self.match_county(job['department'])) if match]
+            county = min(matches, key=lambda match: RULE_RANK[match.rule]).county if matches else None
+        if key is not None:
+            self.posting_state.record_derived(key, county=county)
+        return county
+    
     def create_interactive_map(self, county_jobs):
         """Create an interactive map showing job opportunities by county with side panel"""
+        import folium
+        from client_map import JobsDataLayer
+        from county_shapes import QuantileScale
+        
         # Create a map centered on Indiana
         m = folium.Map(
             location=[39.8494, -86.2583],  # Center of Indiana
             zoom_start=7,
-            tiles='OpenStreetMap'
+            tiles='OpenStreetMap',
+            prefer_canvas=self.cluster_markers  # many circle markers draw faster on a canvas
         )
         
         # Create side panel with job listings
         side_panel_html = self.create_side_panel_html(county_jobs)
         m.get_root().html.add_child(folium.Element(side_panel_html))
         
+        if self.choropleth:
+            # Fill colors for job counts, by quantile
+            scale = QuantileScale(len(jobs) for jobs in county_jobs.values())
+            self.add_county_choropleth(m, county_jobs, scale)
+        
+        if self.client_side:
+            # The browser adds the markers and builds popups on demand
+            JobsDataLayer(self.data_url(), cluster=self.cluster_markers).add_to(m)
+        elif self.cluster_markers:
+            self.add_posting_clusters(m, county_jobs)
+        elif not self.choropleth:
+            self.add_county_markers(m, county_jobs)
+        
+        # Get current timestamp for last scraped
+        current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+        
+        if self.choropleth and not self.cluster_markers:
+            legend_items = '\n        '.join(f'<p style="margin: 4px 0;"><span style="color:{color};">■</span> {label}</p>'
+                                              for color, label in scale.legend())
+        elif self.cluster_markers:
+            legend_items = '''<p style="margin: 4px 0;"><span style="color:#007bff;">●</span> 1 job</p>
+        <p style="margin: 4px 0;">Numbered circles group</p>
+        <p style="margin: 4px 0;">nearby jobs</p>'''
+        else:
+            legend_items = '''<p style="margin: 4px 0;"><span style="color:#ffeb3b;">●</span> 1 job</p>
+        <p style="margin: 4px 0;"><span style="color:#ff9800;">●</span> 2 jobs</p>
+        <p style="margin: 4px 0;"><span style="color:#ff5722;">●</span> 3 jobs</p>
+        <p style="margin: 4px 0;"><span style="color:#f44336;">●</span> 4+ jobs</p>'''
+        
+        # Add legend
+        legend_html = f'''
+        <style>
+        @media (max-width: 768px) {{
+            .legend {{
+                bottom: 10px !important;
+                left: 10px !important;
+                width: 150px !important;
+                height: 120px !important;
+                font-size: 12px !important;
+                padding: 8px !important;
+            }}
+        }}
+        </style>
+        <div class="legend" style="position: fixed; 
+                    bottom: 50px; left: 50px; width: 200px; height: 140px; 
+                    background-color: white; border:2px solid grey; z-index:9999; 
+                    font-size:14px; padding: 10px; border-radius: 5px; box-shadow: 0 2px 5px rgba(0,0,0,0.2);">
+        <p style="margin: 0 0 8px 0;"><strong>Job Opportunities</strong></p>
+        {legend_items}
+        <hr style="margin: 8px 0; border: none; border-top: 1px solid #ddd;">
+        <p style="margin: 4px 0; font-size: 11px; color: #666;">📅 Updated: {current_time}</p>
+        </div>
+        '''
+        m.get_root().html.add_child(folium.Element(legend_html))
+        
+        return m
+    
+    def add_county_markers(self, m, county_jobs):
+        """Add one circle marker per county, with a popup listing its first five jobs"""
+        import folium
+        
         # Color scale for job counts
         max_jobs = max(len(jobs) for jobs in county_jobs.values()) if county_jobs else 1
         
@@ -516,38 +593,7 @@ class IndianaPoliceJobsScraper:
                 current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
                 
                 # Create popup content
-                popup_content = f"""
-                <div style="width: 350px;">
-                    <h3>{county} County</h3>
-                    <p><strong>Job Opportunities: {job_count}</strong></p>
-                    <p style="font-size: 11px; color: #666; margin: 5px 0;">📅 Last updated: {current_time}</p>
-                    <hr>
-                """
-                
-                for i, job in enumerate(jobs[:5]):  # Show first 5 jobs
-                    # Get department information
-                    dept_info = self.get_department_info(job['department'])
-                    
-                    popup_content += f"""
-                    <div style="margin-bottom: 10px; padding: 8px; border-left: 3px solid #007bff; background-color: #f8f9fa;">
-                        <div style="display: flex; align-items: center; margin-bottom: 5px;">
-                            <span style="font-size: 18px; margin-right: 8px;">{dept_info['badge']}</span>
-                            <strong>{job['department']}</strong>
-                        </div>
-                        <em>{job['location']}</em><br>
-                        <small style="color: #666; font-style: italic;">{dept_info['fast_facts']}</small><br>
-                        {job['details'][:100]}...<br>
-                        <small>Posted: {job['date_posted']}</small>
-                        {f'<br><small style="color: red;">Closing: {job["closing_date"]}</small>' if job['closing_date'] else ''}
-                        <br><a href="{job['ilea_link']}" target="_blank" style="color: #007bff; text-decoration: underline;">View Full Posting →</a>
-                        {f'<br><a href="{dept_info["website"]}" target="_blank" style="color: #28a745; text-decoration: underline; font-size: 12px;">🌐 Department Website</a>' if dept_info['website'] else ''}
-                    </div>
-                    """
-                
-                if len(jobs) > 5:
-                    popup_content += f"<p><em>... and {len(jobs) - 5} more opportunities</em></p>"
-                
-                popup_content += "</div>"
+                popup_content = self.renderer.county_popup(county, jobs, current_time)
                 
                 # Determine color based on job count
                 if job_count == 0:
@@ -572,361 +618,83 @@ class IndianaPoliceJobsScraper:
                     fillOpacity=0.7,
                     tooltip=f"{county} County: {job_count} job(s)"
                 ).add_to(m)
+    
+    def add_county_choropleth(self, m, county_jobs, scale):
+        """Fill each county by its job count; popups move from the markers to the counties"""
+        from county_shapes import DEFAULT_COUNTY_SHAPES_PATH, CountyChoroplethLayer
+        
+        popups = {}
+        if not self.client_side and not self.cluster_markers:
+            current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+            popups = {county: self.renderer.county_popup(county, jobs, current_time) for county, jobs in county_jobs.items()}
+        CountyChoroplethLayer(county_jobs, scale, popups, self.county_shapes or DEFAULT_COUNTY_SHAPES_PATH).add_to(m)
+    
+    def add_posting_clusters(self, m, county_jobs):
+        """Add a marker per posting, clustered, with popups built when opened"""
+        from client_map import PostingClusterLayer, build_payload
+        
+        current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+        payload = build_payload(self.collect_jobs(county_jobs), self.county_coordinates, self.get_department_info,
+                                current_time, locate=self.locate_job, search=False)
+        PostingClusterLayer(self.renderer.posting_clusters(payload)).add_to(m)
+    
+    def locate_job(self, job):
+        """Return (lat, lon) for a posting: its city or town if known, else its county's centre"""
+        county = job['county']
+        for text in (job['location'], job['department']):
+            match = self.match_county(text)
+            if match is not None and match.county == county and match.rule in (RULE_CITY, RULE_PLACE):
+                resolver = get_county_resolver(tuple(self.county_coordinates))
+                place = get_gazetteer(resolver.gazetteer_path).lookup(match.text)
+                if place is not None and place.county == county:
+                    return place.lat, place.lon
+        return self.county_coordinates.get(county)
+    
+    def create_side_panel_html(self, county_jobs):
+        """Create a side panel with job listings"""
+        all_jobs = self.collect_jobs(county_jobs)
         
         # Get current timestamp for last scraped
         current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
         
-        # Add legend
-        legend_html = f'''
-        <style>
-        @media (max-width: 768px) {{
-            .legend {{
-                bottom: 10px !important;
-                left: 10px !important;
-                width: 150px !important;
-                height: 120px !important;
-                font-size: 12px !important;
-                padding: 8px !important;
-            }}
-        }}
-        </style>
-        <div class="legend" style="position: fixed; 
-                    bottom: 50px; left: 50px; width: 200px; height: 140px; 
-                    background-color: white; border:2px solid grey; z-index:9999; 
-                    font-size:14px; padding: 10px; border-radius: 5px; box-shadow: 0 2px 5px rgba(0,0,0,0.2);">
-        <p style="margin: 0 0 8px 0;"><strong>Job Opportunities</strong></p>
-        <p style="margin: 4px 0;"><span style="color:#ffeb3b;">●</span> 1 job</p>
-        <p style="margin: 4px 0;"><span style="color:#ff9800;">●</span> 2 jobs</p>
-        <p style="margin: 4px 0;"><span style="color:#ff5722;">●</span> 3 jobs</p>
-        <p style="margin: 4px 0;"><span style="color:#f44336;">●</span> 4+ jobs</p>
-        <hr style="margin: 8px 0; border: none; border-top: 1px solid #ddd;">
-        <p style="margin: 4px 0; font-size: 11px; color: #666;">📅 Updated: {current_time}</p>
-        </div>
-        '''
-        m.get_root().html.add_child(folium.Element(legend_html))
+        return self.renderer.side_panel(all_jobs, current_time, self.data_url() if self.client_side else None)
+    
+    def collect_jobs(self, county_jobs):
+        """Return every job once, sorted by county and department"""
+        all_jobs = self.unique_jobs(county_jobs)
         
-        return m
+        # Sort jobs by county and department
+        all_jobs.sort(key=lambda x: (x['county'], x['department']))
+        return all_jobs
     
-    def create_side_panel_html(self, county_jobs):
-        """Create a side panel with job listings"""
-        # Collect all jobs for the side panel and remove duplicates
+    def unique_jobs(self, county_jobs):
+        """Return every job once, in county order"""
         all_jobs = []
         seen_jobs = set()  # Track unique job identifiers
         
-        for county, jobs in county_jobs.items():
+        for jobs in county_jobs.values():
             for job in jobs:
                 # Create unique identifier for deduplication
                 job_id = f"{job['department']}_{job['location']}_{job['anchor_id']}"
                 
                 if job_id not in seen_jobs:
                     seen_jobs.add(job_id)
-                    job['county'] = county
                     all_jobs.append(job)
         
-        # Sort jobs by county and department
-        all_jobs.sort(key=lambda x: (x['county'], x['department']))
-        
-        # Get current timestamp for last scraped
-        current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
-        
-        side_panel_html = f"""
-        <style>
-        @media (max-width: 768px) {{
-            .side-panel {{
-                width: 100% !important;
-                height: 100vh !important;
-                top: 0 !important;
-                right: 0 !important;
-                transform: translateX(100%);
-                transition: transform 0.3s ease;
-            }}
-            .side-panel.open {{
-                transform: translateX(0);
-            }}
-            .toggle-btn {{
-                display: block !important;
-            }}
-            .map-container {{
-                margin-right: 0 !important;
-            }}
-        }}
-        @media (min-width: 769px) {{
-            .side-panel {{
-                transform: translateX(0) !important;
-            }}
-            .toggle-btn {{
-                display: none !important;
-            }}
-            .map-container {{
-                margin-right: 350px !important;
-            }}
-        }}
-        </style>
-        
-        <!-- Toggle Button for Mobile -->
-        <button class="toggle-btn" onclick="toggleSidePanel()" 
-                style="position: fixed; top: 10px; right: 10px; z-index: 10000; 
-                       background: #007bff; color: white; border: none; padding: 10px 15px; 
-                       border-radius: 5px; font-size: 14px; font-weight: bold; cursor: pointer;
-                       box-shadow: 0 2px 5px rgba(0,0,0,0.2); display: none;">
-            📋 Jobs ({len(all_jobs)})
-        </button>
-        
-        <div class="side-panel" id="sidePanel" style="position: fixed; 
-                    top: 10px; right: 10px; width: 350px; height: 90vh; 
-                    background-color: white; border:2px solid #007bff; z-index:9999; 
-                    font-size:12px; padding: 10px; overflow-y: auto; box-shadow: 0 4px 8px rgba(0,0,0,0.1);">
-            <div style="background-color: #007bff; color: white; padding: 8px; margin: -10px -10px 10px -10px; display: flex; justify-content: space-between; align-items: center;">
-                <h3 style="margin: 0; font-size: 16px;">Indiana Police Jobs ({len(all_jobs)} total)</h3>
-                <button onclick="toggleSidePanel()" style="background: none; border: none; color: white; font-size: 20px; cursor: pointer; display: none;" class="close-btn">×</button>
-            </div>
-            <div style="background-color: #f8f9fa; padding: 5px; margin-bottom: 10px; border-radius: 3px; font-size: 10px; color: #666; text-align: center;">
-                📅 Last updated: {current_time}
-            </div>
-            <div style="margin-bottom: 10px;">
-                <input type="text" id="jobSearch" placeholder="Search jobs..." 
-                       style="width: 100%; padding: 5px; border: 1px solid #ddd; border-radius: 3px;"
-                       onkeyup="filterJobs()">
-            </div>
-            <div id="jobList">
-        """
-        
-        current_county = None
-        for job in all_jobs:
-            if job['county'] != current_county:
-                if current_county is not None:
-                    side_panel_html += "</div>"  # Close previous county section
-                current_county = job['county']
-                side_panel_html += f"""
-                <div class="county-section" data-county="{job['county']}">
-                    <div style="background-color: #f8f9fa; padding: 5px; margin: 5px 0; border-left: 3px solid #007bff; font-weight: bold; font-size: 11px;">
-                        {job['county']} County
-                    </div>
-                """
-            
-            # Get department information
-            dept_info = self.get_department_info(job['department'])
-            closing_date_text = f"<br><span style='color: red; font-size: 10px;'>Closes: {job['closing_date']}</span>" if job['closing_date'] else ""
-            
-            # Create department website link if available
-            dept_website_link = ""
-            if dept_info['website']:
-                dept_website_link = f"""
-                <div style="margin-top: 3px;">
-                    <a href="{dept_info['website']}" target="_blank" 
-                       style="color: #28a745; text-decoration: none; font-size: 9px;">
-                        🌐 Department Website →
-                    </a>
-                </div>
-                """
-            
-            side_panel_html += f"""
-                <div class="job-item" data-department="{job['department'].lower()}" data-county="{job['county'].lower()}">
-                    <div style="border: 1px solid #ddd; margin: 3px 0; padding: 8px; border-radius: 3px; background-color: #fafafa;">
-                        <div style="display: flex; align-items: center; margin-bottom: 3px;">
-                            <span style="font-size: 16px; margin-right: 5px;">{dept_info['badge']}</span>
-                            <div style="font-weight: bold; font-size: 11px; color: #333;">
-                                {job['department']}
-                            </div>
-                        </div>
-                        <div style="font-size: 10px; color: #666; margin-bottom: 3px;">
-                            {job['location']}
-                        </div>
-                        <div style="font-size: 9px; color: #888; margin-bottom: 3px; font-style: italic;">
-                            {dept_info['fast_facts']}
-                        </div>
-                        <div style="font-size: 10px; color: #555; margin-bottom: 3px; line-height: 1.3;">
-                            {job['details'][:80]}...
-                        </div>
-                        {closing_date_text}
-                        <div style="margin-top: 5px;">
-                            <a href="{job['ilea_link']}" target="_blank" 
-                               style="color: #007bff; text-decoration: none; font-size: 10px; font-weight: bold;">
-                                View Full Posting →
-                            </a>
-                            {dept_website_link}
-                        </div>
-                    </div>
-                </div>
-            """
-        
-        side_panel_html += """
-            </div>
-            </div>
-        </div>
-        
-        <script>
-        function filterJobs() {
-            var input = document.getElementById('jobSearch');
-            var filter = input.value.toLowerCase();
-            var jobItems = document.getElementsByClassName('job-item');
-            
-            for (var i = 0; i < jobItems.length; i++) {
-                var jobItem = jobItems[i];
-                var department = jobItem.getAttribute('data-department');
-                var county = jobItem.getAttribute('data-county');
-                
-                if (department.includes(filter) || county.includes(filter)) {
-                    jobItem.style.display = 'block';
-                } else {
-                    jobItem.style.display = 'none';
-                }
-            }
-        }
-        
-        function toggleSidePanel() {
-            var panel = document.getElementById('sidePanel');
-            var toggleBtn = document.querySelector('.toggle-btn');
-            var closeBtn = document.querySelector('.close-btn');
-            
-            if (panel.classList.contains('open')) {
-                panel.classList.remove('open');
-                if (toggleBtn) toggleBtn.style.display = 'block';
-                if (closeBtn) closeBtn.style.display = 'none';
-            } else {
-                panel.classList.add('open');
-                if (toggleBtn) toggleBtn.style.display = 'none';
-                if (closeBtn) closeBtn.style.display = 'block';
-            }
-        }
-        
-        // Show close button on mobile
-        function updateMobileUI() {
-            var closeBtn = document.querySelector('.close-btn');
-            if (window.innerWidth <= 768) {
-                if (closeBtn) closeBtn.style.display = 'block';
-            } else {
-                if (closeBtn) closeBtn.style.display = 'none';
-            }
-        }
-        
-        // Update UI on window resize
-        window.addEventListener('resize', updateMobileUI);
-        
-        // Initialize mobile UI
-        updateMobileUI();
-        </script>
-        """
-        
-        return side_panel_html
+        return all_jobs
     
     def create_jobs_table_html(self, county_jobs):
         """Create an HTML table of all job opportunities"""
         # Get current timestamp for last scraped
         current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Indiana Police Jobs - Complete Listing</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                table {{ border-collapse: collapse; width: 100%; margin-top: 20px; }}
-                th, td {{ border: 1px solid #ddd; padding: 12px; text-align: left; }}
-                th {{ background-color: #f2f2f2; font-weight: bold; }}
-                tr:nth-child(even) {{ background-color: #f9f9f9; }}
-                tr:hover {{ background-color: #f5f5f5; }}
-                .closing-date {{ color: red; font-weight: bold; }}
-                .contact-info {{ font-size: 0.9em; color: #666; }}
-                .county-header {{ background-color: #007bff; color: white; padding: 10px; margin-top: 20px; }}
-                .job-details {{ max-width: 400px; }}
-                .last-updated {{ background-color: #f8f9fa; padding: 10px; border-radius: 5px; margin: 10px 0; text-align: center; color: #666; }}
-            </style>
-        </head>
-        <body>
-            <h1>Indiana Law Enforcement Job Opportunities</h1>
-            <p>Complete listing of all available positions across Indiana counties</p>
-            <div class="last-updated">
-                📅 <strong>Last Updated:</strong> {current_time}
-            </div>
-        """
-        
-        total_jobs = sum(len(jobs) for jobs in county_jobs.values())
-        html_content += f"<p><strong>Total Job Opportunities: {total_jobs}</strong></p>"
-        
-        for county, jobs in sorted(county_jobs.items()):
-            html_content += f"""
-            <div class="county-header">
-                <h2>{county} County - {len(jobs)} Job(s)</h2>
-            </div>
-            <table>
-                <thead>
-                                    <tr>
-                    <th>Department</th>
-                    <th>Location</th>
-                    <th>Details</th>
-                    <th>Closing Date</th>
-                    <th>Contact Info</th>
-                    <th>ILEA Link</th>
-                    <th>Posted Date</th>
-                </tr>
-                </thead>
-                <tbody>
-            """
-            
-            for job in jobs:
-                # Get department information
-                dept_info = self.get_department_info(job['department'])
-                closing_date_cell = f'<span class="closing-date">{job["closing_date"]}</span>' if job['closing_date'] else 'No closing date'
-                contact_cell = f'<div class="contact-info">{job["contact_info"]}</div>' if job['contact_info'] else 'No contact info'
-                
-                # Create department website link if available
-                dept_website_cell = ""
-                if dept_info['website']:
-                    dept_website_cell = f'<br><a href="{dept_info["website"]}" target="_blank" style="color: #28a745; text-decoration: underline;">🌐 Department Website</a>'
-                
-                html_content += f"""
-                <tr>
-                    <td>
-                        <div style="display: flex; align-items: center;">
-                            <span style="font-size: 20px; margin-right: 8px;">{dept_info['badge']}</span>
-                            <div>
-                                <strong>{job['department']}</strong>
-                                <br><small style="color: #666; font-style: italic;">{dept_info['fast_facts']}</small>
-                                {dept_website_cell}
-                            </div>
-                        </div>
-                    </td>
-                    <td>{job['location']}</td>
-                    <td class="job-details">{job['details']}</td>
-                    <td>{closing_date_cell}</td>
-                    <td>{contact_cell}</td>
-                    <td><a href="{job['ilea_link']}" target="_blank" style="color: #007bff; text-decoration: underline;">View Full Posting</a></td>
-                    <td>{job['date_posted']}</td>
-                </tr>
-                """
-            
-            html_content += """
-                </tbody>
-            </table>
-            """
-        
-        html_content += """
-        </body>
-        </html>
-        """
-        
-        return html_content
+        return self.renderer.jobs_table(county_jobs, current_time)
     
     def save_data_to_csv(self, county_jobs, filename='indiana_police_jobs.csv'):
         """Save job data to CSV file"""
-        all_jobs = []
-        seen_jobs = set()  # Track unique job identifiers
+        all_jobs = self.unique_jobs(county_jobs)
         
-        for county, jobs in county_jobs.items():
-            for job in jobs:
-                # Create unique identifier for deduplication
-                job_id = f"{job['department']}_{job['location']}_{job['anchor_id']}"
-                
-                if job_id not in seen_jobs:
-                    seen_jobs.add(job_id)
-                    job['county'] = county
-                    all_jobs.append(job)
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['department', 'location', 'details', 'full_description', 'closing_date', 'contact_info', 'anchor_id', 'ilea_link', 'county', 'date_posted']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        with atomic_open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=POSTING_FIELDS)
             
             writer.writeheader()
             for job in all_jobs:
@@ -937,48 +705,266 @@ class IndianaPoliceJobsScraper:
     def run(self):
         """Main method to run the scraper and create the map"""
         print("Starting Indiana Police Jobs Scraper...")
+        self.start_metrics()
         
-        # Scrape job opportunities
-        job_listings = self.scrape_job_opportunities()
+        # Scrape job opportunities, skipping the rest when nothing has changed
+        county_jobs = self.scrape_postings(skip_unchanged=self.outputs_exist())
+        if county_jobs is None:
+            print("Outputs are up to date, skipping parse and render")
+            self.save_metrics()
+            return None, None
         
-        # Process and group by county
-        county_jobs = self.process_job_data(job_listings)
+        # Find the outputs to write (all of them without an output state)
+        with self.metrics.stage('digest'):
+            stale = self.stale_outputs(county_jobs)
         
         # Save data to CSV
-        self.save_data_to_csv(county_jobs)
+        if self.csv_filename in stale:
+            with self.metrics.stage('csv'):
+                self.save_data_to_csv(county_jobs, self.csv_filename)
+        
+        # Save the payload the client-side map and table are rendered from
+        if self.client_side and self.data_filename in stale:
+            with self.metrics.stage('data'):
+                self.save_jobs_data(county_jobs)
+        
+        # Save the Parquet or Arrow export
+        if self.columnar_format and self.columnar_filename in stale:
+            with self.metrics.stage('columnar'):
+                self.save_columnar(county_jobs)
+        
+        # Create interactive map and save it
+        map_obj = None
+        if self.map_filename in stale:
+            with self.metrics.stage('map'):
+                map_obj = self.create_interactive_map(county_jobs)
+                self.save_map(map_obj)
         
-        # Create interactive map
-        map_obj = self.create_interactive_map(county_jobs)
+        # Create and save jobs table
+        if self.table_filename in stale:
+            with self.metrics.stage('table'):
+                self.save_jobs_table(county_jobs)
         
-        # Save map
-        map_filename = 'indiana_police_jobs_map.html'
-        map_obj.save(map_filename)
-        print(f"Interactive map saved to {map_filename}")
+        self.finish_run(county_jobs)
+        return map_obj, county_jobs
+    
+    def scrape_postings(self, skip_unchanged=False):
+        """Scrape the postings and return them grouped by county, without writing any output
         
-        # Create and save jobs table
-        table_html = self.create_jobs_table_html(county_jobs)
-        table_filename = 'indiana_police_jobs_table.html'
-        with open(table_filename, 'w', encoding='utf-8') as f:
-            f.write(table_html)
-        print(f"Jobs table saved to {table_filename}")
+        With a job store the run is recorded in it and its open postings are
+        returned. Returns None when skip_unchanged and the source pages are unchanged.
+        """
+        job_listings = self.scrape_job_opportunities(skip_unchanged=skip_unchanged)
+        if job_listings is None:
+            return None
+        
+        # Pull pay, shift length and certification tier out of the descriptions
+        with self.metrics.stage('details'):
+            job_listings = self.add_posting_details(job_listings)
         
-        # Print summary
+        # Keep one posting per cluster of near-duplicates, for every output
+        with self.metrics.stage('dedupe'):
+            job_listings = self.merge_near_duplicates(job_listings)
+        
+        # Process and group by county
+        with self.metrics.stage('resolve'):
+            county_jobs = self.process_job_data(job_listings)
+        
+        # Record the run in the job store and export the outputs from it
+        if self.job_store is not None:
+            with self.metrics.stage('store'):
+                county_jobs = self.update_job_store(county_jobs)
+        return county_jobs
+    
+    def start_metrics(self):
+        """Start a fresh set of run metrics (and the profile, if enabled)"""
+        # A failed run never reached save_metrics(); stop its profiler first
+        self.metrics.finish()
+        self.metrics = RunMetrics(self.profile)
+        self.metrics.start()
+    
+    def count_fetch(self, content, from_cache):
+        """Count a fetched source page and its size"""
+        self.metrics.add('pages_fetched')
+        self.metrics.add('fetch_bytes', len(content))
+        if from_cache:
+            self.metrics.add('pages_not_modified')
+    
+    def save_metrics(self):
+        """Finish the run metrics and save the JSON report, Prometheus textfile and profile"""
+        self.metrics.finish()
+        if self.metrics_file:
+            self.metrics.save_report(self.metrics_file)
+            if self.profile == 'cpu':
+                self.metrics.save_profile(os.path.splitext(self.metrics_file)[0] + '.prof')
+            print(f"Run metrics saved to {self.metrics_file}")
+        if self.prometheus_file:
+            self.metrics.save_prometheus(self.prometheus_file)
+    
+    def update_job_store(self, county_jobs):
+        """Upsert this run's postings into the job store and return its open postings by county
+        
+        The sample data is never recorded: it would close every real open posting.
+        When a source failed to fetch, its open postings are left open.
+        """
+        if self.using_sample_data:
+            print("Sample data is not recorded in the job store")
+            self.last_store_run = None
+            return county_jobs
+        self.last_store_run = self.job_store.record_run(county_jobs, pages=self.last_fetched_urls)
+        return self.job_store.county_jobs()
+    
+    def output_filenames(self):
+        """Return the output files this scraper writes"""
+        filenames = [self.map_filename, self.table_filename, self.csv_filename]
+        if self.client_side:
+            filenames.append(self.data_filename)
+        if self.columnar_format:
+            filenames.append(self.columnar_filename)
+        return filenames
+    
+    def output_digests(self, county_jobs):
+        """Hash the postings and the options behind each output file"""
+        jobs = [encode_job(job) for job in self.collect_jobs(county_jobs)]
+        postings = json.dumps(jobs, sort_keys=True, default=str)
+        registry = os.path.getmtime(self.department_registry) if os.path.exists(self.department_registry) else None
+        options = {
+            self.map_filename: [self.client_side, self.data_url(), self.cluster_markers, self.choropleth, registry],
+            self.table_filename: [self.client_side, self.data_url(), registry],
+            self.csv_filename: [],
+            self.data_filename: [self.cluster_markers, registry],
+            self.columnar_filename: [self.columnar_format, self.store_path],
+        }
+        return {
+            filename: hashlib.sha256(json.dumps([postings, options[filename]]).encode('utf-8')).hexdigest()
+            for filename in self.output_filenames()
+        }
+    
+    def stale_outputs(self, county_jobs):
+        """Return {filename: digest} for the outputs that need writing
+        
+        Without an output state every output is written; with one, outputs whose
+        postings and options match the last time they were written are skipped.
+        """
+        digests = self.output_digests(county_jobs)
+        if self.output_state is None:
+            self.stale = digests
+        else:
+            self.stale = {filename: digest for filename, digest in digests.items()
+                          if not self.output_state.is_current(filename, digest)}
+            unchanged = [filename for filename in digests if filename not in self.stale]
+            if unchanged:
+                print(f"Postings unchanged for {', '.join(unchanged)}, keeping the existing file(s)")
+        return self.stale
+    
+    def outputs_exist(self):
+        """Return True if the map, table and CSV from a previous run are all present"""
+        return all(os.path.exists(f) for f in self.output_filenames())
+    
+    def data_url(self):
+        """URL of the data file as referenced from the map and table pages"""
+        return os.path.basename(self.data_filename)
+    
+    def save_jobs_data(self, county_jobs):
+        """Save the compact JSON payload for the client-side map and table"""
+        from client_map import build_payload, write_payload
+        
+        current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+        payload = build_payload(self.collect_jobs(county_jobs), self.county_coordinates, self.get_department_info,
+                                current_time, locate=self.locate_job if self.cluster_markers else None)
+        size = write_payload(payload, self.data_filename)
+        print(f"Job data for the map saved to {self.data_filename} ({size} bytes)")
+    
+    def save_columnar(self, county_jobs):
+        """Save the postings as Parquet or Arrow for job_analytics
+        
+        With a job store, every posting it holds is exported with its history,
+        closed ones included; otherwise only this run's postings.
+        """
+        from job_analytics import postings_frame, write_postings
+        
+        if self.job_store is not None:
+            jobs = self.job_store.postings(include_closed=True)
+        else:
+            jobs = self.collect_jobs(county_jobs)
+        frame = postings_frame(jobs, snapshot=datetime.now().isoformat(timespec='seconds'))
+        size = write_postings(frame, self.columnar_filename)
+        print(f"Job data for analysis saved to {self.columnar_filename} ({size} bytes)")
+    
+    def save_map(self, map_obj):
+        """Save the interactive map"""
+        with atomic_open(self.map_filename, 'wb') as f:
+            map_obj.save(f, close_file=False)
+        print(f"Interactive map saved to {self.map_filename}")
+    
+    def save_jobs_table(self, county_jobs):
+        """Stream the jobs table HTML to its file"""
+        current_time = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+        with atomic_open(self.table_filename, 'w', encoding='utf-8') as f:
+            self.renderer.write_jobs_table(county_jobs, f, current_time, self.data_url() if self.client_side else None)
+        print(f"Jobs table saved to {self.table_filename}")
+    
+    def finish_run(self, county_jobs):
+        """Print the summary and save the cache and incremental state for the next run"""
         print("\n" + "="*50)
         print("SUMMARY")
         print("="*50)
         total_jobs = sum(len(jobs) for jobs in county_jobs.values())
+        self.metrics.add('jobs_mapped', total_jobs)
+        self.metrics.add('counties', len(county_jobs))
+        self.metrics.add('outputs_unchanged', len(self.output_filenames()) - len(self.stale))
         print(f"Total job opportunities found: {total_jobs}")
         print(f"Counties with job opportunities: {len(county_jobs)}")
+        if self.duplicate_clusters:
+            merged = sum(len(cluster) - 1 for cluster in self.duplicate_clusters)
+            print(f"Near-duplicate postings merged: {merged}")
         
         for county, jobs in sorted(county_jobs.items()):
             print(f"{county} County: {len(jobs)} job(s)")
         
+        descriptions = {
+            self.map_filename: 'Interactive map',
+            self.table_filename: 'Jobs table',
+            self.csv_filename: 'Job data',
+            self.data_filename: 'Map and table data',
+            self.columnar_filename: 'Job data for analysis',
+        }
         print(f"\nFiles created:")
-        print(f"- {map_filename} (Interactive map)")
-        print(f"- {table_filename} (Jobs table)")
-        print(f"- indiana_police_jobs.csv (Job data)")
-        
-        return map_obj, county_jobs
+        for filename in self.output_filenames():
+            if filename in self.stale:
+                self.metrics.record_output(filename, os.path.getsize(filename))
+                print(f"- {filename} ({descriptions[filename]})")
+        if not self.stale:
+            print("- none (postings unchanged)")
+        if self.last_store_run is not None:
+            run = self.last_store_run
+            print(f"- {self.store_path} (Job store: {run['added']} added, {run['changed']} changed, "
+                  f"{run['closed']} closed)")
+        
+        # Remember what each output was written from
+        if self.output_state is not None:
+            for filename, digest in self.stale.items():
+                self.output_state.record(filename, digest)
+            self.output_state.save(self.output_state_file)
+        
+        # Remember which page bodies these outputs were built from
+        if self.http_cache is not None:
+            for url, content_hash in self.last_content_hashes.items():
+                self.http_cache.mark_processed(url, content_hash)
+        
+        # Save the incremental state and the postings that changed since the last run
+        if self.posting_state is not None and self.posting_state.current:
+            if self.last_fetched_urls is not None:
+                self.posting_state.carry_forward(self.last_fetched_urls)
+            changes = self.posting_state.diff()
+            changes_filename = 'indiana_police_jobs_changes.json'
+            with atomic_open(changes_filename, 'w', encoding='utf-8') as f:
+                json.dump(changes, f, indent=2)
+            self.posting_state.save(self.state_file)
+            print(f"Changes since last run: {len(changes['added'])} added, "
+                  f"{len(changes['removed'])} removed, {len(changes['changed'])} changed ({changes_filename})")
+        
+        self.save_metrics()
 
 if __name__ == "__main__":
     scraper = IndianaPoliceJobsScraper()
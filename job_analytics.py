@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Columnar export and analytics for the Indiana Police Jobs Scraper
+Postings are written to Parquet or Arrow IPC with typed columns (parsed dates,
+counties and departments as categories), and the reports run as pandas column
+operations instead of loops over job dicts. Needs pandas and pyarrow
+(pip install pandas pyarrow)
+"""
+
+import os
+
+import pandas as pd
+
+from output_files import atomic_path
+from posting_state import posting_key
+
+DATE_COLUMNS = ('closing_date', 'date_posted', 'first_seen', 'last_seen', 'changed_at', 'closed_at', 'snapshot')
+CATEGORY_COLUMNS = ('county', 'department', 'pay_period')
+
+# File extensions written as Arrow IPC (Feather v2); anything else is Parquet
+ARROW_EXTENSIONS = ('.arrow', '.feather')
+
+
+def postings_frame(jobs, snapshot=None):
+    """Build a typed DataFrame from job records or JobStore.postings() rows
+
+    snapshot is the time the postings were exported; it is stored with every row
+    so exports from separate runs can be combined later. Records without job
+    store history count as first seen on their date_posted.
+    """
+    frame = pd.DataFrame.from_records([dict(job) for job in jobs])
+    if frame.empty:
+        frame = pd.DataFrame(columns=['posting_key', 'department', 'anchor_id', 'county', 'date_posted'])
+    if 'posting_key' not in frame:
+        frame['posting_key'] = [posting_key(anchor_id, department)
+                                for anchor_id, department in zip(frame['anchor_id'], frame['department'])]
+    if 'first_seen' not in frame:
+        frame['first_seen'] = frame['date_posted']
+    frame['snapshot'] = snapshot
+    for column in DATE_COLUMNS:
+        if column in frame:
+            frame[column] = pd.to_datetime(frame[column], errors='coerce')
+    for column in CATEGORY_COLUMNS:
+        if column in frame:
+            frame[column] = frame[column].astype('category')
+    return frame
+
+
+def write_postings(frame, path):
+    """Write a postings frame as Parquet, or Arrow IPC for .arrow/.feather; returns the file size"""
+    with atomic_path(path) as tmp_path:
+        if path.endswith(ARROW_EXTENSIONS):
+            frame.reset_index(drop=True).to_feather(tmp_path)
+        else:
+            frame.to_parquet(tmp_path, index=False)
+    return os.path.getsize(path)
+
+
+def read_postings(*paths):
+    """Read one or more exported postings files into one frame
+
+    Several files are treated as snapshots from separate runs and combined with
+    combine_snapshots().
+    """
+    frames = [pd.read_feather(path) if path.endswith(ARROW_EXTENSIONS) else pd.read_parquet(path) for path in paths]
+    if len(frames) == 1:
+        return frames[0]
+    frame = pd.concat(frames, ignore_index=True)
+    for column in CATEGORY_COLUMNS:
+        if column in frame:
+            frame[column] = frame[column].astype('category')
+    return combine_snapshots(frame)
+
+
+def combine_snapshots(frame):
+    """Collapse rows from several snapshots into one row per posting
+
+    Each posting keeps its latest fields and its earliest first_seen; last_seen is
+    the last snapshot listing it, and closed_at the next snapshot after that, so
+    postings still in the latest snapshot stay open.
+    """
+    frame = frame.sort_values('snapshot', kind='stable')
+    grouped = frame.groupby('posting_key', sort=False)
+    first_seen = grouped['first_seen'].min()
+    last_seen = grouped['snapshot'].max()
+
+    combined = frame.drop_duplicates('posting_key', keep='last').set_index('posting_key')
+    combined['first_seen'] = first_seen
+    combined['last_seen'] = last_seen
+
+    # The first snapshot after each posting's last one (none if it is the latest)
+    snapshots = pd.DatetimeIndex(frame['snapshot'].dropna().unique()).sort_values()
+    following = snapshots.searchsorted(combined['last_seen'].to_numpy(), side='right')
+    closed_at = pd.Series(pd.NaT, index=combined.index, dtype=snapshots.dtype)
+    later = following < len(snapshots)
+    closed_at[later] = snapshots[following[later]]
+    combined['closed_at'] = closed_at
+    return combined.reset_index()
+
+
+def open_counts(frame, freq='W', by='county'):
+    """Open postings at the end of each period, one column per county (or by column)
+
+    Every posting adds one when first seen and removes one when closed; the
+    running total of those changes is the count of open postings.
+    """
+    opened = pd.DataFrame({by: frame[by], 'at': frame['first_seen'], 'change': 1})
+    closed = frame[frame['closed_at'].notna()]
+    closed = pd.DataFrame({by: closed[by], 'at': closed['closed_at'], 'change': -1})
+    events = pd.concat([opened, closed], ignore_index=True).dropna(subset=['at'])
+    changes = events.groupby([pd.Grouper(key='at', freq=freq), by], observed=True)['change'].sum()
+    # Periods without any change still get a row
+    return changes.unstack(fill_value=0).resample(freq).sum().cumsum()
+
+
+def openings(frame, freq='W', by=None):
+    """New postings per period, optionally one column per county (or by column)"""
+    if by is None:
+        return frame.set_index('first_seen').resample(freq).size()
+    return frame.groupby([pd.Grouper(key='first_seen', freq=freq), by], observed=True).size() \
+        .unstack(fill_value=0).resample(freq).sum()
+
+
+def time_to_close(frame, by='county'):
+    """Days from first seen to closed for the closed postings, summarized per county (or by column)"""
+    closed = frame[frame['closed_at'].notna()]
+    days = (closed['closed_at'] - closed['first_seen']).dt.total_seconds() / 86400
+    return days.groupby(closed[by], observed=True).agg(['count', 'mean', 'median', 'max'])
+
+
+def pay_by_county(frame, pay_period='year', by='county'):
+    """Starting and top pay per county (or by column) for the postings that quote pay per pay_period"""
+    paid = frame[frame['pay_period'] == pay_period]
+    return paid.groupby(by, observed=True).agg(
+        postings=('salary_min', 'size'),
+        median_min=('salary_min', 'median'),
+        median_max=('salary_max', 'median'),
+        highest=('salary_max', 'max'),
+    )
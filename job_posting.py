@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Job posting records for the Indiana Police Jobs Scraper
+A JobPosting is an immutable record with slots instead of a dict. The details
+preview and the link to the posting are derived on access rather than stored,
+and the strings most postings share (department, location, county, dates, the
+bulletin URL) are interned, so archives of many runs fit in one process. It reads
+like the dict it replaced (job['county'], job.get('salary_max')), so templates,
+the CSV writer and the job store take either
+"""
+
+import sys
+from collections.abc import Mapping
+
+from field_extraction import DETAIL_FIELDS
+from job_sources import ILEA_BULLETIN_URL
+
+# The record's fields, in CSV column order; details and ilea_link are derived
+POSTING_FIELDS = ('department', 'location', 'details', 'full_description', 'closing_date', 'contact_info',
+                  'anchor_id', 'ilea_link', 'county', 'date_posted') + DETAIL_FIELDS
+DERIVED_FIELDS = ('details', 'ilea_link')
+STORED_FIELDS = tuple(field for field in POSTING_FIELDS if field not in DERIVED_FIELDS)
+
+# Shared by many postings, so each distinct value is kept in memory once
+INTERNED_FIELDS = ('department', 'location', 'county', 'date_posted', 'pay_period')
+
+# Length of the description shown as a posting's details
+DETAILS_LENGTH = 500
+
+
+class JobPosting(Mapping):
+    """One job posting; read it as job.county or job['county'], change it with replace()
+
+    ilea_link is kept as the page it was found on plus the anchor, unless the
+    link is not an anchor on a page (an agency's careers page, say).
+    """
+
+    __slots__ = STORED_FIELDS + ('_page_url', '_link')
+
+    def __init__(self, **fields):
+        fields.pop('details', None)
+        link = fields.pop('ilea_link', None)
+        for name in STORED_FIELDS:
+            value = fields.pop(name, None)
+            if name in INTERNED_FIELDS and type(value) is str:
+                value = sys.intern(value)
+            object.__setattr__(self, name, value)
+        if fields:
+            raise TypeError(f"Unknown job posting field(s): {', '.join(fields)}")
+
+        # Without a link the posting is an anchor on the ILEA bulletin
+        page_url, anchor = (link or f"{ILEA_BULLETIN_URL}#{self.anchor_id}").rpartition('#')[::2]
+        if anchor and anchor == self.anchor_id:
+            object.__setattr__(self, '_page_url', sys.intern(page_url))
+            object.__setattr__(self, '_link', None)
+        else:
+            object.__setattr__(self, '_page_url', None)
+            object.__setattr__(self, '_link', link)
+
+    @classmethod
+    def from_dict(cls, job):
+        """Build a posting from a job dict, ignoring keys that are not posting fields"""
+        return cls(**{key: value for key, value in job.items() if key in POSTING_FIELDS})
+
+    @property
+    def details(self):
+        """The start of the description, for previews"""
+        description = self.full_description or ''
+        return description[:DETAILS_LENGTH] + '...' if len(description) > DETAILS_LENGTH else description
+
+    @property
+    def ilea_link(self):
+        """URL of the full posting"""
+        return self._link if self._page_url is None else f"{self._page_url}#{self.anchor_id}"
+
+    def replace(self, **changes):
+        """Return a copy of the posting with some fields changed"""
+        fields = {name: getattr(self, name) for name in STORED_FIELDS}
+        fields['ilea_link'] = self.ilea_link
+        fields.update(changes)
+        return JobPosting(**fields)
+
+    def __getitem__(self, key):
+        if key not in POSTING_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(POSTING_FIELDS)
+
+    def __len__(self):
+        return len(POSTING_FIELDS)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"JobPosting is immutable; use replace({name}=...)")
+
+    def __delattr__(self, name):
+        raise AttributeError("JobPosting is immutable")
+
+    # Slots and a blocked __setattr__ need their own pickling (for process pools)
+    def __getstate__(self):
+        return tuple(object.__getattribute__(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            if name in INTERNED_FIELDS + ('_page_url',) and type(value) is str:
+                value = sys.intern(value)
+            object.__setattr__(self, name, value)
+
+    def __repr__(self):
+        return f"JobPosting(department={self.department!r}, anchor_id={self.anchor_id!r}, county={self.county!r})"
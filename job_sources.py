@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Job sources for the Indiana Police Jobs Scraper
+Each source names a page to fetch and turns its body into job_info records;
+the scraper fetches every source concurrently and merges the results in order.
+Sources can also be listed in a JSON file (see load_sources)
+"""
+
+import json
+import re
+
+ILEA_BULLETIN_URL = "https://www.in.gov/ilea/bulletin-board/law-enforcement-job-opportunities/"
+
+
+class JobSource:
+    """A page that job postings are read from"""
+
+    type_name = None
+
+    def __init__(self, url, name=None):
+        self.url = url
+        self.name = name or url
+
+    def parse(self, scraper, content):
+        """Return the job_info records found in the page body"""
+        raise NotImplementedError
+
+
+class IleaBulletinSource(JobSource):
+    """A bulletin in the ILEA format: "Hiring:" links to named job sections"""
+
+    type_name = 'ilea_bulletin'
+
+    def __init__(self, url=ILEA_BULLETIN_URL, name='ILEA bulletin'):
+        super().__init__(url, name)
+
+    def parse(self, scraper, content):
+        return scraper.extract_jobs_from_html(content, page_url=self.url)
+
+
+class AgencyPageSource(JobSource):
+    """An agency or county HR careers page, read as a single posting"""
+
+    type_name = 'agency_page'
+
+    def __init__(self, url, department, name=None):
+        super().__init__(url, name or department)
+        self.department = department
+        # Stands in for the bulletin's anchor name in keys and the CSV
+        self.anchor_id = re.sub(r'[^A-Za-z0-9]', '', department)
+
+    def parse(self, scraper, content):
+        description = scraper.parser.page_text(content)
+        if not description:
+            return []
+        return [scraper.extract_job(self.department, self.anchor_id, description, link=self.url)]
+
+
+SOURCE_TYPES = {
+    IleaBulletinSource.type_name: IleaBulletinSource,
+    AgencyPageSource.type_name: AgencyPageSource,
+}
+
+
+def load_sources(path):
+    """Build sources from a JSON list such as
+    [{"type": "agency_page", "url": "https://...", "department": "Carmel Police Department"}]
+    """
+    with open(path, encoding='utf-8') as f:
+        entries = json.load(f)
+
+    sources = []
+    for entry in entries:
+        entry = dict(entry)
+        type_name = entry.pop('type')
+        try:
+            source_class = SOURCE_TYPES[type_name]
+        except KeyError:
+            raise ValueError(f"Unknown source type '{type_name}'. Choose from: {', '.join(SOURCE_TYPES)}")
+        sources.append(source_class(**entry))
+    return sources
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+SQLite job store for the Indiana Police Jobs Scraper
+Every posting ever scraped is kept under its stable key with the dates it was
+first and last seen and when it closed. Each run upserts its postings in one
+transaction, and the CSV, map and table are exported from the open postings
+"""
+
+import sqlite3
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+
+from job_posting import POSTING_FIELDS, JobPosting
+from posting_state import decode_job, encode_job, posting_key, section_hash, source_page
+
+# The job record fields, in CSV column order; county is the county it was mapped to
+JOB_COLUMNS = POSTING_FIELDS
+
+# Types of the structured fields, added on open to stores created before them
+DETAIL_COLUMN_TYPES = {
+    'salary_min': 'REAL',
+    'salary_max': 'REAL',
+    'pay_period': 'TEXT',
+    'shift_hours': 'INTEGER',
+    'ilea_tier': 'INTEGER',
+    'lateral': 'INTEGER',
+    'entry_level': 'INTEGER',
+}
+FLAG_COLUMNS = ('lateral', 'entry_level')
+
+# When a posting first appeared, was last scraped, last changed and disappeared
+HISTORY_COLUMNS = ('first_seen', 'last_seen', 'changed_at', 'closed_at')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    posting_key TEXT PRIMARY KEY,
+    department TEXT NOT NULL,
+    location TEXT,
+    details TEXT,
+    full_description TEXT,
+    closing_date TEXT,
+    contact_info TEXT,
+    anchor_id TEXT,
+    ilea_link TEXT,
+    county TEXT,
+    date_posted TEXT,
+    salary_min REAL,
+    salary_max REAL,
+    pay_period TEXT,
+    shift_hours INTEGER,
+    ilea_tier INTEGER,
+    lateral INTEGER,
+    entry_level INTEGER,
+    content_hash TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    changed_at TEXT NOT NULL,
+    closed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS postings_county ON postings (county);
+CREATE INDEX IF NOT EXISTS postings_department ON postings (department);
+CREATE INDEX IF NOT EXISTS postings_closing_date ON postings (closing_date);
+-- Only the open postings, in the order the exports list them
+CREATE INDEX IF NOT EXISTS postings_open ON postings (county, department) WHERE closed_at IS NULL;
+
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    ran_at TEXT NOT NULL,
+    open INTEGER NOT NULL,
+    added INTEGER NOT NULL,
+    changed INTEGER NOT NULL,
+    closed INTEGER NOT NULL
+);
+
+CREATE VIEW IF NOT EXISTS open_postings AS
+    SELECT * FROM postings WHERE closed_at IS NULL ORDER BY county, department;
+"""
+
+# Created after any missing detail columns are added
+DETAIL_INDEXES = """
+CREATE INDEX IF NOT EXISTS postings_salary ON postings (pay_period, salary_max);
+"""
+
+# A posting seen again keeps its first_seen and date_posted, and reopens if it had closed
+UPSERT = f"""
+INSERT INTO postings (posting_key, {', '.join(JOB_COLUMNS)}, content_hash, first_seen, last_seen, changed_at)
+VALUES (:posting_key, {', '.join(':' + column for column in JOB_COLUMNS)}, :content_hash, :now, :now, :now)
+ON CONFLICT (posting_key) DO UPDATE SET
+    {', '.join(f'{column} = excluded.{column}' for column in JOB_COLUMNS if column != 'date_posted')},
+    changed_at = CASE WHEN content_hash = excluded.content_hash THEN changed_at ELSE excluded.changed_at END,
+    content_hash = excluded.content_hash,
+    last_seen = excluded.last_seen,
+    closed_at = NULL
+"""
+
+# Backfilled history merged with what the store already holds: the earliest first
+# seen wins, the job fields and closing date come from whichever saw it last, and
+# the same content keeps the earlier of the two change dates
+HISTORY_UPSERT = f"""
+INSERT INTO postings (posting_key, {', '.join(JOB_COLUMNS)}, content_hash, {', '.join(HISTORY_COLUMNS)})
+VALUES (:posting_key, {', '.join(':' + column for column in JOB_COLUMNS + ('content_hash',) + HISTORY_COLUMNS)})
+ON CONFLICT (posting_key) DO UPDATE SET
+    {', '.join(f'{column} = CASE WHEN excluded.last_seen > last_seen THEN excluded.{column} ELSE {column} END'
+               for column in JOB_COLUMNS + ('content_hash', 'closed_at') if column != 'date_posted')},
+    changed_at = CASE WHEN excluded.content_hash = content_hash THEN MIN(changed_at, excluded.changed_at)
+                      WHEN excluded.last_seen > last_seen THEN excluded.changed_at ELSE changed_at END,
+    date_posted = CASE WHEN excluded.first_seen < first_seen THEN excluded.date_posted ELSE date_posted END,
+    first_seen = MIN(first_seen, excluded.first_seen),
+    last_seen = MAX(last_seen, excluded.last_seen)
+"""
+
+
+def decode_row(row):
+    """Turn a postings row back into a job record (dates and flags restored)"""
+    job = decode_job(dict(row))
+    for column in FLAG_COLUMNS:
+        if job.get(column) is not None:
+            job[column] = bool(job[column])
+    return job
+
+
+class JobStore:
+    """Postings and run history in a SQLite database (WAL mode)
+
+    Every call opens its own connection, so the store can be used from the
+    async engine's worker threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with self.connect() as conn:
+            # WAL lets dashboards read while a run is writing; the setting is kept in the file
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(postings)")}
+            for column, kind in DETAIL_COLUMN_TYPES.items():
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE postings ADD COLUMN {column} {kind}")
+            conn.executescript(DETAIL_INDEXES)
+
+    @contextmanager
+    def connect(self):
+        """Open a connection; commits on success, rolls back on error, always closes"""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record_run(self, county_jobs, now=None, pages=None):
+        """Upsert this run's postings and close the open ones it no longer lists
+
+        pages, if given, is the URLs of the source pages this run read (when
+        another failed to fetch); only open postings read from one of them can
+        close. Returns the run's row from the runs table as a dict.
+        """
+        now = now or datetime.now().isoformat(timespec='seconds')
+        rows = {}
+        for county, jobs in county_jobs.items():
+            for job in jobs:
+                key = posting_key(job['anchor_id'], job['department'])
+                row = {column: None for column in JOB_COLUMNS}
+                row.update(encode_job(job))
+                row.update(county=county, posting_key=key, now=now,
+                           content_hash=section_hash(job['department'], job.get('full_description') or ''))
+                rows[key] = row
+
+        with self.connect() as conn:
+            previous, found_on = {}, {}
+            for key, content_hash, link in conn.execute(
+                    "SELECT posting_key, content_hash, ilea_link FROM postings WHERE closed_at IS NULL"):
+                previous[key] = content_hash
+                found_on[key] = source_page(link)
+            conn.executemany(UPSERT, [{key: row[key] for key in ('posting_key', 'content_hash', 'now') + JOB_COLUMNS}
+                                      for row in rows.values()])
+            # A posting from a page that was not read this run is still open as far as we know
+            closed = [key for key in previous if key not in rows and (pages is None or found_on[key] in pages)]
+            conn.executemany("UPDATE postings SET closed_at = ? WHERE posting_key = ?", [(now, key) for key in closed])
+
+            run = {
+                'ran_at': now,
+                'open': len(rows),
+                'added': sum(1 for key in rows if key not in previous),
+                'changed': sum(1 for key, row in rows.items() if key in previous and previous[key] != row['content_hash']),
+                'closed': len(closed),
+            }
+            cursor = conn.execute("INSERT INTO runs (ran_at, open, added, changed, closed) "
+                                  "VALUES (:ran_at, :open, :added, :changed, :closed)", run)
+            run['run_id'] = cursor.lastrowid
+        return run
+
+    def import_history(self, postings, runs):
+        """Merge postings with their own history columns and past runs in one transaction
+
+        postings are rows with posting_key, content_hash, the JOB_COLUMNS and the
+        HISTORY_COLUMNS (see backfill.Timeline); runs are runs table rows.
+        """
+        with self.connect() as conn:
+            conn.executemany(HISTORY_UPSERT, postings)
+            # Backfilling the same snapshots again adds no runs
+            conn.executemany("INSERT INTO runs (ran_at, open, added, changed, closed) "
+                             "SELECT :ran_at, :open, :added, :changed, :closed "
+                             "WHERE NOT EXISTS (SELECT 1 FROM runs WHERE ran_at = :ran_at)", runs)
+
+    def county_jobs(self):
+        """Return the open postings as JobPostings grouped by county, like process_job_data()"""
+        county_jobs = defaultdict(list)
+        with self.connect() as conn:
+            for row in conn.execute(f"SELECT {', '.join(JOB_COLUMNS)} FROM open_postings"):
+                county_jobs[row['county']].append(JobPosting(**decode_row(row)))
+        return county_jobs
+
+    def postings(self, county=None, department=None, closing_before=None, min_salary=None, pay_period='year',
+                 include_closed=False):
+        """Return postings with their history columns, optionally filtered
+
+        closing_before is a date or ISO date string; postings without a closing
+        date are left out when it is given. min_salary keeps the postings paying
+        up to at least that much per pay_period.
+        """
+        conditions, params = [], []
+        if not include_closed:
+            conditions.append("closed_at IS NULL")
+        if county is not None:
+            conditions.append("county = ?")
+            params.append(county)
+        if department is not None:
+            conditions.append("department = ?")
+            params.append(department)
+        if closing_before is not None:
+            conditions.append("closing_date < ?")
+            params.append(str(closing_before))
+        if min_salary is not None:
+            conditions.append("pay_period = ? AND salary_max >= ?")
+            params.extend([pay_period, min_salary])
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = (f"SELECT posting_key, {', '.join(JOB_COLUMNS + HISTORY_COLUMNS)} FROM postings{where} "
+                 "ORDER BY county, department")
+        with self.connect() as conn:
+            return [decode_row(row) for row in conn.execute(query, params)]
+
+    def changes_since(self, since):
+        """Return the postings added, changed and closed at or after an ISO timestamp"""
+        queries = {
+            'added': "first_seen >= :since",
+            'changed': "changed_at >= :since AND first_seen < :since",
+            'closed': "closed_at >= :since",
+        }
+        with self.connect() as conn:
+            return {
+                name: [decode_row(row) for row in conn.execute(
+                    f"SELECT posting_key, {', '.join(JOB_COLUMNS + HISTORY_COLUMNS)} FROM postings "
+                    f"WHERE {condition} ORDER BY county, department", {'since': since})]
+                for name, condition in queries.items()
+            }
+
+    def runs(self, limit=None):
+        """Return the recorded runs, most recent first (backfilled runs by when they ran)"""
+        query = "SELECT * FROM runs ORDER BY ran_at DESC, run_id DESC"
+        with self.connect() as conn:
+            rows = conn.execute(query + " LIMIT ?", (limit,)) if limit else conn.execute(query)
+            return [dict(row) for row in rows]
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for job postings
+Each description is cut into overlapping word shingles and summarized as a
+MinHash signature, hashing every shingle once (one-permutation hashing).
+Locality-sensitive hashing on bands of the signatures puts likely duplicates in
+the same hash bucket, so even a multi-year archive is clustered without
+comparing every pair of postings
+"""
+
+import zlib
+
+from search_index import tokenize
+
+SHINGLE_WORDS = 3
+
+# 128 bins in 16 bands of 8: a pair lands in a shared bucket with probability
+# 1 - (1 - s**8)**16, about 0.9 at similarity 0.8 and under 0.1 at 0.5
+NUM_BINS = 128
+BANDS = 16
+BIN_BITS = 7
+VALUE_BITS = 32 - BIN_BITS
+EMPTY_BIN = 1 << 62
+
+DEFAULT_THRESHOLD = 0.8
+
+# Fibonacci hashing spreads crc32's bits before the top bits pick the bin
+MIX = 0x9E3779B1
+
+
+def shingles(text):
+    """Return the set of SHINGLE_WORDS-word shingles of a text"""
+    words = tokenize(text)
+    if len(words) < SHINGLE_WORDS:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash_signature(text):
+    """Return a text's MinHash signature (a tuple of NUM_BINS ints), or None for an empty text
+
+    Each shingle is hashed once; the top bits choose a bin and each bin keeps its
+    smallest value. Empty bins borrow from the next filled bin to the right, offset
+    by the distance, so every bin of two signatures can be compared.
+    """
+    bins = [EMPTY_BIN] * NUM_BINS
+    for shingle in shingles(text):
+        hashed = (zlib.crc32(shingle.encode('utf-8')) * MIX) & 0xFFFFFFFF
+        index = hashed >> VALUE_BITS
+        value = hashed & ((1 << VALUE_BITS) - 1)
+        if value < bins[index]:
+            bins[index] = value
+    filled = [index for index, value in enumerate(bins) if value != EMPTY_BIN]
+    if not filled:
+        return None
+    if len(filled) < NUM_BINS:
+        bins = densify(bins, filled)
+    return tuple(bins)
+
+
+def densify(bins, filled):
+    """Fill each empty bin from the next filled bin to the right (wrapping around)"""
+    dense = list(bins)
+    following = filled[0] + NUM_BINS
+    for index in range(NUM_BINS - 1, -1, -1):
+        if bins[index] != EMPTY_BIN:
+            following = index
+        else:
+            distance = following - index
+            dense[index] = bins[following % NUM_BINS] + (distance << VALUE_BITS)
+    return dense
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of the shingles behind two signatures"""
+    return sum(1 for a, b in zip(signature, other) if a == b) / NUM_BINS
+
+
+def cluster_near_duplicates(texts, threshold=DEFAULT_THRESHOLD, groups=None, signatures=None):
+    """Group texts whose estimated similarity is at least threshold
+
+    Texts are only grouped with texts of the same group (for example the same
+    department) when groups is given. Precomputed signatures can be passed in to
+    skip hashing. Returns the clusters of two or more, each a sorted list of
+    indexes into texts, in order of their first index.
+
+    Each text is compared with the first text of every bucket it lands in, at most
+    BANDS comparisons, so the work grows linearly with the number of texts.
+    """
+    if signatures is None:
+        signatures = [minhash_signature(text) for text in texts]
+    rows = NUM_BINS // BANDS
+    parent = list(range(len(signatures)))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    buckets = {}
+    for index, signature in enumerate(signatures):
+        if signature is None:
+            continue
+        group = groups[index] if groups is not None else None
+        for band in range(BANDS):
+            key = (group, band, signature[band * rows:(band + 1) * rows])
+            first = buckets.setdefault(key, index)
+            if first == index:
+                continue
+            root, first_root = find(index), find(first)
+            if root != first_root and similarity(signature, signatures[first]) >= threshold:
+                parent[max(root, first_root)] = min(root, first_root)
+
+    clusters = {}
+    for index in range(len(signatures)):
+        clusters.setdefault(find(index), []).append(index)
+    return [members for _, members in sorted(clusters.items()) if len(members) > 1]
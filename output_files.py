@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Output files for the Indiana Police Jobs Scraper
+Every output is written to a temporary file beside it and renamed over the old
+one only once complete, so a web server never serves a half-written page. The
+output state remembers what each output was built from, so outputs whose
+postings have not changed are left alone
+"""
+
+import json
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_path(path):
+    """Yield a temporary path to write to; it replaces path if the block succeeds"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        yield tmp_path
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def atomic_open(path, mode='w', **kwargs):
+    """Open a temporary file for writing; it replaces path once written without error"""
+    with atomic_path(path) as tmp_path:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+            # On disk before the rename, so a crash cannot leave an empty output behind
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class OutputState:
+    """The digest of the inputs each output file was last written from"""
+
+    def __init__(self, digests=None):
+        self.digests = digests or {}
+
+    @classmethod
+    def load(cls, path):
+        """Load the digests saved by the previous run, or start empty"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f).get('outputs', {}))
+
+    def is_current(self, filename, digest):
+        """Return True if the file exists and was written from inputs with this digest"""
+        return self.digests.get(filename) == digest and os.path.exists(filename)
+
+    def record(self, filename, digest):
+        """Remember the digest of the inputs a file was just written from"""
+        self.digests[filename] = digest
+
+    def save(self, path):
+        """Save the digests for the next run"""
+        with atomic_open(path, 'w', encoding='utf-8') as f:
+            json.dump({'outputs': self.digests}, f, indent=2)
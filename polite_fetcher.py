@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Concurrent, polite page fetching for the scraper's job sources
+A bounded thread pool fetches every source at once over one pooled
+requests.Session; each host gets a cap on requests in flight and a minimum gap
+between them, and failed requests are retried with exponential backoff.
+AsyncPoliteFetcher does the same on an asyncio event loop with httpx
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+DEFAULT_MAX_WORKERS = 32
+
+# Connections on an event loop cost no threads, so the async client allows more
+ASYNC_MAX_CONNECTIONS = 128
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Longest wait before a retry, whatever the backoff or a server's Retry-After asks for
+MAX_BACKOFF = 60
+
+# What the async fetcher returns for each page
+FetchResult = namedtuple('FetchResult', ['url', 'content', 'content_hash', 'from_cache'])
+
+
+def retry_after_seconds(value):
+    """Seconds asked for by a Retry-After header (delay-seconds or HTTP-date), or None"""
+    value = (value or '').strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        until = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if until.tzinfo is None:
+        until = until.replace(tzinfo=timezone.utc)
+    return max(0.0, (until - datetime.now(timezone.utc)).total_seconds())
+
+
+class HostLimiter:
+    """Limit requests per host: at most per_host in flight, min_interval seconds apart"""
+
+    def __init__(self, per_host=1, min_interval=1.0):
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_start = defaultdict(float)
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[host]
+
+    @contextmanager
+    def acquire(self, url):
+        """Wait for a free slot and the host's next allowed start time"""
+        host = urlsplit(url).netloc.lower()
+        with self._slot(host):
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start[host])
+                self._next_start[host] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+class PoliteFetcher:
+    """Fetch many URLs concurrently with per-host limits and retries"""
+
+    def __init__(self, session, max_workers=DEFAULT_MAX_WORKERS, per_host=1, min_interval=1.0,
+                 retries=3, backoff=0.5, max_backoff=MAX_BACKOFF, timeout=30):
+        self.session = session
+        self.max_workers = max_workers
+        self.limiter = HostLimiter(per_host, min_interval)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+
+    def fetch(self, url):
+        """GET a URL, retrying connection errors, timeouts and RETRY_STATUSES
+
+        Returns the response, or raises the last error (HTTPError for a failing
+        status) once the retries are used up.
+        """
+        import requests
+
+        for attempt in range(self.retries + 1):
+            try:
+                with self.limiter.acquire(url):
+                    response = self.session.get(url, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                delay = self.retry_delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    response.raise_for_status()
+                    return response
+                delay = self.retry_delay(attempt, response)
+            time.sleep(delay)
+
+    def retry_delay(self, attempt, response=None):
+        """Seconds to wait before a retry: Retry-After if given, else jittered backoff, at most max_backoff"""
+        delay = retry_after_seconds(response.headers.get('Retry-After')) if response is not None else None
+        if delay is None:
+            delay = self.backoff * (2 ** attempt) * (1 + random.random() / 4)
+        return min(delay, self.max_backoff)
+
+    def fetch_all(self, urls):
+        """Fetch URLs concurrently, returning {url: response or exception} in input order"""
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as pool:
+            futures = {url: pool.submit(self.fetch, url) for url in urls}
+
+        results = {}
+        for url, future in futures.items():
+            try:
+                results[url] = future.result()
+            except Exception as e:
+                results[url] = e
+        return results
+
+
+class AsyncHostLimiter:
+    """asyncio version of HostLimiter, for use within a single event loop"""
+
+    def __init__(self, per_host=1, min_interval=1.0):
+        self.per_host = per_host
+        self.min_interval = min_interval
+        self._slots = {}
+        self._next_start = defaultdict(float)
+
+    @asynccontextmanager
+    async def acquire(self, url):
+        """Wait for a free slot and the host's next allowed start time"""
+        host = urlsplit(url).netloc.lower()
+        slot = self._slots.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with slot:
+            now = time.monotonic()
+            start = max(now, self._next_start[host])
+            self._next_start[host] = start + self.min_interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+
+class AsyncPoliteFetcher:
+    """asyncio counterpart of PoliteFetcher, built on httpx.AsyncClient
+
+    Uses the limits, retry settings and request headers of a PoliteFetcher, and
+    revalidates against the HTTP cache like CachingAdapter does. Without httpx
+    installed (pip install httpx) each fetch runs the PoliteFetcher in a thread pool.
+    """
+
+    def __init__(self, fetcher, cache=None, max_connections=ASYNC_MAX_CONNECTIONS):
+        self.fetcher = fetcher
+        self.cache = cache
+        self.max_connections = max_connections
+        self.limiter = None
+        try:
+            import httpx
+            self._httpx = httpx
+        except ImportError:
+            self._httpx = None
+
+    @asynccontextmanager
+    async def open(self):
+        """Open a pooled client for a batch of fetches
+
+        Without httpx the "client" is a thread pool sized like the PoliteFetcher's.
+        """
+        # Semaphores belong to one event loop, so each batch gets a fresh limiter
+        self.limiter = AsyncHostLimiter(self.fetcher.limiter.per_host, self.fetcher.limiter.min_interval)
+        if self._httpx is None:
+            with ThreadPoolExecutor(max_workers=self.fetcher.max_workers) as pool:
+                yield pool
+            return
+
+        limits = self._httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+        async with self._httpx.AsyncClient(headers=dict(self.fetcher.session.headers), limits=limits,
+                                           timeout=self.fetcher.timeout, follow_redirects=True) as client:
+            yield client
+
+    async def fetch(self, client, url):
+        """Fetch a URL with retries and cache revalidation, returning a FetchResult"""
+        if self._httpx is None:
+            response = await asyncio.get_running_loop().run_in_executor(client, self.fetcher.fetch, url)
+            return FetchResult(url, response.content, getattr(response, 'content_hash', None),
+                               getattr(response, 'from_cache', False))
+
+        entry = self.cache.load(url) if self.cache is not None else None
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        for attempt in range(self.fetcher.retries + 1):
+            try:
+                async with self.limiter.acquire(url):
+                    response = await client.get(url, headers=headers)
+            except self._httpx.TransportError:
+                if attempt == self.fetcher.retries:
+                    raise
+                delay = self.fetcher.retry_delay(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.fetcher.retries:
+                    return self.finish(url, response, entry)
+                delay = self.fetcher.retry_delay(attempt, response)
+            await asyncio.sleep(delay)
+
+    def finish(self, url, response, entry):
+        """Turn a final response into a FetchResult, serving the cached body on 304"""
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url)
+            return FetchResult(url, self.cache.read_body(url), entry['content_hash'], True)
+
+        response.raise_for_status()
+        content_hash = None
+        if self.cache is not None:
+            content_hash = self.cache.store(url, response.content, etag=response.headers.get('ETag'),
+                                            last_modified=response.headers.get('Last-Modified'))
+        return FetchResult(url, response.content, content_hash, False)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Incremental scrape state for the Indiana Police Jobs Scraper
+Remembers a hash of every bulletin section, the job record extracted from it
+and the fields derived from that record later (pay and shift details, county),
+so unchanged postings are reused instead of re-extracted on the next run
+"""
+
+import hashlib
+import json
+import os
+from datetime import date, datetime
+
+from job_posting import JobPosting
+
+
+def posting_key(anchor_id, department):
+    """Stable key for a posting: its anchor plus the Hiring: link text"""
+    return f"{anchor_id}|{department}"
+
+
+def section_hash(department, description):
+    """Hash of everything a job record is extracted from"""
+    return hashlib.sha256(f"{department}\0{description}".encode('utf-8')).hexdigest()
+
+
+def source_page(link):
+    """URL of the page a posting was read from: its link without the #anchor"""
+    return (link or '').partition('#')[0] or None
+
+
+def encode_job(job):
+    """Copy a job record into JSON-safe form (dates become ISO strings)"""
+    return {key: value.isoformat() if isinstance(value, date) else value for key, value in job.items()}
+
+
+def decode_job(job):
+    """Copy a stored job record, restoring the closing date to a date"""
+    job = dict(job)
+    if job.get('closing_date'):
+        job['closing_date'] = date.fromisoformat(job['closing_date'])
+    return job
+
+
+class PostingState:
+    """Section hashes and job records from the previous run, plus this run's"""
+
+    def __init__(self, postings=None):
+        self.previous = postings or {}
+        self.current = {}
+
+    @classmethod
+    def load(cls, path):
+        """Load the state saved by the previous run, or start empty"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f).get('postings', {}))
+
+    def lookup(self, key, digest):
+        """Return the previous record as a JobPosting if its section is unchanged"""
+        entry = self.previous.get(key)
+        if entry is not None and entry['section_hash'] == digest:
+            return JobPosting.from_dict(decode_job(entry['job']))
+        return None
+
+    def first_seen(self, key):
+        """Return the date a posting was first seen, if it was seen before"""
+        entry = self.previous.get(key)
+        return entry['job'].get('date_posted') if entry else None
+
+    def record(self, key, digest, job):
+        """Remember the record extracted for a section in this run"""
+        self.current[key] = {'section_hash': digest, 'job': encode_job(job)}
+
+    def derived(self, key):
+        """Return the fields derived from a posting last run ('details', 'county') if its section is unchanged"""
+        entry, current = self.previous.get(key), self.current.get(key)
+        if entry is not None and current is not None and entry['section_hash'] == current['section_hash']:
+            return entry.get('derived', {})
+        return {}
+
+    def record_derived(self, key, **fields):
+        """Remember fields derived from a posting recorded this run, for the next run"""
+        entry = self.current.get(key)
+        if entry is not None:
+            entry.setdefault('derived', {}).update(fields)
+
+    def carry_forward(self, pages):
+        """Keep the previous records of postings read from pages other than these
+
+        pages is the URLs read this run when a source failed to fetch; the
+        postings of that source are not removed, and keep their first-seen date.
+        """
+        for key, entry in self.previous.items():
+            if key not in self.current and source_page(entry['job'].get('ilea_link')) not in pages:
+                self.current[key] = entry
+
+    def diff(self):
+        """Return the added, removed and changed postings since the previous run"""
+        def summary(entry):
+            job = entry['job']
+            return {
+                'department': job['department'],
+                'anchor_id': job['anchor_id'],
+                'ilea_link': job.get('ilea_link'),
+                'date_posted': job.get('date_posted'),
+            }
+
+        added = [summary(entry) for key, entry in self.current.items() if key not in self.previous]
+        removed = [summary(entry) for key, entry in self.previous.items() if key not in self.current]
+        changed = [
+            summary(entry) for key, entry in self.current.items()
+            if key in self.previous and self.previous[key]['section_hash'] != entry['section_hash']
+        ]
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'added': added,
+            'removed': removed,
+            'changed': changed,
+        }
+
+    def save(self, path):
+        """Save this run's postings as the baseline for the next run"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'postings': self.current}, f, indent=2)
+        os.replace(tmp_path, path)
+        self.previous, self.current = self.current, {}
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Run metrics for the Indiana Police Jobs Scraper
+Times each pipeline stage and counts what went through it (bytes fetched, jobs
+extracted, postings without a county, bytes rendered). A run's metrics are
+saved as a JSON report and as a Prometheus textfile for node_exporter, so slow
+or failing runs can be graphed and alerted on. Optional profiling adds cProfile's
+slowest functions or tracemalloc's memory peaks to the report
+"""
+
+import cProfile
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from output_files import atomic_open
+
+PROMETHEUS_PREFIX = 'ilea_jobs'
+
+# Counters with their Prometheus help text; other names get a generic one
+COUNTER_HELP = {
+    'pages_fetched': 'Source pages fetched',
+    'pages_not_modified': 'Source pages answered from the HTTP cache (HTTP 304)',
+    'fetch_bytes': 'Bytes of source page bodies fetched',
+    'jobs_extracted': 'Postings parsed from the source pages',
+    'duplicates_merged': 'Near-duplicate postings merged away',
+    'unresolved_counties': 'Postings no county could be found for (left off the outputs)',
+    'jobs_mapped': 'Postings in the outputs',
+    'counties': 'Counties with postings',
+    'outputs_written': 'Output files written',
+    'outputs_unchanged': 'Output files left alone because their postings were unchanged',
+}
+
+PROFILE_MODES = ('cpu', 'memory')
+PROFILE_TOP = 25
+
+
+class RunMetrics:
+    """Stage timers and counters for one run
+
+    profile is None, 'cpu' (cProfile of the thread calling start()) or 'memory'
+    (tracemalloc peak per stage; stages running at once share one peak).
+    Stages may be timed from several threads; the same stage timed more than
+    once adds up.
+    """
+
+    def __init__(self, profile=None):
+        if profile not in (None,) + PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {profile!r} (expected one of {', '.join(PROFILE_MODES)})")
+        self.profile = profile
+        self.stages = {}
+        # Every known counter is reported, zero or not, so alerts always have a series
+        self.counters = dict.fromkeys(COUNTER_HELP, 0)
+        self.output_bytes = {}
+        self.started_at = None
+        self.seconds = None
+        self.profiler = None
+        self.top_functions = []
+        self.top_allocations = []
+        self.memory_peak = None
+        # Whether start() turned tracemalloc on, and so finish() should turn it off
+        self.started_tracing = False
+        self.lock = threading.Lock()
+        self.started = None
+
+    def start(self):
+        """Start timing the run (and profiling, if enabled)"""
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+        if self.profile == 'cpu':
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        elif self.profile == 'memory' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
+    def finish(self):
+        """Stop timing the run and collect the profiles"""
+        if self.started is None or self.seconds is not None:
+            return
+        self.seconds = time.perf_counter() - self.started
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.top_functions = top_functions(self.profiler)
+        elif self.profile == 'memory' and tracemalloc.is_tracing():
+            # Each stage resets the peak, so the run's peak is the highest of theirs
+            self.memory_peak = max([tracemalloc.get_traced_memory()[1]] +
+                                   [stage.get('memory_peak_bytes', 0) for stage in self.stages.values()])
+            snapshot = tracemalloc.take_snapshot()
+            self.top_allocations = [
+                {'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                 'bytes': stat.size, 'blocks': stat.count}
+                for stat in snapshot.statistics('lineno')[:PROFILE_TOP]
+            ]
+            if self.started_tracing:
+                tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block as the named stage"""
+        tracing = self.profile == 'memory' and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            with self.lock:
+                stage = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+                stage['seconds'] += seconds
+                stage['calls'] += 1
+                if tracing:
+                    stage['memory_peak_bytes'] = max(stage.get('memory_peak_bytes', 0),
+                                                     tracemalloc.get_traced_memory()[1])
+
+    def timed(self, name, func, *args):
+        """Call func(*args) as the named stage and return its result (for executors)"""
+        with self.stage(name):
+            return func(*args)
+
+    def add(self, name, value=1):
+        """Add to a counter"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_output(self, filename, size):
+        """Record the size of an output file just written"""
+        with self.lock:
+            self.output_bytes[filename] = size
+            self.counters['outputs_written'] += 1
+
+    def report(self):
+        """Return the run's metrics as a JSON-serializable dict"""
+        report = {
+            'started_at': self.started_at.isoformat(timespec='seconds') if self.started_at else None,
+            'seconds': round(self.seconds, 6) if self.seconds is not None else None,
+            'stages': {name: {key: round(value, 6) if isinstance(value, float) else value
+                              for key, value in stage.items()}
+                       for name, stage in self.stages.items()},
+            'counters': dict(self.counters),
+            'output_bytes': dict(self.output_bytes),
+        }
+        if self.profile == 'cpu':
+            report['profile'] = {'mode': 'cpu', 'top_functions': self.top_functions}
+        elif self.profile == 'memory':
+            report['profile'] = {'mode': 'memory', 'peak_bytes': self.memory_peak,
+                                 'top_allocations': self.top_allocations}
+        return report
+
+    def save_report(self, path):
+        """Write the JSON run report"""
+        with atomic_open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def save_profile(self, path):
+        """Write the raw cProfile stats (for pstats or snakeviz); only with profile='cpu'"""
+        if self.profiler is not None:
+            self.profiler.dump_stats(path)
+
+    def prometheus_text(self):
+        """Return the metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def metric(name, help_text, samples):
+            name = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{escape_label(label)}"' for key, label in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+
+        if self.started_at is not None:
+            metric('last_run_timestamp_seconds', 'Unix time the last completed run started',
+                   [({}, int(self.started_at.timestamp()))])
+        if self.seconds is not None:
+            metric('run_seconds', 'Wall time of the last run', [({}, f"{self.seconds:.6f}")])
+        metric('stage_seconds', 'Wall time spent in each stage of the last run (summed over threads)',
+               [({'stage': name}, f"{stage['seconds']:.6f}") for name, stage in self.stages.items()])
+        peaks = [({'stage': name}, stage['memory_peak_bytes'])
+                 for name, stage in self.stages.items() if 'memory_peak_bytes' in stage]
+        if peaks:
+            metric('stage_memory_peak_bytes', 'Peak traced memory during each stage of the last run', peaks)
+        if self.memory_peak is not None:
+            metric('memory_peak_bytes', 'Peak traced memory of the last run', [({}, self.memory_peak)])
+        for name, value in self.counters.items():
+            metric(name, COUNTER_HELP.get(name, f"{name.replace('_', ' ').capitalize()} in the last run"),
+                   [({}, value)])
+        if self.output_bytes:
+            metric('output_bytes', 'Size of each output file written by the last run',
+                   [({'file': filename}, size) for filename, size in self.output_bytes.items()])
+        return '\n'.join(lines) + '\n'
+
+    def save_prometheus(self, path):
+        """Write the Prometheus textfile (renamed into place, as node_exporter expects)"""
+        with atomic_open(path, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus_text())
+
+
+def escape_label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def top_functions(profiler, limit=PROFILE_TOP):
+    """Return the functions with the most cumulative time in a cProfile run"""
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, lineno, function), (calls, primitive, total, cumulative, _) in stats.stats.items():
+        rows.append({
+            'function': f"{filename}:{lineno}({function})",
+            'calls': calls,
+            'total_seconds': round(total, 6),
+            'cumulative_seconds': round(cumulative, 6),
+        })
+    rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+    return rows[:limit]
@@ -1,30 +1,44 @@
 #!/usr/bin/env python3
 """
-Simple launcher for the Indiana Police Jobs Scraper
+Simple launcher and command line for the Indiana Police Jobs Scraper
+Without a command it scrapes the bulletin and writes every output. The commands
+work step by step through a job store: fetch records the postings (backfill
+replays saved copies of the bulletin), and export-csv, render-map, render-table
+and stats read them back. Each command imports only what it needs, so stats
+never loads requests, BeautifulSoup or folium
 """
 
+import argparse
 import os
 import sys
-import webbrowser
-from indiana_police_jobs_scraper import IndianaPoliceJobsScraper
 
-def main():
+DEFAULT_STORE_PATH = 'indiana_police_jobs.db'
+
+# lxml and selectolax repair broken markup as a browser does; html.parser keeps it as written
+PARSER_HELP = ("HTML parser backend (html.parser, lxml or selectolax); they agree on well-formed pages, "
+               "but lxml and selectolax repair malformed markup as a browser would")
+
+# Packages the full run needs (importing them here would cost more than the check)
+REQUIRED_PACKAGES = ('requests', 'folium', 'bs4')
+
+
+def launch():
+    """Scrape the bulletin, write every output and offer to open the map"""
+    from importlib.util import find_spec
+
     print("=" * 60)
     print("Indiana Police Jobs Scraper and Mapper")
     print("=" * 60)
     print()
-    
+
     # Check if required packages are installed
-    try:
-        import requests
-        import folium
-        from bs4 import BeautifulSoup
-        print("✓ All required packages are installed")
-    except ImportError as e:
-        print(f"✗ Missing required package: {e}")
+    missing = [name for name in REQUIRED_PACKAGES if find_spec(name) is None]
+    if missing:
+        print(f"✗ Missing required package: {', '.join(missing)}")
         print("Please run: pip install requests beautifulsoup4 folium lxml")
         return
-    
+    print("✓ All required packages are installed")
+
     print()
     print("Starting the scraper...")
     print("This will:")
@@ -32,54 +46,197 @@ def main():
     print("2. Create an interactive map showing job locations")
     print("3. Save data to CSV file")
     print()
-    
+
     try:
+        from indiana_police_jobs_scraper import IndianaPoliceJobsScraper
+
         # Run the scraper
         scraper = IndianaPoliceJobsScraper()
         map_obj, county_jobs = scraper.run()
-        
+
         print()
         print("=" * 60)
         print("SCRAPER COMPLETED SUCCESSFULLY!")
         print("=" * 60)
-        
+
         # Check if files were created
         map_file = 'indiana_police_jobs_map.html'
         csv_file = 'indiana_police_jobs.csv'
-        
+
         if os.path.exists(map_file):
             print(f"✓ Interactive map created: {map_file}")
             print(f"  File size: {os.path.getsize(map_file)} bytes")
         else:
             print(f"✗ Map file not found: {map_file}")
-        
+
         if os.path.exists(csv_file):
             print(f"✓ Job data saved: {csv_file}")
             print(f"  File size: {os.path.getsize(csv_file)} bytes")
         else:
             print(f"✗ CSV file not found: {csv_file}")
-        
+
         print()
         print("To view the interactive map:")
         print(f"1. Open {map_file} in your web browser")
         print("2. Or run this command to open it automatically:")
         print(f"   start {map_file}")
-        
-        # Ask if user wants to open the map
-        try:
-            response = input("\nWould you like to open the map in your browser now? (y/n): ").lower().strip()
-            if response in ['y', 'yes']:
-                print("Opening map in browser...")
-                webbrowser.open(f'file://{os.path.abspath(map_file)}')
-        except KeyboardInterrupt:
-            print("\nMap opening cancelled.")
-        
+
+        # Ask if user wants to open the map (not when run from cron or a service)
+        if sys.stdin.isatty():
+            try:
+                response = input("\nWould you like to open the map in your browser now? (y/n): ").lower().strip()
+                if response in ['y', 'yes']:
+                    import webbrowser
+                    print("Opening map in browser...")
+                    webbrowser.open(f'file://{os.path.abspath(map_file)}')
+            except KeyboardInterrupt:
+                print("\nMap opening cancelled.")
+
         print()
         print("Thank you for using the Indiana Police Jobs Scraper!")
-        
+
     except Exception as e:
         print(f"Error running scraper: {e}")
         print("Please check your internet connection and try again.")
 
+
+def open_store(path):
+    """Open an existing job store, or exit with a hint to run fetch first"""
+    from job_store import JobStore
+
+    if not os.path.exists(path):
+        raise SystemExit(f"No job store at {path}; run 'python run_scraper.py fetch' first")
+    return JobStore(path)
+
+
+def stored_scraper(args, **options):
+    """Return a scraper for rendering and the open postings from the job store"""
+    from indiana_police_jobs_scraper import IndianaPoliceJobsScraper
+
+    county_jobs = open_store(args.store).county_jobs()
+    return IndianaPoliceJobsScraper(**options), county_jobs
+
+
+def fetch(args):
+    """Scrape the bulletin and record the postings in the job store"""
+    from indiana_police_jobs_scraper import IndianaPoliceJobsScraper
+
+    scraper = IndianaPoliceJobsScraper(parser_backend=args.parser, cache_dir=args.cache_dir, store_path=args.store,
+                                       sample_fallback=False, verbose=False)
+    scraper.start_metrics()
+    scraper.scrape_postings()
+    run = scraper.last_store_run
+    print(f"{run['open']} open postings in {args.store}: {run['added']} added, {run['changed']} changed, "
+          f"{run['closed']} closed")
+
+
+def backfill(args):
+    """Replay saved bulletin snapshots into the job store"""
+    from backfill import backfill
+    from job_store import JobStore
+
+    if not os.path.exists(args.snapshots):
+        raise SystemExit(f"No bulletin snapshots at {args.snapshots}")
+    try:
+        summary = backfill(args.snapshots, JobStore(args.store), workers=args.workers, chunk_size=args.chunk_size,
+                           parser_backend=args.parser)
+    except ValueError as e:
+        raise SystemExit(e)
+    print(f"{summary['postings']} postings from {summary['snapshots'] - summary['skipped']} snapshot(s) "
+          f"backfilled into {args.store} in {summary['seconds']:.1f}s ({summary['skipped']} skipped)")
+
+
+def export_csv(args):
+    """Write the job store's open postings to CSV"""
+    scraper, county_jobs = stored_scraper(args)
+    scraper.save_data_to_csv(county_jobs, args.output)
+
+
+def render_map(args):
+    """Render the interactive map from the job store's open postings"""
+    scraper, county_jobs = stored_scraper(args, client_side=args.client_side, cluster_markers=args.cluster_markers,
+                                          choropleth=args.choropleth)
+    scraper.map_filename = args.output
+    if args.client_side:
+        # The map loads the data file by name, so it goes in the map's directory
+        scraper.data_filename = os.path.join(os.path.dirname(args.output), os.path.basename(scraper.data_filename))
+        scraper.save_jobs_data(county_jobs)
+    scraper.save_map(scraper.create_interactive_map(county_jobs))
+
+
+def render_table(args):
+    """Render the jobs table from the job store's open postings"""
+    scraper, county_jobs = stored_scraper(args)
+    scraper.table_filename = args.output
+    scraper.save_jobs_table(county_jobs)
+
+
+def stats(args):
+    """Print open postings per county, pay and recent runs from the job store"""
+    from statistics import median
+
+    store = open_store(args.store)
+    county_jobs = store.county_jobs()
+    total = sum(len(jobs) for jobs in county_jobs.values())
+    print(f"{total} open postings in {len(county_jobs)} counties")
+    print()
+    print(f"{'county':<16} {'open':>5} {'median top pay':>15}")
+    for county, jobs in sorted(county_jobs.items(), key=lambda item: (-len(item[1]), item[0])):
+        pay = [job['salary_max'] for job in jobs if job.get('pay_period') == 'year' and job.get('salary_max')]
+        median_pay = f"${median(pay):,.0f}" if pay else '-'
+        print(f"{county:<16} {len(jobs):>5} {median_pay:>15}")
+
+    runs = store.runs(limit=args.runs)
+    if runs:
+        print()
+        print(f"{'run':<20} {'open':>5} {'added':>6} {'changed':>8} {'closed':>7}")
+        for run in runs:
+            print(f"{run['ran_at']:<20} {run['open']:>5} {run['added']:>6} {run['changed']:>8} {run['closed']:>7}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scrape ILEA law enforcement job postings and map them by county")
+    commands = parser.add_subparsers(dest='command', metavar='command')
+
+    def command(name, func, help_text):
+        subparser = commands.add_parser(name, help=help_text, description=help_text)
+        subparser.add_argument('--store', default=DEFAULT_STORE_PATH, help="SQLite job store")
+        subparser.set_defaults(func=func)
+        return subparser
+
+    subparser = command('fetch', fetch, "Scrape the bulletin into the job store")
+    subparser.add_argument('--cache-dir', default='.http_cache', help="HTTP cache for conditional requests")
+    subparser.add_argument('--parser', default='html.parser', help=PARSER_HELP)
+
+    subparser = command('backfill', backfill, "Replay saved bulletin snapshots into the job store")
+    subparser.add_argument('snapshots', help="Directory or .zip of saved bulletin pages (.html, .htm, .html.gz)")
+    subparser.add_argument('--workers', type=int, help="Worker processes (default: one per core)")
+    subparser.add_argument('--chunk-size', type=int, help="Snapshots per unit of work")
+    subparser.add_argument('--parser', default='html.parser', help=PARSER_HELP)
+
+    subparser = command('export-csv', export_csv, "Write the open postings to CSV")
+    subparser.add_argument('--output', default='indiana_police_jobs.csv', help="CSV file to write")
+
+    subparser = command('render-map', render_map, "Render the interactive map")
+    subparser.add_argument('--output', default='indiana_police_jobs_map.html', help="Map file to write")
+    subparser.add_argument('--client-side', action='store_true', help="Render markers and popups in the browser")
+    subparser.add_argument('--cluster-markers', action='store_true', help="One clustered marker per posting")
+    subparser.add_argument('--choropleth', action='store_true', help="Fill counties by job count")
+
+    subparser = command('render-table', render_table, "Render the jobs table")
+    subparser.add_argument('--output', default='indiana_police_jobs_table.html', help="Table file to write")
+
+    subparser = command('stats', stats, "Summarize the open postings and recent runs")
+    subparser.add_argument('--runs', type=int, default=5, help="Number of recent runs to list")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        launch()
+    else:
+        args.func(args)
+
 if __name__ == "__main__":
     main()
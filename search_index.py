@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Prefix search index for the side panel's job search
+Built when the page is generated: every word of a job's department, county and
+details is listed once in a sorted token table with the jobs that contain it, so
+the browser finds the jobs for a typed prefix by binary search instead of
+scanning every job in the list
+"""
+
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from itertools import accumulate, islice
+
+SEARCH_FIELDS = ('department', 'county', 'details')
+
+# The side panel's JavaScript splits the typed query with the same pattern
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text):
+    """Return the lowercase words of a string"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def build_search_index(jobs):
+    """Index jobs by position in the list
+
+    Returns {'tokens': [sorted words], 'postings': [[job position gaps], ...]};
+    each posting list holds the positions of the jobs containing that word,
+    stored as the gap from the previous position to keep the page small.
+    """
+    postings = defaultdict(list)
+    for position, job in enumerate(jobs):
+        words = set()
+        for field in SEARCH_FIELDS:
+            words.update(tokenize(job.get(field) or ''))
+        for word in words:
+            postings[word].append(position)
+
+    tokens = sorted(postings)
+    return {
+        'tokens': tokens,
+        'postings': [[position - previous for previous, position in zip([0] + positions, positions)]
+                     for positions in (postings[token] for token in tokens)],
+    }
+
+
+def search(index, query):
+    """Return the positions of the jobs matching every word of query as a prefix
+
+    The same lookup the side panel runs in the browser.
+    """
+    matches = None
+    for word in tokenize(query):
+        found = set()
+        start = bisect_left(index['tokens'], word)
+        for token, gaps in zip(islice(index['tokens'], start, None), islice(index['postings'], start, None)):
+            if not token.startswith(word):
+                break
+            found.update(accumulate(gaps))
+        matches = found if matches is None else matches & found
+    return matches
@@ -0,0 +1,6 @@
+        function escapeHtml(text) {
+            return String(text == null ? '' : text).replace(/[&<>"']/g, function (c) {
+                return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c];
+            });
+        }
+
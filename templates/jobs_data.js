@@ -0,0 +1,40 @@
+        // Shared by the client-side map and table: load the jobs payload written by
+        // client_map.write_payload() and unpack its rows into job objects
+{% include 'escape_html.js' %}
+        function loadJobsData(url) {
+            return fetch(url).then(function (response) {
+                if (!response.ok) {
+                    throw new Error(url + ': HTTP ' + response.status);
+                }
+                return response.arrayBuffer();
+            }).then(function (buffer) {
+                // A .gz payload may arrive still compressed or already decoded by the server
+                var bytes = new Uint8Array(buffer);
+                if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+                    return new Response(new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'))).json();
+                }
+                return JSON.parse(new TextDecoder().decode(bytes));
+            }).then(unpackJobsData);
+        }
+
+        function unpackJobsData(payload) {
+            var departments = payload.departments.map(function (row) {
+                return {name: row[0], badge: row[1], website: row[2], fast_facts: row[3]};
+            });
+            var counties = payload.counties.map(function (row) {
+                return {name: row[0], lat: row[1], lon: row[2], jobs: []};
+            });
+            var jobs = payload.jobs.map(function (row) {
+                var job = {};
+                payload.fields.forEach(function (field, i) {
+                    job[field] = row[i];
+                });
+                var county = counties[job.county];
+                job.info = departments[job.department];
+                job.department = job.info.name;
+                job.county = county.name;
+                county.jobs.push(job);
+                return job;
+            });
+            return {updated: payload.updated, counties: counties, jobs: jobs, search: payload.search};
+        }
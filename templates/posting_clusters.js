@@ -0,0 +1,5 @@
+(function (map) {
+{% include 'jobs_data.js' %}
+{% include 'posting_markers.js' %}
+            addPostingClusters(map, unpackJobsData({{ payload|tojson }}));
+        })
@@ -0,0 +1,41 @@
+        // One marker per posting, grouped into clusters; needs escapeHtml() and Leaflet.markercluster
+        function postingPopupHtml(job, updated) {
+            var html = '<div style="width: 350px;">'
+                + '<div style="display: flex; align-items: center; margin-bottom: 5px;">'
+                + '<span style="font-size: 18px; margin-right: 8px;">' + escapeHtml(job.info.badge) + '</span>'
+                + '<strong>' + escapeHtml(job.department) + '</strong></div>'
+                + '<em>' + escapeHtml(job.location) + '</em> (' + escapeHtml(job.county) + ' County)<br>'
+                + '<small style="color: #666; font-style: italic;">' + escapeHtml(job.info.fast_facts) + '</small><br>'
+                + escapeHtml((job.details || '').slice(0, 200)) + '...<br>'
+                + '<small>Posted: ' + escapeHtml(job.date_posted) + '</small>';
+            if (job.closing_date) {
+                html += '<br><small style="color: red;">Closing: ' + escapeHtml(job.closing_date) + '</small>';
+            }
+            html += '<br><a href="' + escapeHtml(job.ilea_link) + '" target="_blank" style="color: #007bff; text-decoration: underline;">View Full Posting →</a>';
+            if (job.info.website) {
+                html += '<br><a href="' + escapeHtml(job.info.website) + '" target="_blank" style="color: #28a745; text-decoration: underline; font-size: 12px;">🌐 Department Website</a>';
+            }
+            return html + '<p style="font-size: 11px; color: #666; margin: 5px 0;">📅 Last updated: ' + escapeHtml(updated) + '</p></div>';
+        }
+
+        function addPostingClusters(map, data) {
+            // The cluster group only draws markers inside the current view, and a popup's
+            // HTML is built the first time that marker is opened
+            var cluster = L.markerClusterGroup({chunkedLoading: true});
+            var markers = [];
+            data.jobs.forEach(function (job) {
+                if (job.lat === null) return;
+                markers.push(L.circleMarker([job.lat, job.lon], {
+                    radius: 7,
+                    color: 'black',
+                    weight: 1,
+                    fillColor: '#007bff',
+                    fillOpacity: 0.8
+                }).bindPopup(function () {
+                    return postingPopupHtml(job, data.updated);
+                }, {maxWidth: 400}));
+            });
+            cluster.addLayers(markers);
+            cluster.addTo(map);
+            return cluster;
+        }
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the Indiana Police Jobs Scraper
+Runs the scraper on a schedule until stopped (Ctrl+C or SIGTERM). Each poll
+fetches the bulletin with conditional requests, and only the outputs whose
+postings changed are rewritten, each through a temporary file, so a web server
+can serve the output directory while it runs
+"""
+
+import argparse
+import random
+import signal
+import threading
+import time
+from datetime import datetime
+
+from async_scraper import AsyncIndianaPoliceJobsScraper
+from indiana_police_jobs_scraper import IndianaPoliceJobsScraper
+from run_metrics import PROFILE_MODES
+
+DEFAULT_INTERVAL = 3600
+# Each wait is the interval plus or minus up to this fraction of it, so several
+# watchers never poll the site in step
+DEFAULT_JITTER = 0.1
+DEFAULT_OUTPUT_STATE_PATH = 'output_state.json'
+
+
+def next_delay(interval, jitter=DEFAULT_JITTER, rng=random):
+    """Seconds to wait before the next run: interval with random jitter"""
+    return max(0.0, interval * (1 + rng.uniform(-jitter, jitter)))
+
+
+class Watcher:
+    """Runs a scraper every interval seconds until stopped"""
+
+    def __init__(self, scraper, interval=DEFAULT_INTERVAL, jitter=DEFAULT_JITTER, max_runs=None):
+        self.scraper = scraper
+        self.interval = interval
+        self.jitter = jitter
+        self.max_runs = max_runs
+        self.stop_event = threading.Event()
+        self.runs = 0
+        self.failures = 0
+
+    def stop(self, *args):
+        """Stop after the current run (also the signal handler)"""
+        self.stop_event.set()
+
+    def run_once(self):
+        """Run the scraper once; a failed run is reported and the outputs are left as they were"""
+        self.runs += 1
+        print(f"\n[{datetime.now().isoformat(timespec='seconds')}] Run {self.runs}")
+        try:
+            self.scraper.run()
+            return True
+        except Exception as e:
+            self.failures += 1
+            print(f"Run failed, keeping the previous outputs: {e}")
+            return False
+
+    def run(self):
+        """Run on schedule until stopped or max_runs is reached"""
+        while not self.stop_event.is_set():
+            started = time.monotonic()
+            self.run_once()
+            if self.max_runs is not None and self.runs >= self.max_runs:
+                break
+            # The schedule counts from the start of each run, so slow runs do not drift it
+            delay = next_delay(self.interval, self.jitter) - (time.monotonic() - started)
+            print(f"Next run in {max(delay, 0):.0f} seconds")
+            self.stop_event.wait(max(delay, 0))
+        print(f"Watch mode stopped after {self.runs} run(s), {self.failures} failed")
+
+    def install_signal_handlers(self):
+        """Stop cleanly on SIGINT and SIGTERM"""
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape the ILEA bulletin on a schedule and keep the outputs current")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help="Seconds between runs")
+    parser.add_argument('--jitter', type=float, default=DEFAULT_JITTER,
+                        help="Random fraction of the interval added or taken off each wait")
+    parser.add_argument('--max-runs', type=int, help="Stop after this many runs")
+    parser.add_argument('--cache-dir', default='.http_cache', help="HTTP cache for conditional requests")
+    parser.add_argument('--state-file', help="Posting state file (records added, changed and removed postings)")
+    parser.add_argument('--output-state', default=DEFAULT_OUTPUT_STATE_PATH,
+                        help="What each output was last written from")
+    parser.add_argument('--store', help="SQLite job store")
+    parser.add_argument('--parser', default='html.parser', help="HTML parser backend")
+    parser.add_argument('--async', dest='use_async', action='store_true', help="Use the async engine")
+    parser.add_argument('--metrics-file', help="JSON report of each run's stage timings and counters")
+    parser.add_argument('--prometheus-file', help="Prometheus textfile (for node_exporter's textfile collector)")
+    parser.add_argument('--profile', choices=PROFILE_MODES, help="Add a cProfile or tracemalloc profile to the report")
+    parser.add_argument('--quiet', action='store_true', help="Do not print a line for every posting")
+    args = parser.parse_args()
+
+    scraper_class = AsyncIndianaPoliceJobsScraper if args.use_async else IndianaPoliceJobsScraper
+    # Never publish the sample data: a failed run keeps the previous outputs instead
+    scraper = scraper_class(parser_backend=args.parser, cache_dir=args.cache_dir, state_file=args.state_file,
+                            store_path=args.store, output_state_file=args.output_state, sample_fallback=False,
+                            metrics_file=args.metrics_file, prometheus_file=args.prometheus_file,
+                            profile=args.profile, verbose=not args.quiet)
+    watcher = Watcher(scraper, args.interval, args.jitter, args.max_runs)
+    watcher.install_signal_handlers()
+    watcher.run()
+
+
+if __name__ == "__main__":
+    main()